@@ -0,0 +1,331 @@
+"""
+Admission Control for Application Security MCP Servers
+
+Heavy scanners (dependency-check, ZAP full scan, MobSF) can each use several
+GB of RAM, so running too many at once exhausts the container. The admission
+controller caps concurrent tool runs per server and per tool, keeps a bounded
+wait queue and rejects calls quickly with a retry hint once the queue is full.
+
+Queued calls are scheduled by priority class (interactive before batch) with
+aging, so quick agent calls are served first while batch scans saturate the
+workers, and long-waiting batch calls are never starved.
+
+A call that is cancelled (deadline, job_cancel) while its worker keeps
+running, as worker threads do, keeps its slot until the worker finishes.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, List, Optional, Set
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+logger = setup_logger(__name__, log_file_path="logs/appsec_base.log")
+
+# Initial duration estimate (seconds) used for retry hints before a tool has completed once
+DEFAULT_DURATION_ESTIMATE = 60.0
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+
+# Scheduling rank per priority class (lower runs first)
+PRIORITY_RANKS = {
+    PRIORITY_INTERACTIVE: 0,
+    PRIORITY_BATCH: 1,
+}
+
+# Seconds of waiting that promote a queued call by one priority class
+DEFAULT_AGING_SECONDS = 60.0
+
+
+class ServerBusyError(Exception):
+    """Raised when a tool call cannot be admitted."""
+
+    def __init__(self, tool_name: str, retry_after: int, reason: str):
+        """
+        Initialize error.
+
+        Args:
+            tool_name: Tool that was rejected
+            retry_after: Suggested number of seconds before retrying
+            reason: Human readable rejection reason
+        """
+        super().__init__(f"Server busy ({reason}), retry after {retry_after}s")
+        self.tool_name = tool_name
+        self.retry_after = retry_after
+        self.reason = reason
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize as a tool error result."""
+        return {
+            "status": "error",
+            "message": str(self),
+            "retry_after": self.retry_after,
+            "tool": self.tool_name,
+        }
+
+
+class _Waiter:
+    """A queued tool call waiting for a slot."""
+
+    def __init__(self, tool_name: str, priority: str):
+        self.tool_name = tool_name
+        self.priority = priority
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.enqueued_at = time.monotonic()
+
+    def rank(self, now: float, aging_seconds: float) -> float:
+        """Effective scheduling rank, improving the longer the call has waited."""
+        return PRIORITY_RANKS[self.priority] - (now - self.enqueued_at) / aging_seconds
+
+
+class AdmissionController:
+    """Priority-aware per-server and per-tool concurrency limits with a bounded wait queue."""
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        tool_limits: Optional[Dict[str, int]] = None,
+        max_queue: int = 100,
+        queue_timeout: Optional[float] = None,
+        tool_priorities: Optional[Dict[str, str]] = None,
+        default_priority: str = PRIORITY_INTERACTIVE,
+        reserved_interactive: Optional[int] = None,
+        aging_seconds: float = DEFAULT_AGING_SECONDS
+    ):
+        """
+        Initialize admission controller.
+
+        Args:
+            max_concurrent: Maximum tool calls running at once on this server (None for unlimited)
+            tool_limits: Maximum concurrent calls per tool name
+            max_queue: Maximum number of calls waiting for a slot before rejecting
+            queue_timeout: Maximum seconds a call waits for a slot (None to wait indefinitely)
+            tool_priorities: Default priority class per tool name
+            default_priority: Priority class for tools without an explicit class
+            reserved_interactive: Slots batch calls may never occupy (default: 1 when
+                max_concurrent is greater than 1)
+            aging_seconds: Seconds of waiting that promote a queued call by one class
+        """
+        self.max_concurrent = max_concurrent
+        self.tool_limits = dict(tool_limits or {})
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.tool_priorities = dict(tool_priorities or {})
+        self.default_priority = default_priority
+        self._reserved_interactive = reserved_interactive
+        self.aging_seconds = aging_seconds
+        self.running = 0
+        self.running_by_tool: Dict[str, int] = {}
+        self.running_batch = 0
+        self.waiters: Deque[_Waiter] = deque()
+        self._durations: Dict[str, float] = {}
+        # Slots of finished calls whose workers are still running
+        self._lingering: Set[asyncio.Task] = set()
+
+    @property
+    def reserved_interactive(self) -> int:
+        """Number of slots kept free for interactive calls."""
+        if self._reserved_interactive is not None:
+            return self._reserved_interactive
+        return 1 if self.max_concurrent and self.max_concurrent > 1 else 0
+
+    def resolve_priority(self, tool_name: str, priority: Optional[str] = None) -> str:
+        """
+        Determine the priority class of a call.
+
+        Args:
+            tool_name: Tool being called
+            priority: Per-call priority hint (overrides the tool default)
+
+        Returns:
+            A known priority class name
+        """
+        if priority in PRIORITY_RANKS:
+            return priority
+        if priority:
+            logger.warning(f"[AdmissionController] Unknown priority '{priority}' for {tool_name}, using default")
+        resolved = self.tool_priorities.get(tool_name, self.default_priority)
+        return resolved if resolved in PRIORITY_RANKS else PRIORITY_INTERACTIVE
+
+    def _has_capacity(self, tool_name: str, priority: str = PRIORITY_INTERACTIVE) -> bool:
+        """Whether a call of tool_name could start right now."""
+        if self.max_concurrent is not None:
+            if self.running >= self.max_concurrent:
+                return False
+            if priority == PRIORITY_BATCH and self.running_batch >= self.max_concurrent - self.reserved_interactive:
+                return False
+        limit = self.tool_limits.get(tool_name)
+        return limit is None or self.running_by_tool.get(tool_name, 0) < limit
+
+    def _start(self, tool_name: str, priority: str):
+        self.running += 1
+        self.running_by_tool[tool_name] = self.running_by_tool.get(tool_name, 0) + 1
+        if priority == PRIORITY_BATCH:
+            self.running_batch += 1
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        """Pick the best-ranked queued call that fits the current limits."""
+        now = time.monotonic()
+        best = None
+        best_rank = None
+        for waiter in self.waiters:
+            if waiter.future.done() or not self._has_capacity(waiter.tool_name, waiter.priority):
+                continue
+            rank = waiter.rank(now, self.aging_seconds)
+            # Strict comparison keeps FIFO order among equally ranked calls
+            if best_rank is None or rank < best_rank:
+                best, best_rank = waiter, rank
+        return best
+
+    def _dispatch(self):
+        """Hand free slots to queued calls."""
+        while True:
+            waiter = self._next_waiter()
+            if waiter is None:
+                break
+            self.waiters.remove(waiter)
+            self._start(waiter.tool_name, waiter.priority)
+            waiter.future.set_result(True)
+
+    def retry_after(self, tool_name: str) -> int:
+        """
+        Estimate when a rejected call is likely to be admitted.
+
+        Args:
+            tool_name: Tool that was rejected
+
+        Returns:
+            Suggested number of seconds to wait before retrying
+        """
+        estimate = self._durations.get(tool_name, DEFAULT_DURATION_ESTIMATE)
+        limit = self.tool_limits.get(tool_name) or self.max_concurrent or 1
+        backlog = sum(1 for waiter in self.waiters if waiter.tool_name == tool_name) + 1
+        return max(1, int(math.ceil(estimate * backlog / limit)))
+
+    async def acquire(self, tool_name: str, priority: str = PRIORITY_INTERACTIVE):
+        """
+        Wait for a slot for tool_name.
+
+        Args:
+            tool_name: Tool requesting a slot
+            priority: Resolved priority class of the call
+
+        Raises:
+            ServerBusyError: If the wait queue is full or the queue timeout expired
+        """
+        # Start immediately unless a queued call would be entitled to this slot
+        if self._has_capacity(tool_name, priority) and self._next_waiter() is None:
+            self._start(tool_name, priority)
+            return
+
+        if len(self.waiters) >= self.max_queue:
+            raise ServerBusyError(tool_name, self.retry_after(tool_name), "queue full")
+
+        waiter = _Waiter(tool_name, priority)
+        self.waiters.append(waiter)
+        self._dispatch()
+        logger.debug(f"[AdmissionController] Queued {tool_name} as {priority} ({len(self.waiters)} waiting)")
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.future.done():
+                # Slot was granted while we were giving up, hand it back
+                self.release(tool_name, priority)
+            else:
+                waiter.future.cancel()
+                if waiter in self.waiters:
+                    self.waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                raise ServerBusyError(tool_name, self.retry_after(tool_name), "queue timeout")
+            raise
+
+    def release(self, tool_name: str, priority: str = PRIORITY_INTERACTIVE, duration: Optional[float] = None):
+        """
+        Return a slot and wake queued calls.
+
+        Args:
+            tool_name: Tool releasing its slot
+            priority: Priority class the slot was granted under
+            duration: Run time of the finished call, used for retry estimates
+        """
+        self.running -= 1
+        self.running_by_tool[tool_name] = self.running_by_tool.get(tool_name, 1) - 1
+        if priority == PRIORITY_BATCH:
+            self.running_batch -= 1
+        if duration is not None:
+            previous = self._durations.get(tool_name)
+            self._durations[tool_name] = duration if previous is None else 0.8 * previous + 0.2 * duration
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, tool_name: str, priority: Optional[str] = None, workers: Optional[List[Future]] = None):
+        """
+        Hold a slot for the duration of a tool call.
+
+        Args:
+            tool_name: Tool requesting a slot
+            priority: Per-call priority hint (default: the tool's priority class)
+            workers: Executor futures the call submits; the slot is held until
+                they are done, even when the call itself was cancelled
+
+        Raises:
+            ServerBusyError: If the call cannot be admitted
+        """
+        priority = self.resolve_priority(tool_name, priority)
+        await self.acquire(tool_name, priority)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            running = [future for future in workers or () if not future.done()]
+            if running:
+                logger.warning(
+                    f"[AdmissionController] {tool_name} ended with {len(running)} worker(s) still running, "
+                    f"holding its slot until they finish"
+                )
+                task = asyncio.ensure_future(self._release_when_done(tool_name, priority, started, running))
+                self._lingering.add(task)
+                task.add_done_callback(self._lingering.discard)
+            else:
+                self.release(tool_name, priority, time.monotonic() - started)
+
+    async def _release_when_done(self, tool_name: str, priority: str, started: float, workers: List[Future]):
+        """Release a slot once the workers of its call have finished."""
+        try:
+            await asyncio.wait([asyncio.wrap_future(future) for future in workers])
+        finally:
+            self.release(tool_name, priority, time.monotonic() - started)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return current load for diagnostics."""
+        return {
+            "running": self.running,
+            "running_by_tool": {name: count for name, count in self.running_by_tool.items() if count},
+            "running_batch": self.running_batch,
+            "running_cancelled": len(self._lingering),
+            "queued": len(self.waiters),
+            "queued_by_priority": {
+                priority: sum(1 for waiter in self.waiters if waiter.priority == priority)
+                for priority in PRIORITY_RANKS
+            },
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "tool_limits": self.tool_limits,
+        }
@@ -3,11 +3,19 @@ Base MCP Server for Application Security Tools
 Provides shared functionality for all appsec MCP servers with container support
 """
 
+import asyncio
+import copy
 import os
 import sys
+import inspect
+import sqlite3
+import time
+import tomllib
 from pathlib import Path
-from typing import Dict, Any, Optional
+from concurrent.futures import Future
+from typing import Dict, Any, Callable, List, Literal, Optional, Tuple
 from fastmcp import FastMCP
+from fastmcp.exceptions import NotFoundError
 
 try:
     from hd_logging import setup_logger
@@ -25,21 +33,219 @@ except ImportError:
 
 logger = setup_logger(__name__, log_file_path="logs/appsec_base.log")
 
+from appsec_admission import AdmissionController, ServerBusyError, PRIORITY_BATCH, PRIORITY_INTERACTIVE
+from appsec_clone_cache import (
+    CloneCache, CloneError, CLONE_FULL, CLONE_MODES, CLONE_PARTIAL, CLONE_SHALLOW, CLONE_SPARSE, current_checkout
+)
+from appsec_composite import (
+    REPOSITORY_TOOL_SUFFIX, merge_results, run_scanners, scanner_name, scanner_succeeded, select_scanners
+)
+from appsec_result_cache import ResultCache, UNKNOWN_VERSION, VOLATILE_ARGUMENTS, cache_key, scanner_version
+from appsec_findings import CursorError, DEFAULT_PAGE_SIZE, ResultExpiredError, ResultStore
+from appsec_jobs import JobManager
+from appsec_live import DEFAULT_BATCH_SECONDS, DEFAULT_BATCH_SIZE, FindingStream
+from appsec_normalize import FilterError
+from appsec_progress import (
+    PHASE_CLONE, PHASE_DONE, PHASE_PARSE, PHASE_QUEUED, PHASE_SCAN, PHASE_WRITE,
+    ProgressReporter, current_progress, report_progress
+)
+
+# __diff_scope__ of tools that can be restricted to the files changed since base_ref
+DIFF_SCOPE_FILES = "files"
+
+
+def _add_recon_path():
+    """Make the recon server's modules (plugin loader, process runner, transports) importable."""
+    recon_path = Path(__file__).parent.parent / "recon"
+    if str(recon_path) not in sys.path:
+        sys.path.insert(0, str(recon_path))
+
+
+def _env_int(name: str, default: Optional[int] = None) -> Optional[int]:
+    """Read an integer environment variable, falling back to default."""
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: Optional[float] = None) -> Optional[float]:
+    """Read a float environment variable, falling back to default."""
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def _parse_tool_map(value: str) -> Dict[str, str]:
+    """Parse "tool_a=x,tool_b=y" into a mapping."""
+    mapping = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, setting = item.split("=", 1)
+            mapping[name.strip()] = setting.strip()
+    return mapping
+
+
+def _parse_tool_limits(value: str) -> Dict[str, int]:
+    """Parse "tool_a=1,tool_b=2" into a limits mapping."""
+    return {name: int(limit) for name, limit in _parse_tool_map(value).items()}
+
+
+def _copy_tool_metadata(wrapper: Callable, source: Callable, name: str, doc: Optional[str] = None):
+    """
+    Give a generated wrapper the signature, annotations and docstring of a tool.
+    
+    FastMCP builds the tool schema from these attributes, so every layer that
+    wraps a tool must carry them over.
+    
+    Args:
+        wrapper: Generated wrapper function
+        source: Function whose metadata should be copied
+        name: Tool name for the wrapper
+        doc: Optional docstring override
+    """
+    signature = inspect.signature(source)
+    wrapper.__signature__ = signature
+    wrapper.__annotations__ = {
+        param_name: param.annotation
+        for param_name, param in signature.parameters.items()
+        if param.annotation is not inspect.Parameter.empty
+    }
+    if signature.return_annotation is not inspect.Signature.empty:
+        wrapper.__annotations__["return"] = signature.return_annotation
+    wrapper.__name__ = name
+    wrapper.__doc__ = doc if doc is not None else source.__doc__
+
+
+def _add_tool_parameter(wrapper: Callable, name: str, annotation: Any, default: Any):
+    """
+    Append an optional keyword parameter to a generated wrapper's signature.
+    
+    Used for call options handled by the server itself (e.g. priority), which
+    the wrapper removes from the arguments before calling the plugin function.
+    The parameter is skipped if the tool already defines it.
+    
+    Args:
+        wrapper: Wrapper previously prepared with _copy_tool_metadata
+        name: Parameter name
+        annotation: Type annotation for the schema
+        default: Default value
+    """
+    signature = wrapper.__signature__
+    if name in signature.parameters:
+        return
+    params = list(signature.parameters.values())
+    new_param = inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, default=default, annotation=annotation)
+    insert_at = len(params)
+    if params and params[-1].kind == inspect.Parameter.VAR_KEYWORD:
+        insert_at -= 1
+    params.insert(insert_at, new_param)
+    wrapper.__signature__ = signature.replace(parameters=params)
+    wrapper.__annotations__[name] = annotation
+
 
 class AppSecBaseServer:
     """Base class for all application security MCP servers."""
     
-    def __init__(self, server_name: str, tools_dir: Path):
+    def __init__(
+        self,
+        server_name: str,
+        tools_dir: Path,
+        max_workers: Optional[int] = None,
+        executor_type: Optional[str] = None,
+        parent: Optional["AppSecBaseServer"] = None
+    ):
         """
         Initialize base server.
         
         Args:
             server_name: Name of the MCP server
             tools_dir: Directory containing tool plugins
+            max_workers: Maximum concurrent synchronous tool runs
+                (default: APPSEC_MAX_WORKERS env var or executor default)
+            executor_type: Executor for synchronous tools, "thread", "process" or "zygote"
+                (default: APPSEC_EXECUTOR env var or "thread")
+            parent: Gateway this server is mounted into; the server then uses the
+                gateway's worker pool, admission controller, caches, findings
+                store and job table instead of creating its own
         """
         self.server_name = server_name
         self.mcp = FastMCP(name=server_name)
         self.tools_dir = Path(tools_dir)
+        self.parent = parent
+        
+        # Worker pool sizing for synchronous tools (created in register_tools)
+        env_workers = os.environ.get("APPSEC_MAX_WORKERS")
+        self.max_workers = max_workers or (int(env_workers) if env_workers else None)
+        self.executor_type = executor_type or os.environ.get("APPSEC_EXECUTOR", "thread")
+        self.executor = parent.executor if parent is not None else None
+        # Cached plugin descriptions and tool schemas, and the plugin loader (created in register_tools)
+        self.plugin_manifest = None
+        self.plugin_loader = None
+        # Whether result_cache_clear, get_findings and the job tools are registered
+        self._support_tools_registered = False
+        
+        # Per-server settings from [tool.appsec] in the server's pyproject.toml
+        self.settings = self._load_settings()
+        
+        # Concurrency caps and bounded wait queue applied to every tool
+        concurrency = self.settings.get("concurrency", {})
+        tool_limits = dict(concurrency.get("tools", {}))
+        tool_limits.update(_parse_tool_limits(os.environ.get("APPSEC_TOOL_LIMITS", "")))
+        scheduling = self.settings.get("scheduling", {})
+        tool_priorities = dict(scheduling.get("tools", {}))
+        tool_priorities.update(_parse_tool_map(os.environ.get("APPSEC_TOOL_PRIORITIES", "")))
+        if parent is not None:
+            # The gateway's caps apply to all categories, each category's to its own tools
+            self.admission = parent.admission
+            self.admission.tool_limits.update(tool_limits)
+            self.admission.tool_priorities.update(tool_priorities)
+        else:
+            self.admission = AdmissionController(
+                max_concurrent=_env_int("APPSEC_MAX_CONCURRENT", concurrency.get("max_concurrent", self.max_workers)),
+                tool_limits=tool_limits,
+                max_queue=_env_int("APPSEC_MAX_QUEUE", concurrency.get("max_queue", 100)),
+                queue_timeout=_env_float("APPSEC_QUEUE_TIMEOUT", concurrency.get("queue_timeout")),
+                tool_priorities=tool_priorities,
+                default_priority=os.environ.get("APPSEC_DEFAULT_PRIORITY", scheduling.get("default_priority", PRIORITY_INTERACTIVE)),
+                reserved_interactive=_env_int("APPSEC_RESERVED_INTERACTIVE", scheduling.get("reserved_interactive")),
+                aging_seconds=_env_float("APPSEC_PRIORITY_AGING", scheduling.get("aging_seconds", 60.0))
+            )
+        
+        # Deadline for calls to tools without a timeout argument
+        self.default_timeout = _env_float("APPSEC_DEFAULT_TIMEOUT", self.settings.get("default_timeout", 3600))
+        
+        # Shared git clone cache for tools taking a repo_url
+        if parent is not None:
+            # One clone of a repository serves the scanners of every category
+            self.clone_cache = parent.clone_cache
+            self.result_cache = parent.result_cache
+            if self.result_cache is not None:
+                self.result_cache.tool_ttls.update(self.settings.get("result_cache", {}).get("ttls", {}))
+        else:
+            self.clone_cache = self._create_clone_cache()
+            self.result_cache = self._create_result_cache()
+        self.clone_modes = {
+            **self.settings.get("clone_cache", {}).get("modes", {}),
+            **_parse_tool_map(os.environ.get("APPSEC_CLONE_MODES", ""))
+        }
+        
+        # Findings kept server-side for get_findings; tools return a summary and result_id
+        self.result_store = parent.result_store if parent is not None else self._create_result_store()
+        
+        # Batching of findings pushed by streaming scans
+        streaming = self.settings.get("streaming", {})
+        self.stream_batch_size = _env_int("APPSEC_STREAM_BATCH_SIZE", streaming.get("batch_size", DEFAULT_BATCH_SIZE))
+        self.stream_batch_seconds = _env_float(
+            "APPSEC_STREAM_BATCH_SECONDS", streaming.get("batch_seconds", DEFAULT_BATCH_SECONDS)
+        )
+        
+        # Seconds between progress heartbeats of running calls (0 disables them)
+        self.progress_interval = _env_float("APPSEC_PROGRESS_INTERVAL", self.settings.get("progress_interval", 15.0))
+        
+        # Background job table backing submit_<tool>/job_* tools
+        self.jobs = parent.jobs if parent is not None else JobManager()
+        self.enable_job_tools = os.environ.get("APPSEC_JOB_TOOLS", "1").lower() not in ("0", "false", "no")
+        
+        # Admitted wrappers and plugin functions of *_scan_repository tools, for scan_repository_all
+        self.repository_tools: Dict[str, Tuple[Callable, Callable]] = {}
         
         # Resolve application_security tools path
         self.appsec_tools_path = self._resolve_appsec_tools_path()
@@ -52,6 +258,101 @@ class AppSecBaseServer:
         logger.info(f"[{server_name}] Initialized")
         logger.debug(f"[{server_name}] Python path: {sys.path}")
     
+    def _load_settings(self) -> Dict[str, Any]:
+        """
+        Load [tool.appsec] settings from the server's pyproject.toml.
+        
+        The server directory is the parent of the tools directory. Environment
+        variables take precedence over values loaded here.
+        
+        Returns:
+            Settings dictionary (empty if no pyproject.toml or section exists)
+        """
+        pyproject_path = self.tools_dir.parent / "pyproject.toml"
+        if not pyproject_path.exists():
+            return {}
+        try:
+            with open(pyproject_path, "rb") as f:
+                settings = tomllib.load(f).get("tool", {}).get("appsec", {})
+            logger.info(f"[{self.server_name}] Loaded settings from {pyproject_path}")
+            return settings
+        except (OSError, tomllib.TOMLDecodeError) as e:
+            logger.warning(f"[{self.server_name}] Could not read settings from {pyproject_path}: {e}")
+            return {}
+    
+    def _create_clone_cache(self) -> Optional[CloneCache]:
+        """
+        Create the clone cache from [tool.appsec.clone_cache] and APPSEC_CLONE_* env vars.
+        
+        Returns:
+            CloneCache, or None if disabled
+        """
+        config = self.settings.get("clone_cache", {})
+        enabled = os.environ.get("APPSEC_CLONE_CACHE", str(config.get("enabled", True)))
+        if enabled.lower() in ("0", "false", "no"):
+            logger.info(f"[{self.server_name}] Clone cache disabled")
+            return None
+        max_gb = _env_float("APPSEC_CLONE_CACHE_MAX_GB", config.get("max_gb", 10))
+        try:
+            return CloneCache(
+                cache_dir=os.environ.get("APPSEC_CLONE_CACHE_DIR", config.get("dir")),
+                max_bytes=int(max_gb * 1024 ** 3),
+                fetch_interval=_env_float("APPSEC_CLONE_FETCH_INTERVAL", config.get("fetch_interval", 0.0)),
+                max_fetches=_env_int("APPSEC_CLONE_MAX_FETCHES", config.get("max_fetches", 4))
+            )
+        except OSError as e:
+            logger.warning(f"[{self.server_name}] Clone cache unavailable: {e}")
+            return None
+    
+    def _create_result_cache(self) -> Optional[ResultCache]:
+        """
+        Create the result cache from [tool.appsec.result_cache] and APPSEC_RESULT_CACHE_* env vars.
+        
+        Returns:
+            ResultCache, or None if disabled
+        """
+        config = self.settings.get("result_cache", {})
+        enabled = os.environ.get("APPSEC_RESULT_CACHE", str(config.get("enabled", True)))
+        if enabled.lower() in ("0", "false", "no"):
+            logger.info(f"[{self.server_name}] Result cache disabled")
+            return None
+        tool_ttls = {
+            **config.get("ttls", {}),
+            **{name: float(ttl) for name, ttl in _parse_tool_map(os.environ.get("APPSEC_RESULT_CACHE_TTLS", "")).items()}
+        }
+        max_mb = _env_float("APPSEC_RESULT_CACHE_MAX_MB", config.get("max_mb", 1024))
+        try:
+            return ResultCache(
+                cache_dir=os.environ.get("APPSEC_RESULT_CACHE_DIR", config.get("dir")),
+                ttl_seconds=_env_float("APPSEC_RESULT_CACHE_TTL", config.get("ttl_seconds", 24 * 3600)),
+                max_bytes=int(max_mb * 1024 ** 2),
+                tool_ttls=tool_ttls
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"[{self.server_name}] Result cache unavailable: {e}")
+            return None
+    
+    def _create_result_store(self) -> Optional[ResultStore]:
+        """
+        Create the findings store from [tool.appsec.findings] and APPSEC_RESULT_* env vars.
+        
+        Returns:
+            ResultStore, or None if tools should return their full results
+        """
+        config = self.settings.get("findings", {})
+        enabled = os.environ.get("APPSEC_RESULT_HANDLES", str(config.get("enabled", True)))
+        if enabled.lower() in ("0", "false", "no"):
+            logger.info(f"[{self.server_name}] Result handles disabled, tools return full results")
+            return None
+        return ResultStore(
+            max_results=_env_int("APPSEC_MAX_STORED_RESULTS", config.get("max_results", 200)),
+            retention_seconds=_env_int("APPSEC_RESULT_RETENTION", config.get("retention_seconds", 3600)),
+            raw_report_bytes=int(_env_float("APPSEC_RAW_REPORT_MB", config.get("raw_report_mb", 64)) * 1024 ** 2),
+            keep_raw=os.environ.get(
+                "APPSEC_KEEP_RAW_FINDINGS", str(config.get("keep_raw", False))
+            ).lower() in ("1", "true", "yes")
+        )
+    
     def _resolve_appsec_tools_path(self) -> Optional[Path]:
         """
         Resolve path to application_security tools.
@@ -105,36 +406,1125 @@ class AppSecBaseServer:
             return
         
         # Import plugin loader from recon server
-        recon_path = Path(__file__).parent.parent / "recon"
-        if str(recon_path) not in sys.path:
-            sys.path.insert(0, str(recon_path))
+        _add_recon_path()
         
         try:
-            from recon_mcpserver import PluginLoader, create_mcp_tool_from_function
+            from plugin_manifest import PluginManifest
+            from plugin_reload import DEFAULT_RELOAD_INTERVAL, PluginReloader
+            from recon_mcpserver import PluginLoader, create_executor
+            from zygote import ZygoteExecutor
         except ImportError:
             logger.error(f"[{self.server_name}] Failed to import plugin loader from recon_mcpserver")
             return
         
-        loader = PluginLoader(self.tools_dir)
+        if self.executor is None:
+            self.executor = create_executor(self.executor_type, self.max_workers)
+        if self.admission.max_concurrent is None:
+            # Schedule against the real pool size so priorities decide who gets a worker
+            self.admission.max_concurrent = getattr(self.executor, "_max_workers", None)
+        
+        # Plugins are imported on first use unless lazy_plugins is off
+        lazy = os.environ.get("APPSEC_LAZY_PLUGINS", str(self.settings.get("lazy_plugins", True)))
+        self.plugin_manifest = PluginManifest.for_tools_dir(self.tools_dir)
+        loader = PluginLoader(
+            self.tools_dir,
+            lazy=lazy.lower() not in ("0", "false", "no"),
+            manifest=self.plugin_manifest
+        )
         all_tools = loader.load_all_plugins()
+        self.plugin_loader = loader
         
-        registered_count = 0
-        for tool_name, tool_func in all_tools.items():
-            try:
-                wrapped_func = create_mcp_tool_from_function(tool_func, tool_name)
-                wrapped_func.__name__ = tool_name
-                decorated_func = self.mcp.tool()(wrapped_func)
-                setattr(self.mcp, f"_tool_{tool_name}", decorated_func)
-                registered_count += 1
-                logger.info(f"[{self.server_name}] Registered tool: {tool_name}")
-            except Exception as e:
-                logger.error(f"[{self.server_name}] Failed to register {tool_name}: {e}", exc_info=True)
+        # Fork pre-imported workers before the event loop starts (APPSEC_EXECUTOR=zygote);
+        # a gateway starts its zygote once all categories are loaded
+        if isinstance(self.executor, ZygoteExecutor) and self.parent is None:
+            self.executor.start(loader.plugin_modules())
         
+        registered_count = sum(
+            self._register_plugin_tool(tool_name, tool_func) for tool_name, tool_func in all_tools.items()
+        )
+        
+        if self._refresh_composite_tool():
+            registered_count += 1
+        
+        if registered_count:
+            self._register_support_tools()
+        
+        if self.plugin_manifest is not None:
+            self.plugin_manifest.save()
         logger.info(f"[{self.server_name}] Registered {registered_count} tool(s)")
+        
+        # Added, changed and removed plugins are picked up while the server runs,
+        # if a reload interval is set (development only, off by default)
+        reload_interval = _env_float(
+            "APPSEC_PLUGIN_RELOAD_INTERVAL",
+            self.settings.get("plugin_reload_interval", DEFAULT_RELOAD_INTERVAL)
+        )
+        if reload_interval and reload_interval > 0:
+            self.mcp.add_middleware(PluginReloader(loader, self._apply_plugin_changes, reload_interval))
+    
+    def _register_plugin_tool(self, tool_name: str, tool_func: Callable) -> bool:
+        """
+        Wrap a plugin tool in the server layers and register it.
+        
+        Args:
+            tool_name: Name of the tool
+            tool_func: Plugin function (or lazy stub)
+            
+        Returns:
+            True if the tool was registered
+        """
+        from recon_mcpserver import create_mcp_tool_from_function
+        
+        try:
+            # Identical calls are coalesced below by _with_single_flight, before admission
+            wrapped_func = create_mcp_tool_from_function(
+                tool_func, tool_name, self.executor, self.default_timeout, single_flight=False
+            )
+            wrapped_func = self._with_streaming(tool_name, wrapped_func, tool_func)
+            # Cache lookups and repository fetches happen before admission,
+            # so cached results never wait for a scanner slot
+            wrapped_func = self._with_admission(tool_name, wrapped_func)
+            wrapped_func = self._with_result_cache(tool_name, wrapped_func, tool_func)
+            wrapped_func = self._with_clone_cache(tool_name, wrapped_func, tool_func)
+            if tool_name.endswith(REPOSITORY_TOOL_SUFFIX) and "repo_url" in inspect.signature(wrapped_func).parameters:
+                self.repository_tools[tool_name] = (wrapped_func, tool_func)
+            wrapped_func = self._with_result_handle(tool_name, wrapped_func)
+            wrapped_func = self._with_single_flight(tool_name, wrapped_func, tool_func)
+            wrapped_func = self._with_deadline(tool_name, wrapped_func)
+            wrapped_func = self._with_progress(tool_name, wrapped_func)
+            self._add_tool(wrapped_func)
+            logger.info(f"[{self.server_name}] Registered tool: {tool_name}")
+            
+            if self.enable_job_tools:
+                self._register_submit_tool(tool_name, wrapped_func)
+            return True
+        except Exception as e:
+            logger.error(f"[{self.server_name}] Failed to register {tool_name}: {e}", exc_info=True)
+            return False
+    
+    def _register_support_tools(self):
+        """Register the tools serving plugin tool results (once, with the first plugin tool)."""
+        if self._support_tools_registered or self.parent is not None:
+            # Mounted servers share the gateway's store and jobs, which the gateway serves
+            return
+        self._support_tools_registered = True
+        
+        if self.result_cache is not None:
+            self._register_result_cache_tool()
+        
+        if self.result_store is not None:
+            self._register_findings_tool()
+        
+        if self.enable_job_tools:
+            self._register_job_tools()
+    
+    def _unregister_tool(self, tool_name: str):
+        """
+        Remove a tool and its submit_<tool> variant, if registered.
+        
+        Calls and background jobs already running keep their wrappers and
+        finish on the code they started with.
+        
+        Args:
+            tool_name: Name of the tool
+        """
+        for name in (tool_name, f"submit_{tool_name}"):
+            try:
+                self.mcp.remove_tool(name)
+            except NotFoundError:
+                continue
+            if hasattr(self.mcp, f"_tool_{name}"):
+                delattr(self.mcp, f"_tool_{name}")
+            logger.info(f"[{self.server_name}] Unregistered tool: {name}")
+    
+    async def _apply_plugin_changes(self, tools: Dict[str, Callable], removed: List[str]):
+        """
+        Replace the tools of reloaded plugins and remove the tools of deleted ones.
+        
+        Args:
+            tools: Tools of added and changed plugins by name
+            removed: Names of tools that no longer exist
+        """
+        repository_tools = set(self.repository_tools)
+        for tool_name in list(tools) + removed:
+            self._unregister_tool(tool_name)
+            self.repository_tools.pop(tool_name, None)
+        
+        registered_count = sum(
+            self._register_plugin_tool(tool_name, tool_func) for tool_name, tool_func in tools.items()
+        )
+        if registered_count:
+            self._register_support_tools()
+        
+        # Results produced by the previous code are not results of the new code
+        if self.result_cache is not None:
+            for tool_name in list(tools) + removed:
+                await self.result_cache.invalidate(tool_name)
+        
+        # The composite tool lists its scanners in its description
+        if set(self.repository_tools) != repository_tools:
+            self._refresh_composite_tool()
+            if self.parent is not None:
+                self.parent._refresh_composite_tool()
+        
+        if self.plugin_manifest is not None:
+            self.plugin_manifest.save()
+    
+    def _refresh_composite_tool(self) -> bool:
+        """
+        Register scan_repository_all over the current repository tools, replacing the previous one.
+        
+        Returns:
+            True if the tool is registered (there are at least two repository scanners)
+        """
+        self._unregister_tool("scan_repository_all")
+        if len(self.repository_tools) < 2:
+            return False
+        self._register_composite_tool()
+        return True
+    
+    def _add_tool(self, func: Callable):
+        """
+        Register a function as an MCP tool named after it.
+        
+        The tool schema is taken from the plugin manifest while the function's
+        signature and docstring are unchanged, so restarts skip schema generation.
+        
+        Args:
+            func: Async MCP wrapper
+        """
+        from plugin_manifest import register_tool
+        
+        decorated_func = register_tool(self.mcp, func, self.plugin_manifest)
+        # Store reference to prevent garbage collection
+        setattr(self.mcp, f"_tool_{func.__name__}", decorated_func)
+    
+    def _with_clone_cache(self, tool_name: str, wrapped_func: Callable, tool_func: Callable) -> Callable:
+        """
+        Serve repo_url from the shared clone cache.
+        
+        The repository is fetched into the cache and the tool receives the path
+        of a cached working tree as repo_url. Tools that need the original URL
+        (e.g. because they query the GitHub API) opt out by setting
+        `__clone_cache__ = False` on the function. If the repository cannot be
+        fetched, the tool is called with the original URL. How much of the
+        repository is fetched is declared per tool (see _clone_mode).
+        
+        Adds optional `head_ref` (what to scan) and `base_ref` arguments. With
+        a base_ref, tools declaring `__diff_scope__ = "files"` only see the
+        files changed since base_ref, tools declaring `__diff_since_argument__`
+        receive the base commit in that argument, and all other tools fall
+        back to scanning the full tree at head_ref.
+        
+        Args:
+            tool_name: Name of the tool
+            wrapped_func: Async MCP wrapper of the tool
+            tool_func: Original plugin function (for its declarations)
+            
+        Returns:
+            Async wrapper using the clone cache, or wrapped_func if not applicable
+        """
+        takes_repo_url = "repo_url" in inspect.signature(wrapped_func).parameters
+        if self.clone_cache is None or not takes_repo_url or not getattr(tool_func, "__clone_cache__", True):
+            return wrapped_func
+        
+        clone_cache = self.clone_cache
+        scope_to_diff = getattr(tool_func, "__diff_scope__", None) == DIFF_SCOPE_FILES
+        since_argument = getattr(tool_func, "__diff_since_argument__", None)
+        
+        async def cached_repo_tool(**kwargs):
+            base_ref = kwargs.pop("base_ref", None)
+            head_ref = kwargs.pop("head_ref", None)
+            repo_url = kwargs.get("repo_url")
+            if not repo_url or os.path.isdir(repo_url):
+                if base_ref or head_ref:
+                    logger.warning(f"[{self.server_name}] {tool_name}: base_ref/head_ref ignored for local path {repo_url}")
+                return await wrapped_func(**kwargs)
+            mode, sparse_paths = await self._clone_mode(tool_name, tool_func, kwargs)
+            report_progress(f"Fetching {repo_url} ({mode})", phase=PHASE_CLONE)
+            try:
+                async with clone_cache.lease(
+                    repo_url,
+                    ref=head_ref,
+                    github_token=kwargs.get("github_token"),
+                    mode=mode,
+                    sparse_paths=sparse_paths,
+                    base_ref=base_ref,
+                    scope_to_diff=scope_to_diff
+                ) as checkout:
+                    report_progress(f"Checked out {checkout.commit[:12]}")
+                    call_kwargs = dict(kwargs)
+                    if checkout.base_commit and since_argument and not kwargs.get(since_argument):
+                        call_kwargs[since_argument] = checkout.base_commit
+                    if checkout.path is None:
+                        result = {
+                            "success": True,
+                            "status": "success",
+                            "message": "No files changed between base_ref and head_ref",
+                            "tool": tool_name
+                        }
+                    else:
+                        token = current_checkout.set(checkout)
+                        try:
+                            # The cached tree is shared, so the scanner gets a private copy of it
+                            async with clone_cache.scratch_copy(checkout, tool_name) as path:
+                                result = await wrapped_func(**{**call_kwargs, "repo_url": str(path)})
+                        finally:
+                            current_checkout.reset(token)
+                        if isinstance(result, dict):
+                            # Lets the result store make reported paths repository-relative
+                            result["scan_root"] = str(path)
+                    if isinstance(result, dict):
+                        result.setdefault("repo_checkout", checkout.to_dict())
+                        if checkout.base_commit:
+                            result.setdefault("diff_scope", self._diff_scope(tool_func, checkout))
+                    return result
+            except CloneError as e:
+                logger.warning(f"[{self.server_name}] {tool_name}: clone cache failed ({e}), scanning {repo_url} directly")
+                return await wrapped_func(**kwargs)
+        
+        _copy_tool_metadata(cached_repo_tool, wrapped_func, tool_name)
+        _add_tool_parameter(cached_repo_tool, "head_ref", Optional[str], None)
+        _add_tool_parameter(cached_repo_tool, "base_ref", Optional[str], None)
+        return cached_repo_tool
+    
+    @staticmethod
+    def _diff_scope(tool_func: Callable, checkout) -> Dict[str, Any]:
+        """
+        Describe how a diff scan was scoped.
+        
+        Args:
+            tool_func: Original plugin function (for its declarations)
+            checkout: Checkout leased with a base_ref
+            
+        Returns:
+            Dictionary with base/head commits, changed file count and scope
+            ("files", "commits" or "full" when the scanner cannot be scoped)
+        """
+        if getattr(tool_func, "__diff_scope__", None) == DIFF_SCOPE_FILES:
+            scope = "files"
+        elif getattr(tool_func, "__diff_since_argument__", None):
+            scope = "commits"
+        else:
+            scope = "full"
+        return {
+            "base_commit": checkout.base_commit,
+            "head_commit": checkout.commit,
+            "changed_files": len(checkout.changed_files or []),
+            "scope": scope,
+        }
+    
+    def _with_result_cache(self, tool_name: str, wrapped_func: Callable, tool_func: Callable) -> Callable:
+        """
+        Serve repeated calls from the persistent result cache.
+        
+        Results are keyed by tool name, the content identity of the scanned
+        input (see _result_cache_identity), the scanner version and the
+        normalized arguments. Only successful results are stored, and calls
+        are not cached while the scanner version cannot be probed. Adds an
+        optional `no_cache` argument that forces a fresh scan (whose result
+        replaces the cached one).
+        
+        Args:
+            tool_name: Name of the tool
+            wrapped_func: Async MCP wrapper of the tool
+            tool_func: Original plugin function (for its declarations)
+            
+        Returns:
+            Async wrapper using the result cache, or wrapped_func if not applicable
+        """
+        if self.result_cache is None or not self._result_cacheable(tool_func, wrapped_func):
+            return wrapped_func
+        
+        result_cache = self.result_cache
+        takes_no_cache = "no_cache" in inspect.signature(wrapped_func).parameters
+        
+        async def cached_result_tool(**kwargs):
+            no_cache = kwargs.get("no_cache") if takes_no_cache else kwargs.pop("no_cache", False)
+            if kwargs.get("stream"):
+                # Streamed findings live in the findings store, there is no full result to cache
+                return await wrapped_func(**kwargs)
+            identity = await self._result_cache_identity(tool_name, tool_func, kwargs)
+            if identity is None:
+                return await wrapped_func(**kwargs)
+            
+            version = await scanner_version(self._version_command(tool_name, tool_func))
+            if version == UNKNOWN_VERSION:
+                # A cached result could be from another scanner version
+                return await wrapped_func(**kwargs)
+            key = cache_key(tool_name, identity, version, self._normalize_arguments(tool_func, kwargs))
+            if not no_cache:
+                cached = await result_cache.get(key)
+                if cached is not None:
+                    logger.info(f"[{self.server_name}] {tool_name}: result cache hit")
+                    report_progress("Served from result cache")
+                    result = cached["result"]
+                    if isinstance(result, dict):
+                        result["result_cache"] = {
+                            "hit": True,
+                            "cached_at": cached["created_at"],
+                            "age_seconds": round(time.time() - cached["created_at"], 1),
+                        }
+                    return result
+            
+            result = await wrapped_func(**kwargs)
+            if scanner_succeeded(result) and not (isinstance(result, dict) and result.get("timed_out")):
+                report_progress("Saving result to cache", phase=PHASE_WRITE)
+                await result_cache.put(key, tool_name, result)
+            return result
+        
+        _copy_tool_metadata(cached_result_tool, wrapped_func, tool_name)
+        _add_tool_parameter(cached_result_tool, "no_cache", bool, False)
+        return cached_result_tool
+    
+    def _result_cacheable(self, tool_func: Callable, wrapped_func: Callable) -> bool:
+        """Whether results of a tool can be cached (repository tools served from the clone cache by default)."""
+        declared = getattr(tool_func, "__result_cache__", None)
+        if declared is not None:
+            return bool(declared)
+        return (
+            self.clone_cache is not None
+            and "repo_url" in inspect.signature(wrapped_func).parameters
+            and getattr(tool_func, "__clone_cache__", True)
+        )
+    
+    async def _result_cache_identity(
+        self, tool_name: str, tool_func: Callable, kwargs: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Content identity of the input a call scans.
+        
+        Repository tools are identified by the commit of the checkout they
+        scan (and the base commit when only changed files are scanned).
+        Servers override this for other kinds of input.
+        
+        Args:
+            tool_name: Name of the tool
+            tool_func: Original plugin function
+            kwargs: Arguments of the call
+            
+        Returns:
+            Identity dictionary, or None if the call cannot be cached
+        """
+        checkout = current_checkout.get()
+        if checkout is None:
+            return None
+        return {
+            "repo": CloneCache.repo_key(checkout.repo_url),
+            "commit": checkout.commit,
+            "base_commit": checkout.base_commit if checkout.diff_scoped else None,
+        }
+    
+    @staticmethod
+    def _version_command(tool_name: str, tool_func: Callable) -> Optional[List[str]]:
+        """
+        Command printing the scanner version.
+        
+        Tools whose scanner does not take `<scanner> --version` declare
+        `__version_command__` (None for scanners without a version CLI).
+        """
+        default = [tool_name.split("_scan_")[0].replace("_", "-"), "--version"]
+        return getattr(tool_func, "__version_command__", default)
+    
+    @staticmethod
+    def _normalize_arguments(tool_func: Callable, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Call arguments with defaults applied and volatile arguments removed.
+        
+        Tools list further arguments that the content identity already
+        covers (e.g. an image tag resolved to its digest) in
+        `__cache_ignore_arguments__`.
+        """
+        parameters = inspect.signature(tool_func).parameters
+        ignored = VOLATILE_ARGUMENTS.union(getattr(tool_func, "__cache_ignore_arguments__", ()))
+        bound = inspect.signature(tool_func).bind_partial(
+            **{name: value for name, value in kwargs.items() if name in parameters}
+        )
+        bound.apply_defaults()
+        return {name: value for name, value in bound.arguments.items() if name not in ignored}
+    
+    async def _clone_mode(
+        self, tool_name: str, tool_func: Callable, kwargs: Dict[str, Any]
+    ) -> Tuple[str, Optional[List[str]]]:
+        """
+        Determine how much of a repository a tool call needs.
+        
+        Tools declare `__clone_mode__` ("full", "shallow", "partial" or
+        "sparse", or a callable taking the call arguments) and, for sparse
+        mode, `__sparse_paths__` patterns. [tool.appsec.clone_cache.modes] and
+        APPSEC_CLONE_MODES override the declaration per tool. A callable runs
+        in a worker thread: declared by a lazily loaded plugin, its first call
+        imports the plugin.
+        
+        Args:
+            tool_name: Name of the tool
+            tool_func: Original plugin function (for its declarations)
+            kwargs: Arguments of the call
+            
+        Returns:
+            Tuple of (clone mode, sparse path patterns or None)
+        """
+        sparse_paths = getattr(tool_func, "__sparse_paths__", None)
+        mode = self.clone_modes.get(tool_name) or getattr(
+            tool_func, "__clone_mode__", CLONE_SPARSE if sparse_paths else CLONE_FULL
+        )
+        if callable(mode):
+            mode = await asyncio.to_thread(mode, kwargs)
+        if mode not in CLONE_MODES:
+            logger.warning(f"[{self.server_name}] Unknown clone mode '{mode}' for {tool_name}, using full clone")
+            mode = CLONE_FULL
+        return mode, list(sparse_paths) if sparse_paths else None
+    
+    def _with_result_handle(self, tool_name: str, wrapped_func: Callable) -> Callable:
+        """
+        Keep a result's findings on the server and return a summary instead.
+        
+        The summary is the tool result without its findings list, plus
+        result_id, finding_count and findings_by_severity. Clients page through
+        the findings with get_findings. Results without a findings list are
+        returned unchanged.
+        
+        Args:
+            tool_name: Name of the tool
+            wrapped_func: Async MCP wrapper of the tool
+            
+        Returns:
+            Async wrapper returning summaries, or wrapped_func if result handles are disabled
+        """
+        if self.result_store is None:
+            return wrapped_func
+        
+        result_store = self.result_store
+        
+        async def summarized_tool(**kwargs):
+            repo_url = kwargs.get("repo_url")
+            root = repo_url if repo_url and os.path.isdir(repo_url) else None
+            result = await wrapped_func(**kwargs)
+            report_progress("Indexing findings", phase=PHASE_PARSE)
+            # Normalizing 100k findings takes seconds; keep the event loop serving
+            return await asyncio.to_thread(result_store.put, tool_name, result, root)
+        
+        _copy_tool_metadata(summarized_tool, wrapped_func, tool_name)
+        return summarized_tool
+    
+    def _with_streaming(self, tool_name: str, wrapped_func: Callable, tool_func: Callable) -> Callable:
+        """
+        Let a tool stream its findings while the scanner runs.
+        
+        Tools whose scanner prints one JSON finding per line declare
+        `__stream_command__`, a callable taking the call arguments (with
+        defaults applied) and returning the scanner command. Adds an optional
+        `stream` argument: with stream=true the server runs that command
+        itself and every finding goes into an open result of the findings
+        store as soon as it is printed, pushed to the client as MCP log
+        notifications (logger "findings") in small batches. The result_id is
+        in every notification and in job_status, so clients can page the
+        findings with get_findings while the scan runs.
+        
+        Args:
+            tool_name: Name of the tool
+            wrapped_func: Async MCP wrapper of the tool
+            tool_func: Original plugin function (for its declarations)
+            
+        Returns:
+            Async wrapper supporting stream=true, or wrapped_func if the tool cannot stream
+        """
+        stream_command = getattr(tool_func, "__stream_command__", None)
+        if stream_command is None:
+            return wrapped_func
+        if "stream" in inspect.signature(wrapped_func).parameters:
+            logger.warning(f"[{self.server_name}] {tool_name} has its own stream argument, streaming mode disabled")
+            return wrapped_func
+        
+        from fastmcp.server.dependencies import get_context
+        from process_runner import run_command
+        
+        exit_codes = tuple(getattr(tool_func, "__stream_exit_codes__", (0,)))
+        
+        async def streaming_tool(**kwargs):
+            if not kwargs.pop("stream", False):
+                return await wrapped_func(**kwargs)
+            
+            parameters = inspect.signature(tool_func).parameters
+            bound = inspect.signature(tool_func).bind_partial(
+                **{name: value for name, value in kwargs.items() if name in parameters}
+            )
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            # Imports the plugin on first use when it is loaded lazily
+            command = await asyncio.to_thread(stream_command, arguments)
+            repo_url = arguments.get("repo_url")
+            progress = current_progress.get()
+            try:
+                send = get_context().log
+            except RuntimeError:
+                send = None
+            if isinstance(progress, ProgressReporter) and progress.send is None:
+                # Background jobs outlive their request, job_status shows the result_id instead
+                send = None
+            stored = self.result_store.open(tool_name) if self.result_store is not None else None
+            if stored is not None and isinstance(progress, ProgressReporter):
+                progress.result_id = stored.result_id
+            findings = FindingStream(
+                tool_name,
+                stored,
+                send,
+                root=repo_url if repo_url and os.path.isdir(repo_url) else None,
+                batch_size=self.stream_batch_size,
+                batch_seconds=self.stream_batch_seconds
+            )
+            
+            logger.info(f"[{self.server_name}] {tool_name}: streaming {command[0]}")
+            try:
+                run = await run_command(command, timeout=arguments.get("timeout"), on_stdout_line=findings.feed)
+            except FileNotFoundError as e:
+                return {"status": "error", "message": f"Scanner not installed: {e}", "tool": tool_name}
+            finally:
+                await findings.close()
+            
+            succeeded = run["returncode"] in exit_codes and not run["timed_out"]
+            result = {
+                "success": succeeded,
+                "status": "success" if succeeded else "error",
+                "tool": tool_name,
+                "streamed": True,
+                "returncode": run["returncode"],
+                "timed_out": run["timed_out"],
+                "duration_seconds": run["duration_seconds"],
+            }
+            if not succeeded:
+                result["stderr"] = run["stderr"][-4000:]
+            if stored is None:
+                result["findings"] = findings.findings.raw
+                return result
+            return stored.summarize(result)
+        
+        _copy_tool_metadata(streaming_tool, wrapped_func, tool_name)
+        _add_tool_parameter(streaming_tool, "stream", bool, False)
+        return streaming_tool
+    
+    def _with_admission(self, tool_name: str, wrapped_func: Callable) -> Callable:
+        """
+        Apply the server's concurrency limits and priority scheduling to a tool.
+        
+        Adds an optional `priority` argument ("interactive" or "batch") that
+        overrides the tool's default priority class for a single call.
+        
+        Args:
+            tool_name: Name of the tool
+            wrapped_func: Async MCP wrapper of the tool
+            
+        Returns:
+            Async wrapper that waits for a slot or returns a "server busy" error
+        """
+        from deadline import current_workers
+        
+        takes_priority = "priority" in inspect.signature(wrapped_func).parameters
+        
+        async def admitted_tool(**kwargs):
+            priority = kwargs.get("priority") if takes_priority else kwargs.pop("priority", None)
+            report_progress(f"Waiting for a {tool_name} slot", phase=PHASE_QUEUED)
+            # A worker thread outlives a timed out call; its slot stays taken until it ends
+            workers: List[Future] = []
+            token = current_workers.set(workers)
+            try:
+                async with self.admission.slot(tool_name, priority, workers):
+                    report_progress(f"{tool_name} running", phase=PHASE_SCAN)
+                    return await wrapped_func(**kwargs)
+            except ServerBusyError as e:
+                logger.warning(f"[{self.server_name}] Rejected {tool_name}: {e}")
+                return e.to_dict()
+            finally:
+                current_workers.reset(token)
+        
+        _copy_tool_metadata(admitted_tool, wrapped_func, tool_name)
+        _add_tool_parameter(admitted_tool, "priority", Optional[Literal["interactive", "batch"]], None)
+        return admitted_tool
+    
+    def _with_single_flight(self, tool_name: str, wrapped_func: Callable, tool_func: Callable) -> Callable:
+        """
+        Coalesce identical concurrent calls into one execution.
+        
+        Sits above admission, the result cache and clone leasing, so
+        duplicates of a running call neither wait for a slot nor lease a
+        checkout. They receive the first call's result, including its
+        result_id. Calls are identical when their arguments match once
+        defaults are applied, ignoring `priority`. Calls with different
+        timeouts run separately, as the shared run keeps the first caller's
+        deadline. Tools with
+        side effects opt out with `__single_flight__ = False`.
+        
+        Args:
+            tool_name: Name of the tool
+            wrapped_func: Async MCP wrapper of the tool
+            tool_func: Original plugin function (for its defaults and opt-out)
+            
+        Returns:
+            Async wrapper sharing in-flight calls, or wrapped_func for opted-out tools
+        """
+        from single_flight import COALESCE_IGNORED_ARGUMENTS, coalesce_calls
+        
+        if not getattr(tool_func, "__single_flight__", True):
+            return wrapped_func
+        signature = inspect.signature(wrapped_func)
+        
+        def call_key(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            bound = signature.bind_partial(**kwargs)
+            bound.apply_defaults()
+            return {
+                name: value for name, value in bound.arguments.items()
+                if name not in COALESCE_IGNORED_ARGUMENTS
+            }
+        
+        coalesced_tool = coalesce_calls(tool_name, wrapped_func, call_key)
+        _copy_tool_metadata(coalesced_tool, wrapped_func, tool_name)
+        return coalesced_tool
+    
+    def _with_deadline(self, tool_name: str, wrapped_func: Callable) -> Callable:
+        """
+        Create the call's deadline at the MCP boundary.
+        
+        The deadline is the call's `timeout` argument (or the tool's default
+        timeout), falling back to the server default_timeout. Queue time counts
+        against it, the scanner's timeout is clamped to what is left, and the
+        call is cancelled once it expires.
+        
+        Args:
+            tool_name: Name of the tool
+            wrapped_func: Async MCP wrapper of the tool
+            
+        Returns:
+            Async wrapper enforcing the deadline
+        """
+        from deadline import Deadline, DeadlineExceeded, current_deadline
+        
+        timeout_param = inspect.signature(wrapped_func).parameters.get("timeout")
+        timeout_default = None
+        if timeout_param is not None and timeout_param.default is not inspect.Parameter.empty:
+            timeout_default = timeout_param.default
+        
+        async def deadline_tool(**kwargs):
+            budget = kwargs.get("timeout", timeout_default) if timeout_param is not None else None
+            deadline = Deadline(budget or self.default_timeout)
+            token = current_deadline.set(deadline)
+            try:
+                return await deadline.wait(wrapped_func(**kwargs))
+            except DeadlineExceeded as e:
+                logger.error(f"[{self.server_name}] {tool_name}: {e}")
+                return {
+                    "status": "error",
+                    "message": str(e),
+                    "timed_out": True,
+                    "tool": tool_name
+                }
+            finally:
+                current_deadline.reset(token)
+        
+        _copy_tool_metadata(deadline_tool, wrapped_func, tool_name)
+        return deadline_tool
+    
+    def _with_progress(self, tool_name: str, wrapped_func: Callable) -> Callable:
+        """
+        Track the progress of a call and report it to the client.
+        
+        The server layers and tools update the call's ProgressReporter (see
+        appsec_progress). Calls made with an MCP progress token receive the
+        updates as progress notifications, including a heartbeat every
+        progress_interval seconds that repeats the current phase. Background
+        jobs bring their own reporter, which job_status exposes.
+        
+        Args:
+            tool_name: Name of the tool
+            wrapped_func: Async MCP wrapper of the tool
+            
+        Returns:
+            Async wrapper reporting progress
+        """
+        from fastmcp.server.dependencies import get_context
+        
+        async def progress_tool(**kwargs):
+            progress = current_progress.get()
+            if progress is None:
+                try:
+                    send = get_context().report_progress
+                except RuntimeError:
+                    send = None
+                progress = ProgressReporter(tool_name, send)
+                token = current_progress.set(progress)
+            else:
+                token = None
+            heartbeat = None
+            if self.progress_interval and progress.send is not None:
+                heartbeat = asyncio.create_task(progress.heartbeat(self.progress_interval))
+            try:
+                result = await wrapped_func(**kwargs)
+                progress.update(PHASE_DONE, f"{tool_name} finished")
+                await progress.flush()
+                return result
+            finally:
+                if heartbeat is not None:
+                    heartbeat.cancel()
+                if token is not None:
+                    current_progress.reset(token)
+        
+        _copy_tool_metadata(progress_tool, wrapped_func, tool_name)
+        return progress_tool
+    
+    def _register_composite_tool(self):
+        """Register scan_repository_all, which runs the server's repository scanners over one checkout."""
+        tool_name = "scan_repository_all"
+        repository_tools = self.repository_tools
+        
+        async def scan_repository_all(
+            repo_url: str,
+            scanners: Optional[List[str]] = None,
+            github_token: Optional[str] = None,
+            timeout: int = 3600,
+            priority: Optional[Literal["interactive", "batch"]] = None,
+            head_ref: Optional[str] = None,
+            base_ref: Optional[str] = None
+        ) -> Dict[str, Any]:
+            """
+            Scan a repository with several scanners at once.
+            
+            The repository is fetched once and the selected scanners run in
+            parallel against private copies of the same checkout. Available
+            scanners: {scanners}.
+            
+            Args:
+                repo_url: Repository URL
+                scanners: Scanners to run (default: all)
+                github_token: Token for private repositories
+                timeout: Time budget in seconds for the whole scan
+                priority: Scheduling priority passed to every scanner
+                head_ref: Branch, tag or commit to scan (default: the default branch)
+                base_ref: Only scan what changed since this ref where scanners support it
+                
+            Returns:
+                Dictionary with overall status, summary, per-scanner timings and results
+            """
+            started = time.monotonic()
+            selected, unknown = select_scanners(list(repository_tools), scanners)
+            if unknown or not selected:
+                return {
+                    "status": "error",
+                    "message": f"Unknown scanner(s): {', '.join(unknown) or '-'}",
+                    "available": [scanner_name(name) for name in repository_tools],
+                    "tool": tool_name
+                }
+            arguments = {"github_token": github_token, "timeout": timeout, "priority": priority}
+            scoped = {
+                name for name in selected
+                if getattr(repository_tools[name][1], "__diff_scope__", None) == DIFF_SCOPE_FILES
+            }
+            # A checkout of only the changed files serves everyone if all scanners can be scoped
+            scope_checkout = bool(base_ref) and scoped == set(selected)
+            
+            async def run_scanner(name: str, checkout=None):
+                func, tool_func = repository_tools[name]
+                parameters = inspect.signature(func).parameters
+                kwargs = {key: value for key, value in arguments.items() if key in parameters and value is not None}
+                if checkout is None or not getattr(tool_func, "__clone_cache__", True):
+                    # Scanners fetch on their own, applying the refs themselves
+                    refs = {"head_ref": head_ref, "base_ref": base_ref}
+                    kwargs.update({key: value for key, value in refs.items() if key in parameters and value})
+                    return await func(repo_url=repo_url, **kwargs)
+                
+                paths = None
+                if checkout.base_commit:
+                    since_argument = getattr(tool_func, "__diff_since_argument__", None)
+                    if since_argument in parameters:
+                        kwargs[since_argument] = checkout.base_commit
+                    if name in scoped:
+                        if not checkout.changed_files:
+                            return {
+                                "success": True,
+                                "message": "No files changed between base_ref and head_ref",
+                                "tool": name
+                            }
+                        if not scope_checkout:
+                            paths = checkout.changed_files
+                if paths is not None:
+                    checkout = copy.copy(checkout)
+                    checkout.diff_scoped = True
+                # Runs in its own task, so this only tells the result cache what this scanner sees
+                current_checkout.set(checkout)
+                async with self.clone_cache.scratch_copy(checkout, scanner_name(name), paths) as path:
+                    result = await func(repo_url=str(path), **kwargs)
+                if isinstance(result, dict):
+                    # Lets the result store make reported paths repository-relative
+                    result["scan_root"] = str(path)
+                return result
+            
+            checkout = None
+            if self.clone_cache is None or os.path.isdir(repo_url):
+                report_progress(f"Running {len(selected)} scanners", phase=PHASE_SCAN)
+                runs = await run_scanners({name: lambda name=name: run_scanner(name) for name in selected})
+            else:
+                # One checkout serves every scanner, so fetch what the most demanding one needs
+                modes = {(await self._clone_mode(name, repository_tools[name][1], {}))[0] for name in selected}
+                mode = next((m for m in (CLONE_FULL, CLONE_PARTIAL) if m in modes), CLONE_SHALLOW)
+                report_progress(f"Fetching {repo_url} ({mode})", phase=PHASE_CLONE)
+                try:
+                    async with self.clone_cache.lease(
+                        repo_url,
+                        ref=head_ref,
+                        github_token=github_token,
+                        mode=mode,
+                        base_ref=base_ref,
+                        scope_to_diff=scope_checkout
+                    ) as checkout:
+                        report_progress(f"Running {len(selected)} scanners", phase=PHASE_SCAN)
+                        runs = await run_scanners({
+                            name: lambda name=name: run_scanner(name, checkout) for name in selected
+                        })
+                except CloneError as e:
+                    logger.warning(f"[{self.server_name}] {tool_name}: clone cache failed ({e}), scanners clone on their own")
+                    checkout = None
+                    report_progress(f"Running {len(selected)} scanners", phase=PHASE_SCAN)
+                    runs = await run_scanners({name: lambda name=name: run_scanner(name) for name in selected})
+            
+            result = merge_results(repo_url, runs, time.monotonic() - started)
+            if checkout is not None:
+                result["repo_checkout"] = checkout.to_dict()
+                if checkout.base_commit:
+                    result["diff_scope"] = {
+                        "base_commit": checkout.base_commit,
+                        "head_commit": checkout.commit,
+                        "changed_files": len(checkout.changed_files or []),
+                        "scoped_scanners": [scanner_name(name) for name in selected if name in scoped],
+                    }
+            return result
+        
+        scan_repository_all.__doc__ = scan_repository_all.__doc__.replace(
+            "{scanners}", ", ".join(scanner_name(name) for name in repository_tools)
+        )
+        wrapped_func = self._with_result_handle(tool_name, scan_repository_all)
+        wrapped_func = self._with_single_flight(tool_name, wrapped_func, scan_repository_all)
+        wrapped_func = self._with_deadline(tool_name, wrapped_func)
+        wrapped_func = self._with_progress(tool_name, wrapped_func)
+        self._add_tool(wrapped_func)
+        logger.info(f"[{self.server_name}] Registered tool: {tool_name} ({len(repository_tools)} scanners)")
+        
+        if self.enable_job_tools:
+            self._register_submit_tool(tool_name, wrapped_func)
+    
+    def _register_result_cache_tool(self):
+        """Register result_cache_clear for explicit invalidation."""
+        result_cache = self.result_cache
+        
+        async def result_cache_clear(tool_name: Optional[str] = None) -> Dict[str, Any]:
+            """
+            Drop cached scan results so the next calls scan again.
+            
+            Args:
+                tool_name: Only drop results of this tool (default: all tools)
+                
+            Returns:
+                Dictionary with the number of removed entries
+            """
+            removed = await result_cache.invalidate(tool_name)
+            return {"status": "success", "removed": removed, "tool_name": tool_name}
+        
+        self._add_tool(result_cache_clear)
+    
+    def _register_findings_tool(self):
+        """Register get_findings and merge_findings over findings kept by the result store."""
+        result_store = self.result_store
+        
+        async def get_findings(
+            result_id: str,
+            cursor: Optional[str] = None,
+            limit: int = DEFAULT_PAGE_SIZE,
+            filters: Optional[Dict[str, Any]] = None,
+            include_raw: bool = False,
+            dedupe: bool = False
+        ) -> Dict[str, Any]:
+            """
+            Page through the findings of a scan.
+            
+            Scan tools return a summary with a result_id instead of their full
+            findings list; this tool returns the findings one page at a time in
+            a normalized schema (tool, rule_id, severity, title, path, line,
+            package, version, cve, category, fingerprint) shared by all scanners.
+            
+            Args:
+                result_id: result_id from a scan summary
+                cursor: next_cursor of the previous page (omit for the first page)
+                limit: Maximum number of findings per page (at most 1000)
+                filters: Only return findings whose fields have these values, e.g.
+                    {"severity": ["critical", "high"]}, {"min_severity": "high"},
+                    {"category": "CWE-89"} or {"tool": "semgrep"}; if the server
+                    keeps raw findings, other names select fields of the raw
+                    scanner finding, dotted for nested fields ("extra.metadata.cwe")
+                include_raw: Include each scanner's original finding as "raw"
+                    (null unless the server keeps raw findings)
+                dedupe: Return each issue once, with the scanners that reported it,
+                    instead of every scanner's finding (cross-tool deduplication by
+                    dedup_key)
+                
+            Returns:
+                Dictionary with the page of findings, match counts and next_cursor
+                (None on the last page)
+            """
+            try:
+                page = result_store.page(result_id, cursor, limit, filters, include_raw, dedupe)
+            except ResultExpiredError as e:
+                return {"status": "error", "message": str(e), "expired": True, "tool": "get_findings"}
+            except (CursorError, FilterError) as e:
+                return {"status": "error", "message": str(e), "tool": "get_findings"}
+            if page is None:
+                return {
+                    "status": "error",
+                    "message": f"Unknown result_id: {result_id}",
+                    "tool": "get_findings"
+                }
+            return page
+        
+        async def merge_findings(result_ids: List[str]) -> Dict[str, Any]:
+            """
+            Combine the findings of several scans into one deduplicated result.
+            
+            Use it to compare scanners run separately, e.g. trivy and grype scans
+            of the same image. The summary reports the number of unique issues and
+            which scanners agreed on them; page through the merged result with
+            get_findings(result_id, dedupe=True).
+            
+            Args:
+                result_ids: result_ids from scan summaries
+                
+            Returns:
+                Summary of the merged result with its own result_id
+            """
+            try:
+                summary = await asyncio.to_thread(result_store.merge, result_ids)
+            except ResultExpiredError as e:
+                return {"status": "error", "message": str(e), "expired": True, "tool": "merge_findings"}
+            if summary is None:
+                return {
+                    "status": "error",
+                    "message": "Unknown result_id in: " + ", ".join(result_ids),
+                    "tool": "merge_findings"
+                }
+            return summary
+        
+        for func in (get_findings, merge_findings):
+            self._add_tool(func)
+    
+    def _register_submit_tool(self, tool_name: str, wrapped_func: Callable):
+        """
+        Register submit_<tool> which runs a tool as a background job.
+        
+        Args:
+            tool_name: Name of the wrapped tool
+            wrapped_func: Async MCP wrapper of the tool
+        """
+        submit_name = f"submit_{tool_name}"
+        
+        async def submit_tool(**kwargs) -> Dict[str, Any]:
+            # Background jobs are batch work unless the caller says otherwise
+            if kwargs.get("priority") is None:
+                kwargs["priority"] = PRIORITY_BATCH
+            job = self.jobs.submit(tool_name, wrapped_func, kwargs, progress=ProgressReporter(tool_name))
+            return job.to_dict()
+        
+        _copy_tool_metadata(
+            submit_tool,
+            wrapped_func,
+            submit_name,
+            doc=(
+                f"Submit {tool_name} as a background job and return its job_id immediately. "
+                f"Poll with job_status, fetch the output with job_result, stop with job_cancel.\n\n"
+                f"{wrapped_func.__doc__ or ''}"
+            )
+        )
+        submit_tool.__annotations__["return"] = Dict[str, Any]
+        submit_tool.__signature__ = submit_tool.__signature__.replace(return_annotation=Dict[str, Any])
+        
+        self._add_tool(submit_tool)
+        logger.debug(f"[{self.server_name}] Registered tool: {submit_name}")
+    
+    def _register_job_tools(self):
+        """Register job_status, job_result, job_cancel and job_list tools."""
+        jobs = self.jobs
+        
+        def _unknown_job(job_id: str) -> Dict[str, Any]:
+            return {"status": "error", "message": f"Unknown job_id: {job_id}"}
+        
+        async def job_status(job_id: str) -> Dict[str, Any]:
+            """
+            Get the status of a background job.
+            
+            Args:
+                job_id: Job identifier returned by a submit_<tool> call
+                
+            Returns:
+                Dictionary with job status and timing
+            """
+            job = jobs.get(job_id)
+            return job.to_dict() if job else _unknown_job(job_id)
+        
+        async def job_result(job_id: str) -> Dict[str, Any]:
+            """
+            Get the result of a background job.
+            
+            Args:
+                job_id: Job identifier returned by a submit_<tool> call
+                
+            Returns:
+                Dictionary with job status and, once finished, the tool result
+            """
+            job = jobs.get(job_id)
+            if job is None:
+                return _unknown_job(job_id)
+            return job.to_dict(include_result=job.finished)
+        
+        async def job_cancel(job_id: str) -> Dict[str, Any]:
+            """
+            Cancel a queued or running background job.
+            
+            Args:
+                job_id: Job identifier returned by a submit_<tool> call
+                
+            Returns:
+                Dictionary with the cancellation outcome
+            """
+            job = jobs.get(job_id)
+            if job is None:
+                return _unknown_job(job_id)
+            cancelled = jobs.cancel(job_id)
+            return {**job.to_dict(), "cancel_requested": cancelled}
+        
+        async def job_list() -> Dict[str, Any]:
+            """
+            List known background jobs.
+            
+            Returns:
+                Dictionary with metadata for all queued, running and retained jobs
+            """
+            return {"jobs": jobs.list_jobs()}
+        
+        for func in (job_status, job_result, job_cancel, job_list):
+            self._add_tool(func)
+        logger.info(f"[{self.server_name}] Registered background job tools")
     
     def run(self):
-        """Run the MCP server."""
+        """
+        Run the MCP server.
+        
+        Serves stdio unless APPSEC_TRANSPORT (or `type` under
+        [tool.appsec.transport]) selects "http" or "sse", so one long-lived
+        server can be shared by many clients (see the recon transport module).
+        """
         self.register_tools()
-        logger.info(f"[{self.server_name}] Starting stdio transport...")
-        self.mcp.run(transport='stdio')
+        _add_recon_path()
+        from transport import TransportConfig
+        
+        transport = TransportConfig.from_env("APPSEC", self.settings.get("transport", {}))
+        logger.info(f"[{self.server_name}] Starting {transport.describe()} transport...")
+        try:
+            transport.run(self.mcp)
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
 
@@ -0,0 +1,708 @@
+"""
+Shared Git Clone Cache for Repository Scanners
+
+Every *_scan_repository tool used to clone repo_url from scratch. The clone
+cache keeps one bare mirror per repository URL, updates it with `git fetch`,
+and materializes content-addressed worktrees per resolved commit:
+
+    <cache_dir>/mirrors/<repo-key>.git
+    <cache_dir>/checkouts/<repo-key>-<commit>
+
+Scanners that only read the working tree do not need the full history, so
+each tool declares a clone mode:
+
+    full     complete mirror (history scanners such as trufflehog)
+    shallow  `--depth 1` fetch of the requested ref only
+    partial  mirror with `--filter=blob:none`; blobs are fetched on checkout
+    sparse   partial mirror plus a sparse worktree limited to path patterns
+             (e.g. only `*.tf` and `*.yaml` files)
+
+Given a base ref, a lease also reports the files changed between the base and
+the scanned commit and can restrict the worktree to exactly those files, so
+PR-time scans only read what the change touched.
+
+Concurrent requests for the same mirror or commit share a single in-flight
+git operation, worktrees in use are leased so they are never evicted under a
+running scan, and least recently used entries are evicted when the cache
+exceeds its disk budget.
+"""
+
+import asyncio
+import base64
+import contextvars
+import hashlib
+import json
+import os
+import re
+import shutil
+import stat
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = setup_logger(__name__, log_file_path="logs/appsec_base.log")
+
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "appsec_clone_cache"
+DEFAULT_MAX_BYTES = 10 * 1024 ** 3
+DEFAULT_GIT_TIMEOUT = 900
+DEFAULT_MAX_FETCHES = 4
+
+# Only remotes under this URL receive the GitHub token
+GITHUB_URL = "https://github.com/"
+
+# URLs git would treat as an option, a local repository or a command to run
+_UNSAFE_URL_PATTERN = re.compile(r"^(-|file:|[A-Za-z][A-Za-z0-9+.-]*::)", re.IGNORECASE)
+
+# Linux ioctl cloning a file's extents copy-on-write (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+_WRITE_BITS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+# Whether FICLONE works, per device of a cache directory
+_reflink_support: Dict[int, bool] = {}
+
+CLONE_FULL = "full"
+CLONE_SHALLOW = "shallow"
+CLONE_PARTIAL = "partial"
+CLONE_SPARSE = "sparse"
+CLONE_MODES = (CLONE_FULL, CLONE_SHALLOW, CLONE_PARTIAL, CLONE_SPARSE)
+
+# Mirror kind backing each clone mode (sparse worktrees come from the partial mirror)
+_MIRROR_KINDS = {
+    CLONE_FULL: "",
+    CLONE_SHALLOW: ".shallow",
+    CLONE_PARTIAL: ".partial",
+    CLONE_SPARSE: ".partial",
+}
+
+_SHA_PATTERN = re.compile(r"^[0-9a-f]{40}([0-9a-f]{24})?$")
+
+# Characters with a meaning in sparse-checkout (gitignore) patterns
+_PATTERN_SPECIAL = re.compile(r"([\\*?\[\]! ])")
+
+
+class CloneError(Exception):
+    """Raised when a git operation of the clone cache fails."""
+
+
+class Checkout:
+    """A working tree of a repository at a resolved commit."""
+
+    def __init__(
+        self,
+        repo_url: str,
+        commit: str,
+        path: Optional[Path],
+        cache_hit: bool,
+        mode: str = CLONE_FULL,
+        base_commit: Optional[str] = None,
+        changed_files: Optional[List[str]] = None,
+        diff_scoped: bool = False
+    ):
+        """
+        Initialize checkout.
+
+        Args:
+            repo_url: Repository URL the checkout was made from
+            commit: Resolved commit SHA
+            path: Path of the working tree (None for an empty diff-scoped checkout)
+            cache_hit: Whether the working tree already existed
+            mode: Clone mode the working tree was made with
+            base_commit: Resolved base commit SHA of a diff lease
+            changed_files: Files added or modified since base_commit
+            diff_scoped: Whether path only holds the changed files
+        """
+        self.repo_url = repo_url
+        self.commit = commit
+        self.path = path
+        self.cache_hit = cache_hit
+        self.mode = mode
+        self.base_commit = base_commit
+        self.changed_files = changed_files
+        self.diff_scoped = diff_scoped
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize checkout metadata."""
+        data = {
+            "repo_url": self.repo_url,
+            "commit": self.commit,
+            "path": str(self.path) if self.path else None,
+            "cache_hit": self.cache_hit,
+            "mode": self.mode,
+        }
+        if self.base_commit:
+            data["base_commit"] = self.base_commit
+            data["changed_file_count"] = len(self.changed_files or [])
+        return data
+
+
+
+def _dir_size(path: Path) -> int:
+    """Total size in bytes of the files below path."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+# Checkout the current tool call is scanning, set while a repository tool runs
+current_checkout: contextvars.ContextVar[Optional[Checkout]] = contextvars.ContextVar(
+    "current_checkout", default=None
+)
+
+
+def _literal_pattern(path: str) -> str:
+    """Sparse-checkout pattern matching exactly one repository path."""
+    return "/" + _PATTERN_SPECIAL.sub(r"\\\1", path)
+
+
+def _reflink(source: str, target: str) -> bool:
+    """
+    Clone a file copy-on-write.
+
+    Returns:
+        False, leaving no target behind, if the file system cannot
+    """
+    device = os.stat(source).st_dev
+    if fcntl is None or _reflink_support.get(device) is False:
+        return False
+    with open(source, "rb") as source_file, open(target, "wb") as target_file:
+        try:
+            fcntl.ioctl(target_file.fileno(), FICLONE, source_file.fileno())
+            cloned = True
+        except OSError:
+            cloned = False
+    _reflink_support[device] = cloned
+    if not cloned:
+        os.unlink(target)
+    return cloned
+
+
+def _share_file(source: str, target: str):
+    """
+    Add a file of a cached tree to a scratch copy, so writes never reach the cache.
+
+    The file is cloned copy-on-write where the file system supports it.
+    Otherwise it becomes a hard link, and the shared inode is made read-only
+    (which also protects the cached tree). Root ignores permission bits, so
+    as root the file is copied instead.
+    """
+    if _reflink(source, target):
+        shutil.copystat(source, target)
+    elif hasattr(os, "geteuid") and os.geteuid() == 0:
+        shutil.copy2(source, target)
+    else:
+        os.link(source, target)
+        mode = os.stat(target).st_mode
+        if mode & _WRITE_BITS:
+            os.chmod(target, mode & ~_WRITE_BITS)
+
+
+def _link_files(source: Path, target: Path, paths: List[str]):
+    """Share selected files (and the .git link) of a tree into target (see _share_file)."""
+    for relative in [".git", *paths]:
+        source_path = source / relative
+        if not os.path.lexists(source_path) or (source_path.is_dir() and not source_path.is_symlink()):
+            continue
+        target_path = target / relative
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        if source_path.is_symlink():
+            os.symlink(os.readlink(source_path), target_path)
+        else:
+            _share_file(str(source_path), str(target_path))
+
+
+class CloneCache:
+    """Mirror and worktree cache shared by all repository scanners of a server."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        fetch_interval: float = 0.0,
+        git_timeout: float = DEFAULT_GIT_TIMEOUT,
+        max_fetches: int = DEFAULT_MAX_FETCHES
+    ):
+        """
+        Initialize clone cache.
+
+        Args:
+            cache_dir: Directory holding mirrors, checkouts and the LRU index
+            max_bytes: Disk budget; least recently used entries are evicted beyond it
+            fetch_interval: Minimum seconds between fetches of the same mirror
+            git_timeout: Timeout in seconds for a single git operation
+            max_fetches: Maximum clones/fetches running at once
+        """
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.mirrors_dir = self.cache_dir / "mirrors"
+        self.checkouts_dir = self.cache_dir / "checkouts"
+        self.mirrors_dir.mkdir(parents=True, exist_ok=True)
+        self.checkouts_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.fetch_interval = fetch_interval
+        self.git_timeout = git_timeout
+        self.index_path = self.cache_dir / "index.json"
+        self._index: Dict[str, Dict[str, float]] = self._load_index()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._leases: Dict[str, int] = {}
+        self._fetched_at: Dict[str, float] = {}
+        self._fetch_locks: Dict[str, asyncio.Lock] = {}
+        self._network_slots = asyncio.Semaphore(max_fetches)
+        logger.info(f"[CloneCache] Using {self.cache_dir} (budget {max_bytes / 1024 ** 3:.1f} GiB)")
+
+    @staticmethod
+    def repo_key(repo_url: str) -> str:
+        """
+        Stable cache key for a repository URL.
+
+        Args:
+            repo_url: Repository URL
+
+        Returns:
+            Readable, filesystem-safe key unique per normalized URL
+        """
+        normalized = repo_url.strip().rstrip("/")
+        if normalized.endswith(".git"):
+            normalized = normalized[:-4]
+        normalized = re.sub(r"^(https?://)[^@/]+@", r"\1", normalized).lower()
+        slug = re.sub(r"[^a-z0-9]+", "-", "/".join(normalized.split("/")[-2:])).strip("-")
+        digest = hashlib.sha256(normalized.encode()).hexdigest()[:12]
+        return f"{slug[:48]}-{digest}"
+
+    # Index and eviction
+
+    def _load_index(self) -> Dict[str, Dict[str, float]]:
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+
+    async def _record(self, entry: str, path: Path, **metadata: Any):
+        """Update size and last use of a cache entry."""
+        size = await asyncio.to_thread(_dir_size, path)
+        self._index[entry] = {**metadata, "size": size, "last_used": time.time()}
+        self._save_index()
+
+    def _touch(self, entry: str):
+        if entry in self._index:
+            self._index[entry]["last_used"] = time.time()
+
+    def _pin(self, entry: str):
+        self._leases[entry] = self._leases.get(entry, 0) + 1
+
+    def _unpin(self, entry: str):
+        self._leases[entry] = self._leases.get(entry, 1) - 1
+        if self._leases[entry] <= 0:
+            del self._leases[entry]
+
+    async def evict(self):
+        """Evict least recently used, unleased entries until the cache fits its budget."""
+        total = sum(meta.get("size", 0) for meta in self._index.values())
+        if total <= self.max_bytes:
+            return
+
+        # Checkouts go before mirrors: a mirror backs the worktrees made from it
+        candidates = sorted(
+            (entry for entry in self._index if entry not in self._leases),
+            key=lambda entry: (entry.startswith("mirrors/"), self._index[entry].get("last_used", 0))
+        )
+        for entry in candidates:
+            if total <= self.max_bytes:
+                break
+            if entry in self._leases:
+                continue
+            if entry.startswith("mirrors/"):
+                if any(meta.get("mirror") == entry for meta in self._index.values()):
+                    continue
+            meta = self._index.pop(entry)
+            size = meta.get("size", 0)
+            await asyncio.to_thread(shutil.rmtree, self.cache_dir / entry, True)
+            total -= size
+            logger.info(f"[CloneCache] Evicted {entry} ({size / 1024 ** 2:.1f} MiB)")
+            mirror = self.cache_dir / meta["mirror"] if meta.get("mirror") else None
+            if mirror is not None and mirror.exists():
+                await self._git(["worktree", "prune"], cwd=mirror, check=False)
+        self._save_index()
+
+    # Git plumbing
+
+    @staticmethod
+    def _git_env(github_token: Optional[str]) -> Dict[str, str]:
+        """
+        Environment for git, passing credentials via config env vars rather than argv or URLs.
+
+        The token header is scoped to GITHUB_URL, so git only sends it to
+        github.com remotes. Callers choose repo_url, and the server's token
+        must never reach a host they control.
+        """
+        env = dict(os.environ)
+        env["GIT_TERMINAL_PROMPT"] = "0"
+        token = github_token or os.environ.get("GITHUB_TOKEN") or os.environ.get("GITHUB_DEFAULT_TOKEN")
+        if token:
+            credentials = base64.b64encode(f"x-access-token:{token}".encode()).decode()
+            env["GIT_CONFIG_COUNT"] = "1"
+            env["GIT_CONFIG_KEY_0"] = f"http.{GITHUB_URL}.extraHeader"
+            env["GIT_CONFIG_VALUE_0"] = f"Authorization: Basic {credentials}"
+        return env
+
+    async def _git(
+        self,
+        args: List[str],
+        cwd: Optional[Path] = None,
+        github_token: Optional[str] = None,
+        check: bool = True,
+        stdin_data: Optional[bytes] = None
+    ) -> str:
+        """
+        Run a git command.
+
+        Returns:
+            Complete command stdout
+
+        Raises:
+            CloneError: If check is set and the command fails or times out
+        """
+        from process_runner import run_command
+
+        result = await run_command(
+            ["git", *args],
+            timeout=self.git_timeout,
+            cwd=str(cwd) if cwd else None,
+            env=self._git_env(github_token),
+            stdin_data=stdin_data,
+            keep_spill_files=True
+        )
+        stdout = result["stdout"]
+        for key in ("stdout_path", "stderr_path"):
+            spill_path = result.get(key)
+            if not spill_path:
+                continue
+            if key == "stdout_path":
+                # Large outputs (e.g. long diffs) are needed in full
+                with open(spill_path, encoding="utf-8", errors="replace") as f:
+                    stdout = f.read()
+            os.unlink(spill_path)
+        if check and (result["timed_out"] or result["returncode"] != 0):
+            reason = "timed out" if result["timed_out"] else result["stderr"].strip()
+            raise CloneError(f"git {args[0]} failed: {reason}")
+        return stdout
+
+    async def _single_flight(self, key: str, operation: Callable[[], Awaitable[Any]]) -> Any:
+        """Run operation once for concurrent callers sharing the same key."""
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await operation()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an exception nobody else awaited is not logged
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _update_mirror(self, repo_url: str, mirror: Path, mode: str, github_token: Optional[str]) -> Path:
+        """Clone or fetch the bare mirror backing a clone mode."""
+        if mode == CLONE_SHALLOW:
+            # Shallow mirrors only fetch the refs that are requested (see _resolve)
+            if not mirror.exists():
+                tmp_mirror = mirror.with_name(f"{mirror.name}.tmp{os.getpid()}")
+                await asyncio.to_thread(shutil.rmtree, tmp_mirror, True)
+                await self._git(["init", "--quiet", "--bare", str(tmp_mirror)])
+                await self._git(["remote", "add", "origin", "--", repo_url], cwd=tmp_mirror)
+                os.replace(tmp_mirror, mirror)
+            return mirror
+
+        if mirror.exists():
+            if time.monotonic() - self._fetched_at.get(mirror.name, float("-inf")) >= self.fetch_interval:
+                logger.info(f"[CloneCache] Fetching {repo_url} ({mode})")
+                async with self._fetch_lock(mirror), self._network_slots:
+                    await self._git(["fetch", "--prune", "--force", "origin"], cwd=mirror, github_token=github_token)
+        else:
+            logger.info(f"[CloneCache] Mirroring {repo_url} ({mode})")
+            tmp_mirror = mirror.with_name(f"{mirror.name}.tmp{os.getpid()}")
+            await asyncio.to_thread(shutil.rmtree, tmp_mirror, True)
+            args = ["clone", "--mirror"]
+            if _MIRROR_KINDS[mode]:
+                args.append("--filter=blob:none")
+            async with self._network_slots:
+                await self._git([*args, "--", repo_url, str(tmp_mirror)], github_token=github_token)
+            os.replace(tmp_mirror, mirror)
+        self._fetched_at[mirror.name] = time.monotonic()
+        await self._record(f"mirrors/{mirror.name}", mirror)
+        return mirror
+
+    def _fetch_lock(self, mirror: Path) -> asyncio.Lock:
+        """Lock serializing fetches into one mirror (git cannot update shallow info concurrently)."""
+        return self._fetch_locks.setdefault(mirror.name, asyncio.Lock())
+
+    async def _rev_parse(self, mirror: Path, ref: str) -> Optional[str]:
+        """Resolve ref to a commit SHA in mirror, or None if unknown."""
+        try:
+            output = await self._git(["rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"], cwd=mirror)
+        except CloneError:
+            return None
+        return output.strip() or None
+
+    async def _fetch_ref(self, mirror: Path, ref: str, shallow: bool, github_token: Optional[str]) -> str:
+        """Fetch a single ref from origin and return its commit SHA."""
+        local_ref = f"refs/appsec/{hashlib.sha256(ref.encode()).hexdigest()[:16]}"
+        args = ["fetch", "--force", "--no-tags"]
+        if shallow:
+            args.append("--depth=1")
+        async with self._fetch_lock(mirror), self._network_slots:
+            await self._git([*args, "origin", f"+{ref}:{local_ref}"], cwd=mirror, github_token=github_token)
+        commit = await self._rev_parse(mirror, local_ref)
+        if commit is None:
+            raise CloneError(f"Could not resolve {ref}")
+        return commit
+
+    async def _resolve(self, mirror: Path, ref: Optional[str], mode: str, github_token: Optional[str]) -> str:
+        """Resolve a ref (default: the remote HEAD) to a commit SHA, fetching it if needed."""
+        ref = ref or "HEAD"
+        shallow = mode == CLONE_SHALLOW
+        if not shallow or _SHA_PATTERN.match(ref):
+            commit = await self._rev_parse(mirror, ref)
+            if commit is not None:
+                return commit
+        elif time.monotonic() - self._fetched_at.get(f"{mirror.name}#{ref}", float("-inf")) < self.fetch_interval:
+            commit = await self._rev_parse(mirror, f"refs/appsec/{hashlib.sha256(ref.encode()).hexdigest()[:16]}")
+            if commit is not None:
+                return commit
+
+        # Shallow refs and commits not advertised by any branch or tag are fetched explicitly
+        flight_key = f"mirrors/{mirror.name}#{ref}"
+        commit = await self._single_flight(
+            flight_key, lambda: self._fetch_ref(mirror, ref, shallow, github_token)
+        )
+        self._fetched_at[f"{mirror.name}#{ref}"] = time.monotonic()
+        if shallow:
+            await self._record(f"mirrors/{mirror.name}", mirror)
+        return commit
+
+    async def _create_checkout(
+        self,
+        mirror: Path,
+        commit: str,
+        path: Path,
+        sparse_paths: Optional[List[str]],
+        github_token: Optional[str]
+    ):
+        """
+        Materialize a detached (optionally sparse) worktree of commit.
+
+        Leftovers of an interrupted checkout at path are removed first, and a
+        checkout that fails is removed again, so a partial tree is never leased.
+        """
+        logger.info(f"[CloneCache] Checking out {commit[:12]} into {path.name}")
+        await self._discard_checkout(mirror, path)
+        try:
+            if not sparse_paths:
+                await self._git(
+                    ["worktree", "add", "--detach", "--force", str(path), commit],
+                    cwd=mirror, github_token=github_token
+                )
+                return
+            await self._git(
+                ["worktree", "add", "--detach", "--force", "--no-checkout", str(path), commit], cwd=mirror
+            )
+            await self._git(
+                ["sparse-checkout", "set", "--no-cone", "--stdin"],
+                cwd=path, stdin_data="\n".join(sparse_paths).encode()
+            )
+            await self._git(["checkout", "--quiet", "--force", commit], cwd=path, github_token=github_token)
+        except BaseException:
+            logger.warning(f"[CloneCache] Checkout of {commit[:12]} into {path.name} failed, removing it")
+            await self._discard_checkout(mirror, path)
+            raise
+
+    async def _discard_checkout(self, mirror: Path, path: Path):
+        """Remove a worktree directory and its registration in mirror."""
+        await asyncio.to_thread(shutil.rmtree, path, True)
+        await self._git(["worktree", "prune"], cwd=mirror, check=False)
+
+    async def _changed_files(self, mirror: Path, base_commit: str, commit: str) -> List[str]:
+        """Files added or modified between two commits (deleted files have nothing to scan)."""
+        output = await self._git(
+            ["diff", "--name-only", "-z", "--no-renames", "--diff-filter=ACMRT", base_commit, commit],
+            cwd=mirror
+        )
+        return [path for path in output.split("\0") if path]
+
+    # Public API
+
+    @asynccontextmanager
+    async def lease(
+        self,
+        repo_url: str,
+        ref: Optional[str] = None,
+        github_token: Optional[str] = None,
+        mode: str = CLONE_FULL,
+        sparse_paths: Optional[List[str]] = None,
+        base_ref: Optional[str] = None,
+        scope_to_diff: bool = False
+    ):
+        """
+        Provide a working tree of repo_url at ref for the duration of a scan.
+
+        Args:
+            repo_url: Repository URL
+            ref: Branch, tag or commit to check out (default: the remote HEAD)
+            github_token: Token for private repositories (default: GITHUB_TOKEN env var)
+            mode: Clone mode ("full", "shallow", "partial" or "sparse")
+            sparse_paths: Path patterns (gitignore syntax) checked out in sparse mode
+            base_ref: Base branch, tag or commit to compute the changed files against
+            scope_to_diff: Check out only the files changed since base_ref
+
+        Yields:
+            Checkout whose path must be treated as read-only. With scope_to_diff
+            and no changed files, the checkout has no path.
+
+        Raises:
+            ValueError: If mode is unknown or repo_url is an option, a local
+                file:// URL or a remote helper (e.g. ext::) URL
+            CloneError: If the repository cannot be fetched or the ref resolved
+        """
+        if mode not in CLONE_MODES:
+            raise ValueError(f"Unknown clone mode: {mode}")
+        if _UNSAFE_URL_PATTERN.match(repo_url.strip()):
+            raise ValueError(f"Unsupported repository URL: {repo_url}")
+        if mode == CLONE_SPARSE and not sparse_paths:
+            mode = CLONE_PARTIAL
+        if mode != CLONE_SPARSE:
+            sparse_paths = None
+
+        key = self.repo_key(repo_url)
+        mirror_entry = f"mirrors/{key}{_MIRROR_KINDS[mode]}.git"
+        self._pin(mirror_entry)
+        checkout_entry = None
+        try:
+            mirror = await self._single_flight(
+                mirror_entry,
+                lambda: self._update_mirror(repo_url, self.cache_dir / mirror_entry, mode, github_token)
+            )
+            commit = await self._resolve(mirror, ref, mode, github_token)
+            base_commit = changed_files = None
+            if base_ref:
+                base_commit = await self._resolve(mirror, base_ref, mode, github_token)
+                changed_files = await self._changed_files(mirror, base_commit, commit)
+                if scope_to_diff:
+                    if not changed_files:
+                        yield Checkout(repo_url, commit, None, True, mode, base_commit, changed_files, True)
+                        return
+                    sparse_paths = [_literal_pattern(path) for path in changed_files]
+
+            # Full-history worktrees have the same files, so working-tree modes reuse them
+            names = [f"{key}-{commit}"]
+            if base_commit and scope_to_diff:
+                names = [f"{key}-{commit}{_MIRROR_KINDS[mode]}.diff-{base_commit[:12]}"]
+            elif mode == CLONE_SPARSE:
+                digest = hashlib.sha256("\n".join(sorted(sparse_paths)).encode()).hexdigest()[:8]
+                names = [f"{key}-{commit}.sparse-{digest}"]
+            elif mode != CLONE_FULL:
+                names = [f"{key}-{commit}{_MIRROR_KINDS[mode]}", *names]
+            path = next(
+                (self.checkouts_dir / name for name in names
+                 if f"checkouts/{name}" in self._index and (self.checkouts_dir / name / ".git").exists()),
+                self.checkouts_dir / names[0]
+            )
+
+            checkout_entry = f"checkouts/{path.name}"
+            self._pin(checkout_entry)
+            # Only recorded checkouts are complete (see _create_checkout)
+            cache_hit = (
+                checkout_entry in self._index
+                and (path / ".git").exists()
+                and checkout_entry not in self._inflight
+            )
+            if not cache_hit:
+                async def create_checkout():
+                    await self._create_checkout(mirror, commit, path, sparse_paths, github_token)
+                    # Recorded before the flight ends so no later lease mistakes it for a leftover
+                    await self._record(checkout_entry, path, mirror=mirror_entry)
+
+                await self._single_flight(checkout_entry, create_checkout)
+            self._touch(checkout_entry)
+            self._touch(mirror_entry)
+            yield Checkout(
+                repo_url, commit, path, cache_hit, mode, base_commit, changed_files,
+                diff_scoped=bool(base_commit and scope_to_diff)
+            )
+        finally:
+            if checkout_entry is not None:
+                self._unpin(checkout_entry)
+            self._unpin(mirror_entry)
+            self._save_index()
+            await self.evict()
+
+    @asynccontextmanager
+    async def scratch_copy(self, checkout: Checkout, label: str, paths: Optional[List[str]] = None):
+        """
+        Provide a private copy of a leased working tree.
+
+        Reports or caches a scanner writes next to the sources do not show up
+        in the trees other scanners are reading. Files are copy-on-write
+        clones where the file system supports them. Otherwise they are
+        read-only hard links into the cached tree, or plain copies when
+        running as root (see _share_file). Either way, a scanner modifying an
+        existing file never changes the cache.
+
+        Args:
+            checkout: Leased checkout to copy
+            label: Name prefix of the copy (e.g. the scanner name)
+            paths: Only copy these repository paths (e.g. checkout.changed_files)
+
+        Yields:
+            Path of the copy, removed afterwards
+        """
+        scratch_dir = self.cache_dir / "scratch"
+        scratch_dir.mkdir(exist_ok=True)
+        path = Path(tempfile.mkdtemp(prefix=f"{label}-", dir=scratch_dir))
+        try:
+            if paths is not None:
+                await asyncio.to_thread(_link_files, checkout.path, path, paths)
+            else:
+                await asyncio.to_thread(
+                    shutil.copytree, checkout.path, path,
+                    symlinks=True, copy_function=_share_file, dirs_exist_ok=True
+                )
+            yield path
+        finally:
+            await asyncio.to_thread(shutil.rmtree, path, True)
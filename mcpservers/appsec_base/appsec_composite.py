@@ -0,0 +1,191 @@
+"""
+Composite Multi-Scanner Runs for Application Security MCP Servers
+
+scan_repository_all fetches a repository once and runs several repository
+scanners of a server in parallel against private copies of the same working
+tree (see CloneCache.scratch_copy). This module runs the scanners and merges their outputs
+into one result with per-scanner status and timings.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from appsec_progress import ScannerProgress, current_progress
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+logger = setup_logger(__name__, log_file_path="logs/appsec_base.log")
+
+REPOSITORY_TOOL_SUFFIX = "_scan_repository"
+
+# Result keys scanners commonly use for their list of findings
+FINDING_KEYS = ("findings", "results", "vulnerabilities", "issues", "secrets", "matches", "alerts")
+
+
+def scanner_name(tool_name: str) -> str:
+    """Short scanner name of a repository tool (semgrep_scan_repository -> semgrep)."""
+    if tool_name.endswith(REPOSITORY_TOOL_SUFFIX):
+        return tool_name[:-len(REPOSITORY_TOOL_SUFFIX)]
+    return tool_name
+
+
+def select_scanners(available: List[str], requested: Optional[List[str]]) -> Tuple[List[str], List[str]]:
+    """
+    Resolve requested scanner names against the available repository tools.
+
+    Args:
+        available: Repository tool names of the server
+        requested: Tool names or short scanner names (None for all)
+
+    Returns:
+        Tuple of (selected tool names, unknown requested names)
+    """
+    if not requested:
+        return list(available), []
+    by_name = {scanner_name(tool_name): tool_name for tool_name in available}
+    by_name.update({tool_name: tool_name for tool_name in available})
+    selected, unknown = [], []
+    for name in requested:
+        tool_name = by_name.get(name.strip())
+        if tool_name is None:
+            unknown.append(name)
+        elif tool_name not in selected:
+            selected.append(tool_name)
+    return selected, unknown
+
+
+def locate_findings(result: Any) -> Optional[Tuple[str, ...]]:
+    """
+    Locate the list of findings in a scanner result.
+
+    Args:
+        result: Scanner result
+
+    Returns:
+        Key path of the findings list (e.g. ("results", "vulnerabilities")),
+        or None if the result has none
+    """
+    if not isinstance(result, dict):
+        return None
+    for prefix in ((), ("results",), ("data",)):
+        container = result.get(prefix[0]) if prefix else result
+        if not isinstance(container, dict):
+            continue
+        for key in FINDING_KEYS:
+            if isinstance(container.get(key), list):
+                return prefix + (key,)
+    return None
+
+
+def count_findings(result: Any) -> Optional[int]:
+    """Number of findings in a scanner result, if it can be determined."""
+    path = locate_findings(result)
+    if path is None:
+        return None
+    for key in path:
+        result = result[key]
+    return len(result)
+
+
+def scanner_succeeded(result: Any) -> bool:
+    """Whether a scanner result reports success (tools use both "success" and "status")."""
+    if not isinstance(result, dict):
+        return result is not None
+    if "success" in result:
+        return bool(result["success"])
+    return result.get("status") not in ("error", "failed")
+
+
+async def run_scanners(calls: Dict[str, Callable[[], Awaitable[Any]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Run scanners concurrently and time each of them.
+
+    Args:
+        calls: Zero-argument coroutine factories keyed by tool name
+
+    Returns:
+        Per-tool run records with status, duration and raw result
+    """
+    progress = current_progress.get()
+    finished = 0
+
+    async def timed(tool_name: str, call: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+        nonlocal finished
+        started = time.monotonic()
+        if progress is not None:
+            # Runs in its own task; scanner layers report messages, not phases
+            current_progress.set(ScannerProgress(progress, scanner_name(tool_name)))
+        try:
+            result = await call()
+            error = None
+        except Exception as e:
+            logger.error(f"[scan_repository_all] {tool_name} failed: {e}", exc_info=True)
+            result, error = None, str(e)
+        run = {
+            "status": "success" if error is None and scanner_succeeded(result) else "error",
+            "duration_seconds": round(time.monotonic() - started, 3),
+            "finding_count": count_findings(result),
+            "result": result,
+        }
+        if error is not None:
+            run["error"] = error
+        finished += 1
+        if progress is not None:
+            progress.update(
+                message=f"{scanner_name(tool_name)} finished ({finished}/{len(calls)} scanners)",
+                percent=100.0 * finished / len(calls)
+            )
+        return run
+
+    runs = await asyncio.gather(*(timed(tool_name, call) for tool_name, call in calls.items()))
+    return dict(zip(calls, runs))
+
+
+def merge_results(repo_url: str, runs: Dict[str, Dict[str, Any]], duration: float) -> Dict[str, Any]:
+    """
+    Merge per-scanner runs into a single result.
+
+    Args:
+        repo_url: Repository that was scanned
+        runs: Run records from run_scanners
+        duration: Wall-clock seconds of the whole composite scan
+
+    Returns:
+        Dictionary with overall status, summary and per-scanner results
+    """
+    succeeded = [scanner_name(tool_name) for tool_name, run in runs.items() if run["status"] == "success"]
+    failed = [scanner_name(tool_name) for tool_name, run in runs.items() if run["status"] != "success"]
+    counts = [run["finding_count"] for run in runs.values() if run["finding_count"] is not None]
+    if not failed:
+        status = "success"
+    elif succeeded:
+        status = "partial"
+    else:
+        status = "error"
+    return {
+        "status": status,
+        "success": bool(succeeded),
+        "repo_url": repo_url,
+        "summary": {
+            "scanners": [scanner_name(tool_name) for tool_name in runs],
+            "succeeded": succeeded,
+            "failed": failed,
+            "total_findings": sum(counts) if counts else None,
+            "duration_seconds": round(duration, 3),
+            "scanner_seconds": round(sum(run["duration_seconds"] for run in runs.values()), 3),
+        },
+        "scanners": {scanner_name(tool_name): run for tool_name, run in runs.items()},
+    }
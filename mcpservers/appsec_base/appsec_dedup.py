@@ -0,0 +1,118 @@
+"""
+Cross-Tool Finding Deduplication
+
+Scanners overlap: trivy and grype report the same CVEs, semgrep, horusec and
+bearer flag the same lines, gitleaks and trufflehog find the same secrets.
+DedupIndex groups the rows of a FindingTable by their dedup_key (see
+Finding.compute_dedup_key) in a hash index, so a merged view holds each issue
+once together with the scanners that agreed on it. Two different rules of one
+scanner always report different issues, even on the same line and CWE.
+"""
+
+import hashlib
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from appsec_normalize import SEVERITIES, FindingTable
+
+
+class DedupIndex:
+    """Hash index from dedup_key to the rows of a FindingTable reporting that issue."""
+
+    def __init__(self, table: FindingTable):
+        """
+        Initialize and build the index.
+
+        Args:
+            table: Findings to index; rows appended later are picked up by update()
+        """
+        self.table = table
+        self.groups: Dict[str, List[int]] = {}
+        # Issue of each row (its dedup_key, unless split off by rule)
+        self.row_keys: List[str] = []
+        # Rule each scanner reported an issue by
+        self._rules: Dict[str, Dict[Optional[str], Optional[str]]] = {}
+        self.update()
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def update(self):
+        """Index rows added to the table since the last update."""
+        keys = self.table.columns["dedup_key"]
+        tools = self.table.columns["tool"]
+        rule_ids = self.table.columns["rule_id"]
+        groups = self.groups
+        for index in range(len(self.row_keys), len(keys)):
+            key, tool, rule_id = keys[index], tools[index], rule_ids[index]
+            rules = self._rules.setdefault(key, {})
+            if rules.setdefault(tool, rule_id) != rule_id:
+                # Another rule of the same scanner: a different issue
+                key = hashlib.sha1(f"{key}\x1f{tool}\x1f{rule_id or ''}".encode()).hexdigest()[:16]
+                self._rules.setdefault(key, {tool: rule_id})
+            groups.setdefault(key, []).append(index)
+            self.row_keys.append(key)
+
+    def keys(self, rows: Optional[Iterable[int]] = None) -> List[str]:
+        """
+        Unique issues, in order of first occurrence.
+
+        Args:
+            rows: Only issues with at least one of these rows (default: all)
+
+        Returns:
+            List of dedup keys
+        """
+        if rows is None:
+            return list(self.groups)
+        keys = self.row_keys
+        return list(dict.fromkeys(keys[index] for index in rows))
+
+    def scanners(self, key: str) -> List[str]:
+        """Scanners that reported an issue, in order of first report."""
+        tools = self.table.columns["tool"]
+        return list(dict.fromkeys(tools[index] for index in self.groups.get(key, ())))
+
+    def merged_row(self, key: str, include_raw: bool = False) -> Dict[str, Any]:
+        """
+        One issue of the merged view.
+
+        The most severe report represents the issue; the row lists all
+        scanners and rule ids that reported it.
+
+        Args:
+            key: Dedup key
+            include_raw: Include the raw finding of every report as "raw"
+                (None if the table does not keep raw findings)
+
+        Returns:
+            Normalized finding with scanners, rule_ids and occurrences
+        """
+        rows = self.groups[key]
+        severity = self.table.severity
+        representative = max(rows, key=lambda index: severity[index])
+        data = self.table.row(representative)
+        data["dedup_key"] = key
+        rule_ids = self.table.columns["rule_id"]
+        data["scanners"] = self.scanners(key)
+        data["rule_ids"] = list(dict.fromkeys(rule_ids[index] for index in rows if rule_ids[index]))
+        data["occurrences"] = len(rows)
+        if include_raw:
+            data["raw"] = [self.table.raw[index] for index in rows] if self.table.keep_raw else None
+        return data
+
+    def agreement(self) -> Dict[str, int]:
+        """
+        Number of unique issues per combination of reporting scanners.
+
+        Returns:
+            Counts keyed by "+"-joined scanner names, e.g. {"grype+trivy": 120, "trivy": 14}
+        """
+        counter = Counter("+".join(sorted(self.scanners(key))) for key in self.groups)
+        return dict(counter.most_common())
+
+    def severity_counts(self) -> Dict[str, int]:
+        """Number of unique issues per (highest reported) severity."""
+        severity = self.table.severity
+        counter = Counter(SEVERITIES[max(severity[index] for index in rows)] for rows in self.groups.values())
+        return dict(counter.most_common())
@@ -0,0 +1,435 @@
+"""
+Server-Side Result Storage with Paginated Findings Retrieval
+
+Scanner reports on large repositories can hold tens of thousands of findings.
+Instead of sending the whole report in one MCP response, tools return a
+summary (the report without its findings list, plus counts) and a result_id.
+The findings stay on the server, normalized into a FindingTable, and are
+paged through with get_findings, optionally filtered by field values.
+Streaming scans fill an open result while the scanner runs; its pages grow
+until the result is complete.
+
+Results are indexed off the event loop, so the store is guarded by a lock.
+Open results are never pruned, and a result that was pruned while a client
+paged through it is reported as expired rather than unknown.
+"""
+
+import base64
+import binascii
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from appsec_composite import locate_findings
+from appsec_dedup import DedupIndex
+from appsec_normalize import FindingTable
+from appsec_streaming import iter_report_findings, report_path
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+logger = setup_logger(__name__, log_file_path="logs/appsec_base.log")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Raw findings of saved reports larger than this are not kept
+DEFAULT_RAW_REPORT_BYTES = 64 * 1024 ** 2
+
+# Pruned result_ids remembered to tell expired handles from unknown ones
+MAX_EXPIRED_IDS = 10000
+
+
+class CursorError(ValueError):
+    """Raised for cursors that do not belong to the requested result."""
+
+
+class ResultExpiredError(LookupError):
+    """Raised for a result_id whose findings were pruned from the store."""
+
+    def __init__(self, result_id: str, tool_name: str):
+        super().__init__(
+            f"Result {result_id} of {tool_name} has expired (unused too long, or dropped for newer "
+            f"results); run the scan again for a new result_id"
+        )
+        self.result_id = result_id
+        self.tool_name = tool_name
+
+
+def scan_root(result: Dict[str, Any], default: Optional[str] = None) -> Optional[str]:
+    """Directory a scanner scanned, as recorded in its result."""
+    checkout = result.get("repo_checkout")
+    if result.get("scan_root"):
+        return result["scan_root"]
+    if isinstance(checkout, dict) and checkout.get("path"):
+        return checkout["path"]
+    return default
+
+
+def split_result(
+    tool_name: str, result: Any, root: Optional[str] = None
+) -> Optional[Tuple[Dict[str, Any], List[Tuple[str, List[Any], Optional[str]]]]]:
+    """
+    Separate a tool result into its summary and its findings.
+
+    The result is not modified; dictionaries along the path to the findings
+    are copied. Composite (scan_repository_all) results yield the findings of
+    each scanner separately.
+
+    Args:
+        tool_name: Name of the tool that produced the result
+        result: Tool result
+        root: Directory the tool scanned, if not recorded in the result
+
+    Returns:
+        Tuple of (result without findings, [(scanner, findings, scanned directory), ...]),
+        or None if the result has no findings list
+    """
+    if not isinstance(result, dict):
+        return None
+    root = scan_root(result, root)
+    scanners = result.get("scanners")
+    if isinstance(scanners, dict) and all(isinstance(run, dict) and "result" in run for run in scanners.values()):
+        summary = {**result, "scanners": {}}
+        groups: List[Tuple[str, List[Any], Optional[str]]] = []
+        for name, run in scanners.items():
+            split = split_result(name, run["result"], root)
+            if split is None:
+                summary["scanners"][name] = run
+                continue
+            summary["scanners"][name] = {**run, "result": split[0]}
+            groups.extend(split[1])
+        return (summary, groups) if groups else None
+
+    path = locate_findings(result)
+    if path is None:
+        return None
+    summary = dict(result)
+    container = summary
+    for key in path[:-1]:
+        container[key] = dict(container[key])
+        container = container[key]
+    findings = container.pop(path[-1])
+    return summary, [(tool_name, findings, root)]
+
+
+def encode_cursor(result_id: str, offset: int) -> str:
+    """Opaque cursor for the page starting at offset."""
+    return base64.urlsafe_b64encode(f"{result_id}:{offset}".encode()).decode()
+
+
+def decode_cursor(result_id: str, cursor: Optional[str]) -> int:
+    """
+    Offset encoded in a cursor.
+
+    Raises:
+        CursorError: If the cursor is malformed or belongs to another result
+    """
+    if not cursor:
+        return 0
+    try:
+        owner, offset = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit(":", 1)
+        if owner == result_id:
+            return max(0, int(offset))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        pass
+    raise CursorError(f"Invalid cursor for result {result_id}")
+
+
+class StoredResult:
+    """Findings of one tool call kept for paginated retrieval."""
+
+    def __init__(self, tool_name: str, findings: FindingTable):
+        """
+        Initialize stored result.
+
+        Args:
+            tool_name: Name of the tool that produced the findings
+            findings: Normalized findings of the result
+        """
+        self.result_id = uuid.uuid4().hex
+        self.tool_name = tool_name
+        self.findings = findings
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.complete = True
+        self._dedup_index: Optional[DedupIndex] = None
+
+    @property
+    def dedup_index(self) -> DedupIndex:
+        """Cross-tool deduplication index, built on first use and kept up to date."""
+        if self._dedup_index is None:
+            self._dedup_index = DedupIndex(self.findings)
+        else:
+            self._dedup_index.update()
+        return self._dedup_index
+
+    def summarize(self, summary: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add result_id and finding counts to a summary.
+
+        Results with findings of several scanners also report the number of
+        unique issues and which scanners agreed on them.
+        """
+        findings = self.findings
+        summary["result_id"] = self.result_id
+        summary["finding_count"] = len(findings)
+        summary["findings_by_severity"] = findings.counts("severity")
+        tools = findings.counts("tool")
+        if len(tools) > 1:
+            summary["findings_by_tool"] = tools
+            summary["unique_finding_count"] = len(self.dedup_index)
+            summary["unique_findings_by_severity"] = self.dedup_index.severity_counts()
+            summary["scanner_agreement"] = self.dedup_index.agreement()
+        return summary
+
+
+class ResultStore:
+    """In-process store of tool findings, addressed by result_id."""
+
+    def __init__(
+        self,
+        max_results: int = 200,
+        retention_seconds: int = 3600,
+        raw_report_bytes: int = DEFAULT_RAW_REPORT_BYTES,
+        keep_raw: bool = False
+    ):
+        """
+        Initialize result store.
+
+        Args:
+            max_results: Maximum number of results kept (least recently used are dropped)
+            retention_seconds: How long an unused result is kept
+            raw_report_bytes: Saved reports up to this size keep their raw findings
+                (with keep_raw)
+            keep_raw: Keep the scanners' raw findings next to the normalized ones
+        """
+        self.max_results = max_results
+        self.retention_seconds = retention_seconds
+        self.raw_report_bytes = raw_report_bytes
+        self.keep_raw = keep_raw
+        self.results: Dict[str, StoredResult] = {}
+        # Tool names of pruned results, oldest first
+        self.expired: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def put(self, tool_name: str, result: Any, root: Optional[str] = None) -> Any:
+        """
+        Store the findings of a tool result.
+
+        Normalizes every finding, so servers call it off the event loop.
+
+        Args:
+            tool_name: Name of the tool
+            result: Tool result
+            root: Directory the tool scanned, if not recorded in the result
+
+        Returns:
+            Summary with result_id, finding_count and findings_by_severity in
+            place of the findings, or the unchanged result if it has no findings
+        """
+        split = split_result(tool_name, result, root)
+        if split is None:
+            report = report_path(result) if isinstance(result, dict) else None
+            if report is None:
+                return result
+            return self.put_report(tool_name, result, report, scan_root(result, root))
+        summary, groups = split
+        findings = FindingTable(self.keep_raw)
+        for scanner, raw_findings, scanned in groups:
+            findings.extend_raw(scanner, raw_findings, scanned)
+        stored = self._add(StoredResult(tool_name, findings))
+        logger.info(f"[ResultStore] Stored {len(findings)} findings of {tool_name} as {stored.result_id}")
+        return stored.summarize(summary)
+
+    def put_report(self, tool_name: str, result: Dict[str, Any], report: Path, root: Optional[str] = None) -> Any:
+        """
+        Store the findings of a saved report, streaming it from disk.
+
+        Args:
+            tool_name: Name of the tool
+            result: Tool result referencing the report
+            report: Saved JSON, JSON lines or SARIF report
+            root: Directory the tool scanned
+
+        Returns:
+            Summary with result_id and finding counts, or the unchanged result
+            if the report holds no findings or cannot be parsed
+        """
+        keep_raw = self.keep_raw and report.stat().st_size <= self.raw_report_bytes
+        findings = FindingTable(keep_raw)
+        try:
+            findings.extend_raw(tool_name, iter_report_findings(report), root)
+        except (OSError, ValueError) as e:
+            # ijson errors derive from ValueError
+            logger.warning(f"[ResultStore] Could not parse report {report}: {e}")
+            return result
+        if not len(findings):
+            return result
+        stored = self._add(StoredResult(tool_name, findings))
+        logger.info(f"[ResultStore] Streamed {len(findings)} findings of {tool_name} from {report} as {stored.result_id}")
+        return stored.summarize({**result, "findings_source": str(report), "raw_findings_kept": keep_raw})
+
+    def open(self, tool_name: str) -> StoredResult:
+        """
+        Create an empty result that a streaming scan appends findings to.
+
+        The result can be paged while it fills; the caller sets complete once
+        the scan has finished.
+
+        Args:
+            tool_name: Name of the tool
+
+        Returns:
+            The open result
+        """
+        stored = self._add(StoredResult(tool_name, FindingTable(self.keep_raw)))
+        stored.complete = False
+        logger.info(f"[ResultStore] Opened streaming result {stored.result_id} for {tool_name}")
+        return stored
+
+    def merge(self, result_ids: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Combine stored results into a new result for a deduplicated view.
+
+        Args:
+            result_ids: Results to combine (e.g. of trivy and grype scans of one image)
+
+        Returns:
+            Summary of the merged result, or None if a result_id is unknown
+
+        Raises:
+            ResultExpiredError: If a result has expired
+        """
+        parts = [self.get(result_id) for result_id in dict.fromkeys(result_ids)]
+        if any(part is None for part in parts):
+            return None
+        findings = FindingTable(all(part.findings.keep_raw for part in parts))
+        for part in parts:
+            findings.merge(part.findings)
+        stored = self._add(StoredResult("+".join(dict.fromkeys(part.tool_name for part in parts)), findings))
+        logger.info(f"[ResultStore] Merged {len(parts)} results into {stored.result_id}")
+        return stored.summarize({"status": "success", "merged_result_ids": [part.result_id for part in parts]})
+
+    def _add(self, stored: StoredResult) -> StoredResult:
+        """Register a new result, making room for it."""
+        with self._lock:
+            self._prune(room=1)
+            self.results[stored.result_id] = stored
+        return stored
+
+    def get(self, result_id: str) -> Optional[StoredResult]:
+        """
+        Look up a stored result.
+
+        Args:
+            result_id: Identifier returned in a tool summary
+
+        Returns:
+            StoredResult or None if unknown
+
+        Raises:
+            ResultExpiredError: If the result has expired
+        """
+        with self._lock:
+            self._prune()
+            stored = self.results.get(result_id)
+            if stored is not None:
+                stored.last_used = time.time()
+            elif result_id in self.expired:
+                raise ResultExpiredError(result_id, self.expired[result_id])
+        return stored
+
+    def page(
+        self,
+        result_id: str,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        filters: Optional[Dict[str, Any]] = None,
+        include_raw: bool = False,
+        dedupe: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        One page of the findings of a result.
+
+        Args:
+            result_id: Identifier returned in a tool summary
+            cursor: next_cursor of the previous page (None for the first page)
+            limit: Maximum number of findings in the page
+            filters: Field filters (see FindingTable.select)
+            include_raw: Whether findings include the scanner's original output
+            dedupe: Page through unique issues (see DedupIndex) instead of findings
+
+        Returns:
+            Dictionary with the page of findings and next_cursor, or None if
+            the result is unknown. Pages of a result that is still streaming
+            always carry a next_cursor to poll for further findings.
+
+        Raises:
+            CursorError: If the cursor does not belong to the result
+            FilterError: If a filter cannot be applied (see FindingTable.select)
+            ResultExpiredError: If the result has expired
+        """
+        stored = self.get(result_id)
+        if stored is None:
+            return None
+        # Cursors of the deduplicated view count issues, not findings
+        view = f"{result_id}/unique" if dedupe else result_id
+        offset = decode_cursor(view, cursor)
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        selected: List[Any] = stored.findings.select(filters)
+        if dedupe:
+            index = stored.dedup_index
+            selected = index.keys(selected if filters else None)
+            page = selected[offset:offset + limit]
+            findings = [index.merged_row(key, include_raw) for key in page]
+            total = len(index)
+        else:
+            page = selected[offset:offset + limit]
+            findings = [stored.findings.row(row, include_raw) for row in page]
+            total = len(stored.findings)
+        end = offset + len(page)
+        return {
+            "status": "success",
+            "result_id": result_id,
+            "tool": stored.tool_name,
+            "complete": stored.complete,
+            "total": total,
+            "matched": len(selected),
+            "offset": offset,
+            "findings": findings,
+            "next_cursor": encode_cursor(view, end) if end < len(selected) or not stored.complete else None,
+        }
+
+    def _prune(self, room: int = 0):
+        """
+        Drop expired results and cap the number of retained results, leaving room for new ones.
+
+        Open results, still filled by a streaming scan, are kept. Called with the lock held.
+        """
+        now = time.time()
+        by_use = sorted(
+            (stored for stored in self.results.values() if stored.complete), key=lambda stored: stored.last_used
+        )
+        excess = len(self.results) - self.max_results + room
+        for index, stored in enumerate(by_use):
+            if index < excess or now - stored.last_used > self.retention_seconds:
+                del self.results[stored.result_id]
+                self.expired[stored.result_id] = stored.tool_name
+                logger.debug(f"[ResultStore] Pruned {stored.result_id} of {stored.tool_name}")
+        while len(self.expired) > MAX_EXPIRED_IDS:
+            self.expired.popitem(last=False)
@@ -0,0 +1,115 @@
+"""
+Container Image Identity for Result Caching
+
+Image scans are requested by tag (`nginx:latest`), but what a scanner finds
+depends on the image content and on the vulnerability database it matches
+against. These helpers resolve a tag to its content digest and fingerprint
+a scanner's local vulnerability DB, so results can be cached per
+(digest, scanner, DB version) and are invalidated when the DB updates.
+"""
+
+import hashlib
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+logger = setup_logger(__name__, log_file_path="logs/appsec_base.log")
+
+# Seconds a resolved digest or DB fingerprint is reused before asking again
+DEFAULT_LOOKUP_TTL = 60.0
+
+_DIGEST_PATTERN = re.compile(r"sha256:[0-9a-f]{64}")
+
+# Tried in order: scanners prefer a local image over the registry, so the
+# local image ID is what they would scan if the image is present
+DIGEST_COMMANDS = (
+    ["docker", "image", "inspect", "--format", "{{.Id}}", "{image}"],
+    ["crane", "digest", "{image}"],
+    ["skopeo", "inspect", "--format", "{{.Digest}}", "docker://{image}"],
+)
+
+_digests: Dict[str, Tuple[float, str]] = {}
+_db_versions: Dict[str, Tuple[float, str]] = {}
+
+
+async def _output(command: List[str], timeout: float = 60) -> Optional[str]:
+    """Stdout of a successful command, or None."""
+    from process_runner import run_command
+
+    try:
+        result = await run_command(command, timeout=timeout)
+    except OSError:
+        return None
+    if result["returncode"] != 0 or result["timed_out"]:
+        return None
+    return result["stdout"]
+
+
+async def resolve_image_digest(image_name: str, ttl: float = DEFAULT_LOOKUP_TTL) -> Optional[str]:
+    """
+    Resolve an image reference to a content digest.
+
+    Args:
+        image_name: Image reference (tag or digest)
+        ttl: Seconds a resolved tag is reused
+
+    Returns:
+        "sha256:..." digest, or None if it cannot be determined
+    """
+    match = _DIGEST_PATTERN.search(image_name.split("@", 1)[1]) if "@" in image_name else None
+    if match:
+        return match.group(0)
+
+    cached = _digests.get(image_name)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+
+    for template in DIGEST_COMMANDS:
+        output = await _output([part.replace("{image}", image_name) for part in template])
+        match = _DIGEST_PATTERN.search(output or "")
+        if match:
+            _digests[image_name] = (time.monotonic(), match.group(0))
+            return match.group(0)
+    logger.debug(f"[resolve_image_digest] Could not resolve {image_name}")
+    return None
+
+
+async def vulnerability_db_version(command: Optional[List[str]], ttl: float = DEFAULT_LOOKUP_TTL) -> Optional[str]:
+    """
+    Fingerprint a scanner's local vulnerability database.
+
+    Args:
+        command: Command printing the DB status, e.g. ["grype", "db", "status"]
+        ttl: Seconds a fingerprint is reused
+
+    Returns:
+        Short hash of the DB status output, or None if unavailable
+    """
+    if not command:
+        return None
+    key = " ".join(command)
+    cached = _db_versions.get(key)
+    if cached and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+
+    output = await _output(list(command))
+    if not output or not output.strip():
+        logger.debug(f"[vulnerability_db_version] No DB status from {key}")
+        return None
+    version = hashlib.sha256(output.strip().encode()).hexdigest()[:16]
+    _db_versions[key] = (time.monotonic(), version)
+    return version
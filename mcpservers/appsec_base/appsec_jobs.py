@@ -0,0 +1,201 @@
+"""
+Background Job Management for Application Security MCP Servers
+
+Long-running scans (ZAP full scans, dependency-check, SonarQube, ...) can be
+submitted as background jobs so the MCP request returns immediately with a
+job id. Clients then poll job status and fetch the result when it is ready.
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from appsec_progress import ProgressReporter, current_progress
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+logger = setup_logger(__name__, log_file_path="logs/appsec_base.log")
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+class Job:
+    """A single background tool invocation."""
+
+    def __init__(self, tool_name: str, arguments: Dict[str, Any], progress: Optional[ProgressReporter] = None):
+        """
+        Initialize job.
+
+        Args:
+            tool_name: Name of the tool being executed
+            arguments: Keyword arguments passed to the tool
+            progress: Reporter the tool's layers update while the job runs
+        """
+        self.job_id = uuid.uuid4().hex
+        self.tool_name = tool_name
+        self.arguments = arguments
+        self.status = JOB_QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+        self.progress = progress
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job reached a terminal state."""
+        return self.status in FINISHED_STATES
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        """
+        Serialize job metadata.
+
+        Args:
+            include_result: Whether to include the tool result
+
+        Returns:
+            Dictionary describing the job
+        """
+        end = self.finished_at or time.time()
+        data = {
+            "job_id": self.job_id,
+            "tool": self.tool_name,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_seconds": round(end - self.started_at, 3) if self.started_at else None,
+        }
+        if self.progress is not None and self.started_at:
+            data["progress"] = self.progress.to_dict()
+        if self.error:
+            data["error"] = self.error
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class JobManager:
+    """In-process job table for background tool executions."""
+
+    def __init__(self, max_finished_jobs: int = 1000, retention_seconds: int = 3600):
+        """
+        Initialize job manager.
+
+        Args:
+            max_finished_jobs: Maximum number of finished jobs kept for result retrieval
+            retention_seconds: How long finished jobs are kept before being pruned
+        """
+        self.max_finished_jobs = max_finished_jobs
+        self.retention_seconds = retention_seconds
+        self.jobs: Dict[str, Job] = {}
+
+    def submit(
+        self,
+        tool_name: str,
+        func: Callable[..., Awaitable[Any]],
+        arguments: Dict[str, Any],
+        progress: Optional[ProgressReporter] = None
+    ) -> Job:
+        """
+        Start a tool in the background.
+
+        Args:
+            tool_name: Name of the tool
+            func: Async tool wrapper to execute
+            arguments: Keyword arguments for the tool
+            progress: Reporter exposed in job_status while the job runs
+
+        Returns:
+            The created job
+        """
+        self._prune()
+        job = Job(tool_name, arguments, progress)
+        job.task = asyncio.create_task(self._run(job, func))
+        self.jobs[job.job_id] = job
+        logger.info(f"[JobManager] Submitted job {job.job_id} for {tool_name}")
+        return job
+
+    async def _run(self, job: Job, func: Callable[..., Awaitable[Any]]):
+        """Execute a job and record its outcome."""
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        current_progress.set(job.progress)
+        try:
+            job.result = await func(**job.arguments)
+            job.status = JOB_COMPLETED
+        except asyncio.CancelledError:
+            job.status = JOB_CANCELLED
+        except Exception as e:
+            logger.error(f"[JobManager] Job {job.job_id} failed: {e}", exc_info=True)
+            job.status = JOB_FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            logger.info(f"[JobManager] Job {job.job_id} ({job.tool_name}) finished: {job.status}")
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Job or None if unknown
+        """
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            True if a cancellation was requested
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.finished or job.task is None:
+            return False
+        job.task.cancel()
+        logger.info(f"[JobManager] Cancellation requested for job {job_id}")
+        return True
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Return metadata for all known jobs."""
+        return [job.to_dict() for job in self.jobs.values()]
+
+    def _prune(self):
+        """Drop expired finished jobs and cap the number of retained results."""
+        now = time.time()
+        finished = sorted(
+            (job for job in self.jobs.values() if job.finished),
+            key=lambda job: job.finished_at or 0
+        )
+        excess = len(finished) - self.max_finished_jobs
+        for index, job in enumerate(finished):
+            if index < excess or now - (job.finished_at or now) > self.retention_seconds:
+                del self.jobs[job.job_id]
@@ -0,0 +1,149 @@
+"""
+Live Findings of Streaming Scans
+
+Scanners such as TruffleHog print one JSON finding per line while they run.
+In streaming mode the server runs the scanner's stream command itself and a
+FindingStream parses its stdout line by line: every finding is normalized
+into an open result of the findings store as soon as it is printed (so
+get_findings pages grow while the scan runs) and pushed to the client in
+small batches as MCP log notifications on the "findings" logger.
+"""
+
+import asyncio
+import contextvars
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from appsec_findings import StoredResult
+from appsec_normalize import Finding, FindingTable, normalizer_for
+from appsec_progress import report_progress
+from appsec_streaming import iter_json_lines
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+logger = setup_logger(__name__, log_file_path="logs/appsec_base.log")
+
+# Logger name of finding notifications
+FINDINGS_LOGGER = "findings"
+
+# Findings are pushed once this many are pending or the oldest pending one is this old
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_BATCH_SECONDS = 1.0
+
+LogSender = Callable[..., Awaitable[None]]
+
+
+class FindingStream:
+    """Collects the findings a scanner prints and forwards them while it runs."""
+
+    def __init__(
+        self,
+        tool_name: str,
+        stored: Optional[StoredResult] = None,
+        send: Optional[LogSender] = None,
+        root: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_seconds: float = DEFAULT_BATCH_SECONDS
+    ):
+        """
+        Initialize finding stream. Must be created on the event loop.
+
+        Args:
+            tool_name: Name of the tool, selects the field map
+            stored: Open result receiving the findings (None to only collect them)
+            send: Coroutine function sending (message, level, logger_name, extra),
+                e.g. Context.log (None to skip notifications)
+            root: Directory the scanner scans (see relative_path)
+            batch_size: Findings per notification
+            batch_seconds: Maximum age of a pending finding before it is pushed
+        """
+        self.tool_name = tool_name
+        self.stored = stored
+        # Without a store the raw findings are the scan's result
+        self.findings = stored.findings if stored is not None else FindingTable(keep_raw=True)
+        self.send = send
+        self.root = root
+        self.batch_size = batch_size
+        self.batch_seconds = batch_seconds
+        self.tool, self.field_map = normalizer_for(tool_name)
+        self.loop = asyncio.get_running_loop()
+        self._pending: List[int] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lock = asyncio.Lock()
+        self._sends: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self.findings)
+
+    def feed(self, line: bytes):
+        """
+        Add the finding printed on one line of scanner output.
+
+        Args:
+            line: Raw stdout line; blank, malformed and non-object lines are skipped
+        """
+        for raw in iter_json_lines((line,)):
+            if not isinstance(raw, dict):
+                continue
+            if not self._pending:
+                # Push a lone finding even if the scanner goes quiet afterwards
+                self._timer = self.loop.call_later(
+                    self.batch_seconds, self._push, context=contextvars.copy_context()
+                )
+            self.findings.append(Finding.from_raw(self.tool, raw, self.field_map, self.root), raw)
+            self._pending.append(len(self.findings) - 1)
+            if self.stored is not None:
+                self.stored.last_used = time.time()
+        if len(self._pending) >= self.batch_size:
+            self._push()
+
+    def _push(self):
+        """Send pending findings as one notification."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        rows, self._pending = self._pending, []
+        if not rows:
+            return
+        report_progress(f"{len(self.findings)} findings so far")
+        if self.send is None:
+            return
+        extra: Dict[str, Any] = {
+            "tool": self.tool_name,
+            "offset": rows[0],
+            "findings": [self.findings.row(index) for index in rows],
+        }
+        if self.stored is not None:
+            extra["result_id"] = self.stored.result_id
+        task = self.loop.create_task(self._send(f"{self.tool_name}: {len(rows)} new finding(s)", extra))
+        self._sends.add(task)
+        task.add_done_callback(self._sends.discard)
+
+    async def _send(self, message: str, extra: Dict[str, Any]):
+        async with self._lock:
+            try:
+                await self.send(message, "info", FINDINGS_LOGGER, extra)
+            except Exception as e:
+                # The client may have gone away; the findings stay in the result
+                logger.debug(f"[FindingStream] {self.tool_name}: could not send findings: {e}")
+
+    async def close(self):
+        """Push the remaining findings, wait for queued notifications and complete the result."""
+        if self._pending:
+            self._push()
+        if self._sends:
+            await asyncio.gather(*list(self._sends), return_exceptions=True)
+        if self.stored is not None:
+            self.stored.complete = True
@@ -0,0 +1,594 @@
+"""
+Normalized Findings for Application Security MCP Servers
+
+Every scanner reports findings in its own shape (semgrep's check_id/extra,
+trivy's VulnerabilityID/PkgName, grype's vulnerability/artifact, ...). This
+module maps them onto one Finding model - tool, rule id, severity, title,
+location, package, CVE, category and fingerprint - using per-scanner field maps, and
+keeps large sets of findings in a columnar FindingTable: one list per field,
+interned strings and small integer severity codes, so merging, filtering and
+counting 100k+ findings stays fast and memory-light. The scanners' raw
+findings are only kept on request.
+"""
+
+import hashlib
+import re
+import sys
+from array import array
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+logger = setup_logger(__name__, log_file_path="logs/appsec_base.log")
+
+# Normalized severities, indexed by severity code (higher is more severe)
+SEVERITIES = ("unknown", "info", "low", "medium", "high", "critical")
+SEVERITY_CODES = {name: code for code, name in enumerate(SEVERITIES)}
+
+# Scanner-specific severity names
+SEVERITY_ALIASES = {
+    "informational": "info", "information": "info", "note": "info", "negligible": "info", "none": "info",
+    "minor": "low", "warning": "medium", "warn": "medium", "moderate": "medium", "major": "medium",
+    "error": "high", "important": "high", "blocker": "critical",
+}
+
+# Fields of the normalized finding, in output order
+FINDING_FIELDS = (
+    "tool", "rule_id", "severity", "title", "path", "line", "package", "version", "cve", "category",
+    "fingerprint", "dedup_key"
+)
+
+# Columns of a FindingTable holding strings (severity and line are arrays)
+STRING_FIELDS = tuple(field for field in FINDING_FIELDS if field not in ("severity", "line"))
+
+_CVE_PATTERN = re.compile(r"\b(CVE-\d{4}-\d{4,}|GHSA(?:-[23456789cfghjmpqrvwx]{4}){3})\b", re.IGNORECASE)
+
+# CWE ids as "CWE-79" anywhere, or as a bare "79" (bearer's cwe_ids)
+_CWE_PATTERN = re.compile(r"(?:\bCWE-?|^)(\d+)\b", re.IGNORECASE)
+
+
+class FilterError(ValueError):
+    """Raised for finding filters that cannot be applied."""
+
+
+# Finding shapes (sets of top-level keys) remembered per field map
+MAX_PLANS = 256
+
+# Where scanners commonly put each field, as dotted paths (digits index lists)
+GENERIC_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "rule_id": ("rule_id", "ruleId", "RuleID", "check_id", "id", "ID", "VulnerabilityID", "vulnerability.id", "name"),
+    "severity": ("severity", "Severity", "extra.severity", "vulnerability.severity", "level", "risk"),
+    "title": ("title", "Title", "message", "extra.message", "description", "Description", "details", "name"),
+    "path": ("path", "file", "File", "filename", "file_path", "filePath", "location.path", "Target"),
+    "line": ("line", "Line", "start.line", "StartLine", "line_number", "startLine", "location.start_line"),
+    "package": ("package", "package_name", "packageName", "PkgName", "artifact.name"),
+    "version": ("version", "installed_version", "InstalledVersion", "artifact.version"),
+    "cve": ("cve", "CVE", "cve_id", "VulnerabilityID", "vulnerability.id", "identifiers.CVE.0", "extra.metadata.cve"),
+    "category": ("cwe", "CWE", "cwe_id", "cwe_ids.0", "cweid", "extra.metadata.cwe", "metadata.cwe"),
+    "fingerprint": ("fingerprint", "Fingerprint", "extra.fingerprint"),
+}
+
+
+class FieldMap:
+    """How to read normalized fields from one scanner's findings."""
+
+    def __init__(
+        self,
+        fields: Optional[Dict[str, Tuple[str, ...]]] = None,
+        default_severity: str = "unknown",
+        severity: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+        secret: Tuple[str, ...] = ()
+    ):
+        """
+        Initialize field map.
+
+        Args:
+            fields: Dotted paths per normalized field, tried before GENERIC_FIELDS
+            default_severity: Severity of findings that carry none (e.g. secrets)
+            severity: Optional function deriving the severity from a raw finding
+            secret: Dotted paths of the secret a finding reports; its hash
+                becomes the category, so scanners finding the same secret agree
+        """
+        self.paths = {
+            field: tuple(
+                tuple(path.split("."))
+                for path in dict.fromkeys((fields or {}).get(field, ()) + GENERIC_FIELDS.get(field, ()))
+            )
+            for field in FINDING_FIELDS
+        }
+        self.default_severity = default_severity
+        self.severity = severity
+        self.secret = tuple(tuple(path.split(".")) for path in secret)
+        self._plans: Dict[Tuple[str, ...], Dict[str, Tuple[Tuple[str, ...], ...]]] = {}
+
+    def plan(self, finding: Dict[str, Any]) -> Dict[str, Tuple[Tuple[str, ...], ...]]:
+        """
+        Paths worth trying for a finding, per field.
+
+        Findings of one scanner share a few shapes, so the paths whose first
+        key the finding has are computed once per set of top-level keys.
+        """
+        shape = tuple(finding)
+        plan = self._plans.get(shape)
+        if plan is None:
+            keys = set(shape)
+            plan = {field: tuple(path for path in paths if path[0] in keys) for field, paths in self.paths.items()}
+            if len(self._plans) < MAX_PLANS:
+                self._plans[shape] = plan
+        return plan
+
+
+# Per-scanner field maps, keyed by scanner name (tool name prefix)
+NORMALIZERS: Dict[str, FieldMap] = {
+    "semgrep": FieldMap({
+        "rule_id": ("check_id",), "title": ("extra.message",), "severity": ("extra.severity",),
+        "line": ("start.line",), "cve": ("extra.metadata.cve",),
+    }),
+    "bearer": FieldMap({
+        "rule_id": ("id",), "path": ("filename", "full_filename"), "line": ("line_number",),
+        "category": ("cwe_ids.0",),
+    }),
+    "horusec": FieldMap({
+        "rule_id": ("rule_id", "vulnerabilities.rule_id", "type"),
+        "severity": ("severity", "vulnerabilities.severity"),
+        "title": ("details", "vulnerabilities.details"),
+        "path": ("file", "vulnerabilities.file"),
+        "line": ("line", "vulnerabilities.line"),
+    }),
+    "trivy": FieldMap({
+        "rule_id": ("VulnerabilityID", "AVDID", "ID", "RuleID"), "package": ("PkgName",),
+        "version": ("InstalledVersion",), "path": ("Target", "PkgPath"),
+        "line": ("StartLine", "CauseMetadata.StartLine"),
+    }),
+    "grype": FieldMap({
+        "rule_id": ("vulnerability.id",), "severity": ("vulnerability.severity",),
+        "title": ("vulnerability.description",), "package": ("artifact.name",),
+        "version": ("artifact.version",), "path": ("artifact.locations.0.path",),
+    }),
+    "checkov": FieldMap({
+        "rule_id": ("check_id",), "title": ("check_name",), "path": ("file_path",), "line": ("file_line_range.0",),
+    }),
+    "terrascan": FieldMap({
+        "rule_id": ("rule_id", "rule_name"), "title": ("description",), "path": ("file",),
+    }),
+    "kubescape": FieldMap({
+        "rule_id": ("controlID", "control_id"), "title": ("name",), "path": ("resourceID", "file"),
+    }),
+    "kube_bench": FieldMap({"rule_id": ("test_number",), "title": ("test_desc",)}, default_severity="medium"),
+    "kube_hunter": FieldMap({
+        "rule_id": ("vid",), "title": ("vulnerability",), "path": ("location",),
+    }),
+    "gitleaks": FieldMap({
+        "rule_id": ("RuleID",), "title": ("Description",), "path": ("File",), "line": ("StartLine",),
+    }, default_severity="high", secret=("Secret",)),
+    "trufflehog": FieldMap(
+        {
+            "rule_id": ("DetectorName", "detector_name"),
+            "path": ("SourceMetadata.Data.Git.file", "SourceMetadata.Data.Filesystem.file"),
+            "line": ("SourceMetadata.Data.Git.line", "SourceMetadata.Data.Filesystem.line"),
+        },
+        severity=lambda finding: "high" if finding.get("Verified") or finding.get("verified") else "medium",
+        secret=("Raw", "raw")
+    ),
+    "gitguardian": FieldMap({
+        "rule_id": ("detector", "policy", "break_type", "type"), "title": ("break_type", "type"),
+        "severity": ("severity", "incident_severity"),
+    }, default_severity="high"),
+    "dependency_check": FieldMap({
+        "severity": ("severity", "cvssv3.baseSeverity", "cvssv2.severity"), "package": ("packageName", "fileName"),
+    }),
+    "retire_js": FieldMap({
+        "rule_id": ("identifiers.summary", "component"), "package": ("component",), "cve": ("identifiers.CVE.0",),
+    }),
+    "sonarqube": FieldMap({
+        "rule_id": ("rule",), "path": ("component",), "line": ("line", "textRange.startLine"),
+    }),
+    "zap": FieldMap({
+        "rule_id": ("pluginid", "pluginId", "alertRef"), "title": ("alert", "name"),
+        "severity": ("riskdesc", "risk"), "path": ("url", "uri", "instances.0.uri"),
+    }),
+    "nikto": FieldMap({"rule_id": ("id",), "title": ("msg",), "path": ("url",)}),
+    "wapiti": FieldMap({"title": ("info",), "path": ("path",), "severity": ("level",)}),
+    "mobsf": FieldMap({"title": ("title", "description"), "path": ("file", "files.0")}),
+}
+
+GENERIC = FieldMap()
+
+
+def normalizer_for(tool_name: str) -> Tuple[str, FieldMap]:
+    """
+    Field map for a tool.
+
+    Args:
+        tool_name: Tool name (trivy_scan_container) or scanner name (trivy)
+
+    Returns:
+        Tuple of (scanner name, field map); unknown scanners use the generic map
+    """
+    for name in sorted(NORMALIZERS, key=len, reverse=True):
+        if tool_name == name or tool_name.startswith(name + "_"):
+            return name, NORMALIZERS[name]
+    return tool_name.split("_scan")[0], GENERIC
+
+
+def _lookup(finding: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    """Value at a split dotted path (digits index lists), or None."""
+    value: Any = finding
+    for part in path:
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return None
+    return value
+
+
+def _first(finding: Dict[str, Any], paths: Tuple[Tuple[str, ...], ...]) -> Any:
+    """First present, non-empty scalar among paths."""
+    for path in paths:
+        value = _lookup(finding, path)
+        if value not in (None, "", [], {}) and not isinstance(value, (dict, list)):
+            return value
+    return None
+
+
+def normalize_severity(value: Any) -> str:
+    """
+    Map a scanner severity (name or CVSS score) onto SEVERITIES.
+
+    Args:
+        value: Scanner severity, e.g. "ERROR", "High (Medium)", 7.5
+
+    Returns:
+        Normalized severity name
+    """
+    if isinstance(value, bool) or value is None:
+        return "unknown"
+    if isinstance(value, (int, float)):
+        score = float(value)
+    else:
+        words = str(value).strip().lower().split()
+        if not words:
+            return "unknown"
+        word = words[0]
+        try:
+            score = float(word)
+        except ValueError:
+            word = SEVERITY_ALIASES.get(word, word)
+            return word if word in SEVERITY_CODES else "unknown"
+    if score >= 9.0:
+        return "critical"
+    if score >= 7.0:
+        return "high"
+    if score >= 4.0:
+        return "medium"
+    return "low" if score > 0 else "info"
+
+
+def relative_path(path: str, root: Optional[str] = None) -> str:
+    """
+    Repository-relative form of a reported path.
+
+    Scanners report paths below the (temporary) directory they scanned, with
+    or without a leading "./". Paths outside root, URLs and image paths are
+    returned unchanged.
+
+    Args:
+        path: Path as reported by the scanner
+        root: Directory the scanner scanned
+
+    Returns:
+        Path relative to root, without "./" prefix
+    """
+    if root:
+        root = root.rstrip("/") + "/"
+        if path.startswith(root):
+            path = path[len(root):]
+    while path.startswith("./"):
+        path = path[2:]
+    return path
+
+
+class Finding:
+    """A scanner finding in the normalized schema."""
+
+    __slots__ = FINDING_FIELDS
+
+    def __init__(
+        self,
+        tool: str,
+        rule_id: Optional[str] = None,
+        severity: str = "unknown",
+        title: Optional[str] = None,
+        path: Optional[str] = None,
+        line: Optional[int] = None,
+        package: Optional[str] = None,
+        version: Optional[str] = None,
+        cve: Optional[str] = None,
+        category: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+        dedup_key: Optional[str] = None
+    ):
+        self.tool = tool
+        self.rule_id = rule_id
+        self.severity = severity
+        self.title = title
+        self.path = path
+        self.line = line
+        self.package = package
+        self.version = version
+        self.cve = cve
+        self.category = category
+        self.fingerprint = fingerprint or self.compute_fingerprint()
+        self.dedup_key = dedup_key or self.compute_dedup_key()
+
+    def compute_fingerprint(self) -> str:
+        """Stable fingerprint of the finding within its tool."""
+        material = "\x1f".join(
+            str(getattr(self, field) or "") for field in ("tool", "rule_id", "path", "line", "package", "version", "cve")
+        )
+        return hashlib.sha1(material.encode()).hexdigest()[:16]
+
+    def compute_dedup_key(self) -> str:
+        """
+        Fingerprint of the issue a finding reports, equal across scanners.
+
+        Vulnerabilities are identified by advisory, package and version (trivy
+        and grype report the same CVE). Code and secret findings are identified
+        by file, line and category: semgrep and bearer flagging the same line
+        with the same CWE, gitleaks and trufflehog finding the same secret.
+        Findings at a location without a category are only equal for the same
+        tool and rule, so unrelated issues on one line stay apart. Findings
+        with neither keep their per-tool fingerprint.
+        """
+        if self.cve or (self.package and self.rule_id):
+            identity = ("vuln", self.cve or self.rule_id, (self.package or "").lower(), self.version or "")
+        elif self.path and self.line is not None and self.category:
+            identity = ("location", self.path, str(self.line), self.category)
+        elif self.path and self.line is not None:
+            identity = ("location", self.path, str(self.line), self.tool, self.rule_id or "")
+        else:
+            identity = (self.tool, self.fingerprint)
+        return hashlib.sha1("\x1f".join(identity).encode()).hexdigest()[:16]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the finding."""
+        return {field: getattr(self, field) for field in FINDING_FIELDS}
+
+    @classmethod
+    def from_raw(
+        cls, tool: str, finding: Any, field_map: Optional[FieldMap] = None, root: Optional[str] = None
+    ) -> "Finding":
+        """
+        Normalize a raw scanner finding.
+
+        Args:
+            tool: Scanner name
+            finding: Finding as reported by the scanner
+            field_map: Field map of the scanner (default: looked up by tool)
+            root: Directory the scanner scanned; paths below it become relative
+
+        Returns:
+            Normalized Finding
+        """
+        if field_map is None:
+            tool, field_map = normalizer_for(tool)
+        if not isinstance(finding, dict):
+            return cls(tool, title=str(finding)[:500])
+        paths = field_map.plan(finding)
+        severity = field_map.severity(finding) if field_map.severity else _first(finding, paths["severity"])
+        severity = normalize_severity(severity)
+        if severity == "unknown":
+            severity = field_map.default_severity
+        line = _first(finding, paths["line"])
+        try:
+            line = int(line) if line is not None else None
+        except (TypeError, ValueError):
+            line = None
+        cve = None
+        for path in paths["cve"]:
+            match = _CVE_PATTERN.search(str(_lookup(finding, path) or ""))
+            if match:
+                cve = match.group(1).upper()
+                break
+        category = None
+        secret = _first(finding, field_map.secret)
+        if secret is not None:
+            category = "secret:" + hashlib.sha1(str(secret).encode()).hexdigest()[:16]
+        else:
+            for path in paths["category"]:
+                match = _CWE_PATTERN.search(str(_lookup(finding, path) or ""))
+                if match:
+                    category = f"CWE-{int(match.group(1))}"
+                    break
+        text = {field: _first(finding, paths[field]) for field in ("rule_id", "title", "path", "package", "version", "fingerprint")}
+        if text["path"] is not None:
+            text["path"] = relative_path(str(text["path"]), root)
+        return cls(
+            tool,
+            severity=severity,
+            line=line,
+            cve=cve,
+            category=category,
+            **{field: str(value) if value is not None else None for field, value in text.items()}
+        )
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern a column string so repeated values (paths, rules) share memory."""
+    return sys.intern(value) if value is not None else None
+
+
+class FindingTable:
+    """Columnar storage of normalized findings, optionally with their raw scanner output."""
+
+    def __init__(self, keep_raw: bool = False):
+        """
+        Initialize finding table.
+
+        Args:
+            keep_raw: Keep each scanner's original finding (for include_raw and
+                filters on raw fields); raw findings often take more memory
+                than all normalized columns together
+        """
+        self.columns: Dict[str, List[Optional[str]]] = {field: [] for field in STRING_FIELDS}
+        self.severity = array("b")
+        self.line = array("l")
+        self.keep_raw = keep_raw
+        self.raw: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self.severity)
+
+    def append(self, finding: Finding, raw: Any = None):
+        """
+        Add a finding.
+
+        Args:
+            finding: Normalized finding
+            raw: Finding as reported by the scanner (dropped unless keep_raw)
+        """
+        for field in STRING_FIELDS:
+            self.columns[field].append(_intern(getattr(finding, field)))
+        self.severity.append(SEVERITY_CODES.get(finding.severity, 0))
+        self.line.append(finding.line if finding.line is not None else -1)
+        if self.keep_raw:
+            self.raw.append(raw)
+
+    def extend_raw(self, tool_name: str, findings: Iterable[Any], root: Optional[str] = None):
+        """
+        Normalize and add raw findings of one scanner.
+
+        Findings are consumed one at a time, so a generator (e.g. a streamed
+        report) is never materialized as a whole.
+
+        Args:
+            tool_name: Tool or scanner name, selects the field map
+            findings: Findings as reported by the scanner
+            root: Directory the scanner scanned (see relative_path)
+        """
+        tool, field_map = normalizer_for(tool_name)
+        for raw in findings:
+            self.append(Finding.from_raw(tool, raw, field_map, root), raw)
+
+    def merge(self, other: "FindingTable"):
+        """Append all findings of another table."""
+        if self.keep_raw:
+            self.raw.extend(other.raw if other.keep_raw else [None] * len(other))
+        for field in STRING_FIELDS:
+            self.columns[field].extend(other.columns[field])
+        self.severity.extend(other.severity)
+        self.line.extend(other.line)
+
+    def finding(self, index: int) -> Finding:
+        """Normalized finding at index."""
+        line = self.line[index]
+        return Finding(
+            severity=SEVERITIES[self.severity[index]],
+            line=line if line >= 0 else None,
+            **{field: self.columns[field][index] for field in STRING_FIELDS}
+        )
+
+    def row(self, index: int, include_raw: bool = False) -> Dict[str, Any]:
+        """
+        Serialized finding at index.
+
+        Args:
+            index: Row index
+            include_raw: Whether to include the scanner's original finding
+                (None if the table does not keep raw findings)
+
+        Returns:
+            Dictionary with the normalized fields (and "raw")
+        """
+        data = self.finding(index).to_dict()
+        if include_raw:
+            data["raw"] = self.raw[index] if self.keep_raw else None
+        return data
+
+    def select(self, filters: Optional[Dict[str, Any]] = None) -> List[int]:
+        """
+        Indices of findings matching all filters.
+
+        Args:
+            filters: Normalized field name to a value or list of accepted
+                values; strings compare case-insensitively. "severity" also
+                accepts scanner severity names, "min_severity" keeps findings
+                at or above a severity. "line" accepts line numbers. Other
+                names are looked up as dotted paths in the raw finding.
+
+        Returns:
+            Matching row indices in table order
+
+        Raises:
+            FilterError: For non-numeric lines, or raw fields of a table
+                that does not keep raw findings
+        """
+        selected = range(len(self))
+        for field, expected in (filters or {}).items():
+            accepted = expected if isinstance(expected, list) else [expected]
+            if field == "min_severity":
+                floor = SEVERITY_CODES[normalize_severity(accepted[0])]
+                column = self.severity
+                selected = [i for i in selected if column[i] >= floor]
+            elif field == "severity":
+                codes = {SEVERITY_CODES[normalize_severity(value)] for value in accepted}
+                column = self.severity
+                selected = [i for i in selected if column[i] in codes]
+            elif field == "line":
+                try:
+                    lines = {int(value) for value in accepted}
+                except (TypeError, ValueError):
+                    raise FilterError(f"line filter expects line numbers, got {expected!r}") from None
+                column = self.line
+                selected = [i for i in selected if column[i] in lines]
+            elif field in self.columns:
+                values = {str(value).lower() for value in accepted}
+                column = self.columns[field]
+                selected = [i for i in selected if column[i] is not None and column[i].lower() in values]
+            else:
+                if not self.keep_raw:
+                    raise FilterError(
+                        f"Unknown field {field!r}: raw scanner findings are not kept, so only normalized "
+                        f"fields ({', '.join(FINDING_FIELDS)}) can be filtered"
+                    )
+                values = {str(value).lower() for value in accepted}
+                path = tuple(field.split("."))
+                selected = [
+                    i for i in selected
+                    if isinstance(self.raw[i], dict) and str(_lookup(self.raw[i], path)).lower() in values
+                ]
+        return list(selected)
+
+    def counts(self, field: str, indices: Optional[Iterable[int]] = None) -> Dict[str, int]:
+        """
+        Number of findings per value of a field.
+
+        Args:
+            field: Normalized field name
+            indices: Restrict to these rows (default: all)
+
+        Returns:
+            Counts keyed by field value, most common first
+        """
+        if field == "severity":
+            codes = self.severity if indices is None else (self.severity[i] for i in indices)
+            counter = Counter(SEVERITIES[code] for code in codes)
+        else:
+            column = self.columns[field]
+            counter = Counter(column if indices is None else (column[i] for i in indices))
+        return {str(value): count for value, count in counter.most_common()}
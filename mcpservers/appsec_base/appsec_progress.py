@@ -0,0 +1,209 @@
+"""
+Progress Reporting for Long-Running Scans
+
+A ZAP full scan or SonarQube analysis runs for tens of minutes. Each tool call
+gets a ProgressReporter that the server layers update as the call moves
+through its phases (queued, clone, scan, write, parse). Calls made with an
+MCP progress token receive the updates as progress notifications, background
+jobs expose them through job_status, and a heartbeat repeats the current
+phase so a stuck stage is visible. Tools can report their own progress
+(percentage, URLs crawled) with report_progress(), also from worker threads.
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Union
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+logger = setup_logger(__name__, log_file_path="logs/appsec_base.log")
+
+PHASE_QUEUED = "queued"
+PHASE_CLONE = "clone"
+PHASE_SCAN = "scan"
+PHASE_WRITE = "write"
+PHASE_PARSE = "parse"
+PHASE_DONE = "done"
+
+# Progress (out of 100) at the start of each phase, in the order the server
+# layers run them: the raw result is written to the result cache before its
+# findings are parsed into the findings store. Tool-reported percentages are
+# mapped into the scan phase.
+PHASE_PROGRESS = {
+    PHASE_QUEUED: 1.0,
+    PHASE_CLONE: 2.0,
+    PHASE_SCAN: 10.0,
+    PHASE_WRITE: 90.0,
+    PHASE_PARSE: 95.0,
+    PHASE_DONE: 100.0,
+}
+
+ProgressSender = Callable[[float, Optional[float], Optional[str]], Awaitable[None]]
+
+
+class ProgressReporter:
+    """Progress state of one tool call, optionally forwarded as MCP notifications."""
+
+    def __init__(self, tool_name: str, send: Optional[ProgressSender] = None):
+        """
+        Initialize progress reporter. Must be created on the event loop.
+
+        Args:
+            tool_name: Name of the tool being run
+            send: Coroutine function sending (progress, total, message), e.g.
+                Context.report_progress (None to only record progress)
+        """
+        self.tool_name = tool_name
+        self.send = send
+        self.loop = asyncio.get_running_loop()
+        self.phase: Optional[str] = None
+        self.message: Optional[str] = None
+        self.progress = 0.0
+        self.started_at = time.time()
+        self.phase_started_at = self.started_at
+        self.finished_at: Optional[float] = None
+        # Open result a streaming scan fills, for paging while it runs
+        self.result_id: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._pending: Set[asyncio.Task] = set()
+
+    def update(self, phase: Optional[str] = None, message: Optional[str] = None, percent: Optional[float] = None):
+        """
+        Record progress. Safe to call from worker threads.
+
+        Args:
+            phase: New phase (one of the PHASE_* names), None to keep the current one
+            message: Human-readable status, e.g. "semgrep running"
+            percent: Completion of the scan phase in percent, if the scanner exposes it
+        """
+        if not self._on_loop():
+            self.loop.call_soon_threadsafe(self.update, phase, message, percent)
+            return
+        if phase and phase != self.phase:
+            self.phase = phase
+            self.phase_started_at = time.time()
+            if phase == PHASE_DONE:
+                self.finished_at = self.phase_started_at
+        if message:
+            self.message = message
+        if percent is not None:
+            low, high = PHASE_PROGRESS[PHASE_SCAN], PHASE_PROGRESS[PHASE_WRITE]
+            target = low + (high - low) * min(max(percent, 0.0), 100.0) / 100.0
+        else:
+            target = PHASE_PROGRESS.get(phase or "", 0.0)
+        self._advance(target, final=phase == PHASE_DONE)
+        self._notify(self.message)
+
+    def _advance(self, target: float, final: bool = False):
+        """Move progress towards target; notifications must carry increasing values."""
+        ceiling = 100.0 if final else 99.9
+        self.progress = min(max(target, self.progress + 0.01), ceiling)
+
+    def _notify(self, message: Optional[str]):
+        """Send the current progress, keeping notifications in order."""
+        if self.send is not None:
+            task = self.loop.create_task(self._send(self.progress, message))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    def _on_loop(self) -> bool:
+        """Whether the caller runs on the reporter's event loop thread."""
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    async def _send(self, progress: float, message: Optional[str]):
+        async with self._lock:
+            try:
+                await self.send(round(progress, 2), 100.0, message)
+            except Exception as e:
+                # The client may have gone away; progress is best effort
+                logger.debug(f"[ProgressReporter] {self.tool_name}: could not send progress: {e}")
+
+    async def flush(self):
+        """Wait until queued notifications are sent."""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    async def heartbeat(self, interval: float):
+        """
+        Repeat the current phase every interval seconds until cancelled.
+
+        Args:
+            interval: Seconds between heartbeats
+        """
+        while True:
+            await asyncio.sleep(interval)
+            elapsed = int(time.time() - self.phase_started_at)
+            status = f"{self.tool_name}: {self.phase or 'running'} for {elapsed}s"
+            self._advance(self.progress)
+            self._notify(f"{status} ({self.message})" if self.message else status)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the progress state."""
+        now = self.finished_at or time.time()
+        data = {
+            "phase": self.phase,
+            "message": self.message,
+            "progress": round(self.progress, 1),
+            "phase_seconds": round(now - self.phase_started_at, 1),
+            "elapsed_seconds": round(now - self.started_at, 1),
+        }
+        if self.result_id:
+            data["result_id"] = self.result_id
+        return data
+
+
+class ScannerProgress:
+    """Progress of one scanner in a composite run, reported as messages of the composite call."""
+
+    def __init__(self, parent: ProgressReporter, scanner: str):
+        """
+        Initialize scanner progress.
+
+        Args:
+            parent: Reporter of the composite call
+            scanner: Short scanner name prefixed to messages
+        """
+        self.parent = parent
+        self.scanner = scanner
+
+    def update(self, phase: Optional[str] = None, message: Optional[str] = None, percent: Optional[float] = None):
+        """Forward a scanner update; phases and percentages belong to the composite call."""
+        status = message or phase
+        if status:
+            self.parent.update(message=f"{self.scanner}: {status}")
+
+
+current_progress: ContextVar[Optional[Union[ProgressReporter, ScannerProgress]]] = ContextVar("current_progress", default=None)
+
+
+def report_progress(message: Optional[str] = None, percent: Optional[float] = None, phase: Optional[str] = None):
+    """
+    Report progress of the current tool call, if it is tracked.
+
+    Tools call this for scanner-level progress, e.g.
+    report_progress("Spidered 120 URLs", percent=35).
+
+    Args:
+        message: Human-readable status
+        percent: Completion of the scan in percent
+        phase: New phase (one of the PHASE_* names)
+    """
+    reporter = current_progress.get()
+    if reporter is not None:
+        reporter.update(phase, message, percent)
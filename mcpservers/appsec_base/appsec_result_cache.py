@@ -0,0 +1,247 @@
+"""
+Persistent Result Cache for Application Security MCP Servers
+
+Agents often repeat the same scan of an unchanged commit within minutes. The
+result cache stores successful tool results in SQLite keyed by tool name,
+content identity of the input (e.g. the resolved commit SHA), scanner version
+and normalized arguments, so repeated scans return instantly. Entries expire
+after a per-tool TTL and the least recently used entries are evicted once
+the cache exceeds its size budget.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+logger = setup_logger(__name__, log_file_path="logs/appsec_base.log")
+
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "appsec_result_cache"
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_MAX_BYTES = 1024 ** 3
+
+# Arguments that do not change what a call returns. Output arguments
+# (save_output, output_dir, scan_id) are not among them: a cached result
+# carries the report paths of the call that produced it.
+VOLATILE_ARGUMENTS = frozenset({
+    "repo_url", "timeout", "priority", "no_cache", "github_token", "head_ref", "base_ref",
+})
+
+# Version of a scanner whose probe failed; its results are not cached
+UNKNOWN_VERSION = "unknown"
+# Version of a scanner without a version command (e.g. a service such as MobSF)
+UNVERSIONED = "unversioned"
+
+# Seconds a probed version is trusted (scanners get upgraded in place)
+VERSION_TTL_SECONDS = 3600
+# Seconds before a failed probe is retried
+VERSION_RETRY_SECONDS = 60
+
+# Version and monotonic probe time per version command
+_scanner_versions: Dict[str, Tuple[str, float]] = {}
+
+
+async def scanner_version(command: Optional[List[str]]) -> str:
+    """
+    Version string of a scanner CLI, probed at most once per VERSION_TTL_SECONDS.
+
+    A failed probe is not remembered as the version: it is retried after
+    VERSION_RETRY_SECONDS, so a scanner installed (or fixed) later is picked up.
+
+    Args:
+        command: Version command, e.g. ["semgrep", "--version"] (None for
+            scanners without one)
+
+    Returns:
+        First line of the command output, UNKNOWN_VERSION if the probe failed,
+        or UNVERSIONED without a command
+    """
+    if not command:
+        return UNVERSIONED
+    key = " ".join(command)
+    now = time.monotonic()
+    cached = _scanner_versions.get(key)
+    if cached is not None:
+        version, probed_at = cached
+        ttl = VERSION_RETRY_SECONDS if version == UNKNOWN_VERSION else VERSION_TTL_SECONDS
+        if now - probed_at < ttl:
+            return version
+
+    from process_runner import run_command
+
+    version = UNKNOWN_VERSION
+    try:
+        result = await run_command(list(command), timeout=30)
+        output = (result["stdout"] or result["stderr"]).strip()
+        if result["returncode"] == 0 and output:
+            version = output.splitlines()[0][:200]
+    except OSError as e:
+        logger.debug(f"[ResultCache] Could not run {key}: {e}")
+    if version == UNKNOWN_VERSION:
+        logger.warning(f"[ResultCache] Could not determine version with {key}, retrying in {VERSION_RETRY_SECONDS}s")
+    _scanner_versions[key] = (version, now)
+    return version
+
+
+def cache_key(tool_name: str, identity: Dict[str, Any], version: str, arguments: Dict[str, Any]) -> str:
+    """
+    Cache key of a tool call.
+
+    Args:
+        tool_name: Name of the tool
+        identity: Content identity of the scanned input (e.g. commit SHA)
+        version: Scanner version
+        arguments: Normalized call arguments (volatile arguments removed)
+
+    Returns:
+        Hex digest identifying the call
+    """
+    material = json.dumps(
+        {"tool": tool_name, "identity": identity, "version": version, "arguments": arguments},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class ResultCache:
+    """SQLite-backed tool result cache with TTLs and LRU size eviction."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        tool_ttls: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize result cache.
+
+        Args:
+            cache_dir: Directory holding the cache database
+            ttl_seconds: Default time to live of an entry
+            max_bytes: Size budget; least recently used entries are evicted beyond it
+            tool_ttls: TTL overrides per tool name (0 disables caching for a tool)
+        """
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.tool_ttls = dict(tool_ttls or {})
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.cache_dir / "results.sqlite", check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, tool TEXT NOT NULL, result TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self._db.commit()
+        logger.info(f"[ResultCache] Using {self.cache_dir} (TTL {ttl_seconds:g}s, budget {max_bytes / 1024 ** 2:.0f} MiB)")
+
+    def ttl_for(self, tool_name: str) -> float:
+        """Time to live of entries of a tool (0 means not cached)."""
+        return float(self.tool_ttls.get(tool_name, self.ttl_seconds))
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result, created_at FROM results WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE results SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+        return {"result": json.loads(row[0]), "created_at": row[1]}
+
+    def _put(self, key: str, tool_name: str, result: Any, ttl: float):
+        payload = json.dumps(result, default=str)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, tool_name, payload, len(payload), now, now + ttl, now)
+            )
+            self._db.execute("DELETE FROM results WHERE expires_at <= ?", (now,))
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                evicted = 0
+                for old_key, size in self._db.execute(
+                    "SELECT key, size FROM results ORDER BY last_used"
+                ).fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    self._db.execute("DELETE FROM results WHERE key = ?", (old_key,))
+                    total -= size
+                    evicted += 1
+                logger.info(f"[ResultCache] Evicted {evicted} entries")
+            self._db.commit()
+
+    def _invalidate(self, tool_name: Optional[str]) -> int:
+        with self._lock:
+            if tool_name:
+                cursor = self._db.execute("DELETE FROM results WHERE tool = ?", (tool_name,))
+            else:
+                cursor = self._db.execute("DELETE FROM results")
+            self._db.commit()
+            return cursor.rowcount
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Cache key from cache_key()
+
+        Returns:
+            Dictionary with the result and its creation time, or None on a miss
+        """
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, tool_name: str, result: Any):
+        """
+        Store a result.
+
+        Args:
+            key: Cache key from cache_key()
+            tool_name: Name of the tool (for invalidation)
+            result: JSON-serializable tool result
+        """
+        ttl = self.ttl_for(tool_name)
+        if ttl > 0:
+            await asyncio.to_thread(self._put, key, tool_name, result, ttl)
+
+    async def invalidate(self, tool_name: Optional[str] = None) -> int:
+        """
+        Drop cached results.
+
+        Args:
+            tool_name: Only drop results of this tool (default: all)
+
+        Returns:
+            Number of removed entries
+        """
+        removed = await asyncio.to_thread(self._invalidate, tool_name)
+        logger.info(f"[ResultCache] Invalidated {removed} entries" + (f" of {tool_name}" if tool_name else ""))
+        return removed
@@ -0,0 +1,185 @@
+"""
+Streaming Ingestion of Saved Scanner Reports
+
+Reports saved with save_output (dependency-check, syft SBOMs, trivy JSON)
+can be hundreds of MB. Instead of loading a report into one Python object,
+the report file is memory-mapped and parsed incrementally: findings are
+yielded one at a time from the known finding arrays of each report format,
+normalized and appended to a FindingTable, so peak memory does not grow with
+the report size.
+
+Event-based parsing of JSON documents uses the optional ijson package.
+Without it, JSON documents are loaded whole (JSON lines are always streamed).
+"""
+
+import json
+import mmap
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from appsec_composite import FINDING_KEYS
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:
+    ijson = None
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+logger = setup_logger(__name__, log_file_path="logs/appsec_base.log")
+
+# Result keys under which tools report the path of a saved report
+REPORT_PATH_KEYS = ("output_file", "report_file", "output_path", "report_path", "json_file")
+
+REPORT_SUFFIXES = (".json", ".jsonl", ".ndjson", ".sarif")
+
+# ijson prefixes of finding arrays in scanner report formats
+REPORT_ITEM_PREFIXES = frozenset(
+    (
+        "item",                                      # gitleaks, top-level arrays
+        "Results.item.Vulnerabilities.item",         # trivy
+        "Results.item.Misconfigurations.item",
+        "Results.item.Secrets.item",
+        "dependencies.item.vulnerabilities.item",    # dependency-check
+        "artifacts.item",                            # syft
+        "components.item",                           # CycloneDX
+        "packages.item",                             # SPDX
+        "runs.item.results.item",                    # SARIF
+    )
+    + tuple(f"{key}.item" for key in FINDING_KEYS)
+    + tuple(f"{container}.{key}.item" for container in ("results", "data") for key in FINDING_KEYS)
+)
+
+
+def report_path(result: Dict[str, Any]) -> Optional[Path]:
+    """
+    Saved JSON report referenced by a tool result.
+
+    Args:
+        result: Tool result
+
+    Returns:
+        Path of an existing report file, or None
+    """
+    for key in REPORT_PATH_KEYS:
+        value = result.get(key)
+        if isinstance(value, str) and value.lower().endswith(REPORT_SUFFIXES) and os.path.isfile(value):
+            return Path(value)
+    return None
+
+
+@contextmanager
+def _mapped(path: Path):
+    """Memory-map a file read-only."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def _is_json_lines(mapped) -> bool:
+    """Whether a mapped report holds one JSON document per line."""
+    end = mapped.find(b"\n")
+    if end < 0:
+        return False
+    try:
+        json.loads(mapped[:end])
+    except ValueError:
+        return False
+    return bool(mapped[end:].strip()[:1])
+
+
+def iter_json_lines(lines: Iterator[bytes]) -> Iterator[Any]:
+    """
+    Parse JSON lines, skipping blank and malformed lines.
+
+    Args:
+        lines: Raw lines
+
+    Yields:
+        Parsed documents
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            logger.debug(f"[iter_json_lines] Skipping malformed line: {line[:200]!r}")
+
+
+def _iter_items(source) -> Iterator[Any]:
+    """Build the elements of every finding array in a single ijson pass."""
+    builder = None
+    depth = 0
+    for prefix, event, value in ijson.parse(source, use_float=True):
+        if builder is None:
+            if prefix not in REPORT_ITEM_PREFIXES:
+                continue
+            if event in ("start_map", "start_array"):
+                builder, depth = ObjectBuilder(), 0
+            elif event not in ("end_map", "end_array", "map_key"):
+                yield value
+                continue
+            else:
+                continue
+        builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+            if depth == 0:
+                yield builder.value
+                builder = None
+
+
+def _iter_document_items(node: Any, prefix: str = "") -> Iterator[Any]:
+    """Elements of every finding array in a loaded document (same prefixes as _iter_items)."""
+    if prefix in REPORT_ITEM_PREFIXES:
+        yield node
+    elif isinstance(node, dict):
+        for key, value in node.items():
+            yield from _iter_document_items(value, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _iter_document_items(value, f"{prefix}.item" if prefix else "item")
+
+
+def iter_report_findings(path: Path) -> Iterator[Any]:
+    """
+    Stream the findings of a saved scanner report.
+
+    Args:
+        path: JSON, JSON lines or SARIF report
+
+    Yields:
+        Raw findings, one at a time
+    """
+    with _mapped(path) as mapped:
+        if not mapped:
+            return
+        if _is_json_lines(mapped):
+            yield from iter_json_lines(iter(mapped.readline, b""))
+        elif ijson is not None:
+            yield from _iter_items(mapped)
+        else:
+            logger.debug(f"[iter_report_findings] ijson not installed, loading {path} whole")
+            yield from _iter_document_items(json.loads(mapped[:]))
@@ -27,16 +27,50 @@ except ImportError:
     else:
         raise ImportError(f"Could not find appsec_base_server.py at {base_server_path}")
 
+from typing import Any, Callable, Dict, Optional
+
+from appsec_images import resolve_image_digest, vulnerability_db_version
 from hd_logging import setup_logger
 logger = setup_logger(__name__, log_file_path="logs/appsec_container_mcp.log")
 
 
+class ContainerSecurityServer(AppSecBaseServer):
+    """Container server caching image scan results per image digest and vulnerability DB."""
+
+    async def _result_cache_identity(
+        self, tool_name: str, tool_func: Callable, kwargs: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Identify image scans by content digest and vulnerability DB version.
+
+        A moved tag resolves to a new digest and a DB update changes the DB
+        fingerprint (tools declare `__vuln_db_command__`), so both invalidate
+        cached results. Calls whose digest or DB cannot be determined are not
+        cached.
+        """
+        image_name = kwargs.get("image_name")
+        if image_name:
+            digest = await resolve_image_digest(image_name)
+            identity = {"image_digest": digest} if digest else None
+        else:
+            identity = await super()._result_cache_identity(tool_name, tool_func, kwargs)
+
+        db_command = getattr(tool_func, "__vuln_db_command__", None)
+        if identity is None or not db_command:
+            return identity
+        db_version = await vulnerability_db_version(db_command)
+        if db_version is None:
+            logger.debug(f"[{self.server_name}] {tool_name}: vulnerability DB unknown, not caching")
+            return None
+        return {**identity, "vuln_db": db_version}
+
+
 def main():
     """Run Container Security MCP server."""
     server_dir = Path(__file__).parent
     tools_dir = server_dir / "tools"
     logger.info("Starting Container Security MCP Server...")
-    server = AppSecBaseServer("appsec-container-mcp", tools_dir)
+    server = ContainerSecurityServer("appsec-container-mcp", tools_dir)
     server.run()
 
 
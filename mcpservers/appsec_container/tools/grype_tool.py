@@ -50,7 +50,7 @@ def grype_scan_container(
     try:
         logger.info(f"[grype_scan_container] Starting scan: {image_name}")
         scanner = GrypeScanner()
-        result = scanner.scan_container(image_name=image_name, output_format=output_format, save_output=save_output, output_dir=output_dir)
+        result = scanner.scan_container(image_name=image_name, output_format=output_format, save_output=save_output, output_dir=output_dir, timeout=timeout)
         logger.info(f"[grype_scan_container] Scan completed: success={result.get('success', False)}")
         return result
     except Exception as e:
@@ -58,6 +58,12 @@ def grype_scan_container(
         return {"success": False, "error": str(e), "tool": "grype"}
 
 
+# Cache results per image digest and vulnerability DB (see ContainerSecurityServer)
+grype_scan_container.__result_cache__ = True
+grype_scan_container.__cache_ignore_arguments__ = ("image_name",)
+grype_scan_container.__vuln_db_command__ = ["grype", "db", "status"]
+
+
 def grype_scan_repository(
     repo_url: str,
     output_format: str = "json",
@@ -72,10 +78,16 @@ def grype_scan_repository(
     try:
         logger.info(f"[grype_scan_repository] Starting scan: {repo_url}")
         scanner = GrypeScanner(github_token=github_token)
-        result = scanner.scan_repository(repo_url=repo_url, output_format=output_format, save_output=save_output, output_dir=output_dir)
+        result = scanner.scan_repository(repo_url=repo_url, output_format=output_format, save_output=save_output, output_dir=output_dir, timeout=timeout)
         logger.info(f"[grype_scan_repository] Scan completed: success={result.get('success', False)}")
         return result
     except Exception as e:
         logger.error(f"[grype_scan_repository] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e), "tool": "grype"}
 
+
+# Grype's directory scan only reads the working tree
+grype_scan_repository.__clone_mode__ = "shallow"
+
+# Vulnerability DB updates invalidate cached repository results too
+grype_scan_repository.__vuln_db_command__ = ["grype", "db", "status"]
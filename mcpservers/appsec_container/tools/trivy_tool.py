@@ -50,7 +50,7 @@ def trivy_scan_container(
     try:
         logger.info(f"[trivy_scan_container] Starting scan: {image_name}")
         scanner = TrivyScanner()
-        result = scanner.scan_container(image_name=image_name, output_format=output_format, save_output=save_output, output_dir=output_dir)
+        result = scanner.scan_container(image_name=image_name, output_format=output_format, save_output=save_output, output_dir=output_dir, timeout=timeout)
         logger.info(f"[trivy_scan_container] Scan completed: success={result.get('success', False)}")
         return result
     except Exception as e:
@@ -58,6 +58,12 @@ def trivy_scan_container(
         return {"success": False, "error": str(e), "tool": "trivy"}
 
 
+# Cache results per image digest and vulnerability DB (see ContainerSecurityServer)
+trivy_scan_container.__result_cache__ = True
+trivy_scan_container.__cache_ignore_arguments__ = ("image_name",)
+trivy_scan_container.__vuln_db_command__ = ["trivy", "version"]
+
+
 def trivy_scan_repository(
     repo_url: str,
     output_format: str = "json",
@@ -72,10 +78,16 @@ def trivy_scan_repository(
     try:
         logger.info(f"[trivy_scan_repository] Starting scan: {repo_url}")
         scanner = TrivyScanner(github_token=github_token)
-        result = scanner.scan_repository(repo_url=repo_url, output_format=output_format, save_output=save_output, output_dir=output_dir)
+        result = scanner.scan_repository(repo_url=repo_url, output_format=output_format, save_output=save_output, output_dir=output_dir, timeout=timeout)
         logger.info(f"[trivy_scan_repository] Scan completed: success={result.get('success', False)}")
         return result
     except Exception as e:
         logger.error(f"[trivy_scan_repository] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e), "tool": "trivy"}
 
+
+# Trivy's filesystem scan only reads the working tree
+trivy_scan_repository.__clone_mode__ = "shallow"
+
+# Vulnerability DB updates invalidate cached repository results too
+trivy_scan_repository.__vuln_db_command__ = ["trivy", "version"]
@@ -0,0 +1,196 @@
+"""
+AppSec Gateway MCP Server - All Application Security Categories in One Process
+
+Mounts the tools of every appsec category (sast, dast, sca, secrets, iac,
+k8s, container, mobile, supply_chain) and of the recon server into one
+FastMCP server, each under its category prefix (sast_semgrep_scan_repository,
+container_trivy_scan_container, recon_..., ...). Instead of one container per
+category, each loading the same base code, one process serves them all with:
+
+- one worker pool (and zygote) for the synchronous tools of every category
+- one admission controller: the gateway's caps bound the total, each
+  category's limits and priorities apply to its own tools
+- one clone cache, so scanners of different categories scanning the same
+  repository share one clone
+- one result cache, findings store and job table, served by the gateway's
+  result_cache_clear, get_findings, merge_findings and job_* tools
+- scan_repository_all running the repository scanners of all categories
+  over one checkout
+"""
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add base server to path
+base_path = Path(__file__).parent.parent / "appsec_base"
+if str(base_path) not in sys.path:
+    sys.path.insert(0, str(base_path))
+
+from appsec_base_server import AppSecBaseServer, _add_recon_path
+from hd_logging import setup_logger
+
+logger = setup_logger(__name__, log_file_path="logs/appsec_gateway_mcp.log")
+
+# Directory holding the appsec_<category> server directories
+SERVERS_DIR = Path(__file__).parent.parent
+
+CATEGORIES = ("sast", "dast", "sca", "secrets", "iac", "k8s", "container", "mobile", "supply_chain")
+
+RECON_PREFIX = "recon"
+
+
+def _category_server_class(category_dir: Path) -> type:
+    """
+    Server class of a category: the AppSecBaseServer subclass its module defines, if any.
+
+    Args:
+        category_dir: appsec_<category> directory
+
+    Returns:
+        Server class (e.g. ContainerSecurityServer), or AppSecBaseServer
+    """
+    module_name = f"{category_dir.name}_mcp"
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, category_dir / f"{module_name}.py")
+        if spec is None or spec.loader is None:
+            return AppSecBaseServer
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except Exception:
+            sys.modules.pop(module_name, None)
+            raise
+
+    for value in vars(module).values():
+        if (
+            isinstance(value, type)
+            and issubclass(value, AppSecBaseServer)
+            and value.__module__ == module_name
+        ):
+            return value
+    return AppSecBaseServer
+
+
+class AppSecGateway(AppSecBaseServer):
+    """One MCP server mounting every appsec category, and recon, under per-category prefixes."""
+
+    def __init__(
+        self,
+        server_name: str = "appsec-gateway-mcp",
+        categories: Optional[List[str]] = None,
+        include_recon: Optional[bool] = None,
+        max_workers: Optional[int] = None,
+        executor_type: Optional[str] = None
+    ):
+        """
+        Initialize gateway.
+
+        The gateway has no plugins of its own. Its [tool.appsec] settings
+        configure the shared worker pool, admission caps and caches; each
+        category keeps its own per-tool settings.
+
+        Args:
+            server_name: Name of the MCP server
+            categories: Categories to mount (default: APPSEC_GATEWAY_CATEGORIES,
+                `categories` under [tool.appsec.gateway], or all)
+            include_recon: Whether to mount the recon tools (default:
+                APPSEC_GATEWAY_RECON or `recon` under [tool.appsec.gateway], on)
+            max_workers: Maximum concurrent synchronous tool runs across all categories
+            executor_type: Executor for synchronous tools, "thread", "process" or "zygote"
+        """
+        super().__init__(server_name, Path(__file__).parent / "tools", max_workers, executor_type)
+
+        config = self.settings.get("gateway", {})
+        env_categories = os.environ.get("APPSEC_GATEWAY_CATEGORIES")
+        if categories is None and env_categories:
+            categories = [name.strip() for name in env_categories.split(",") if name.strip()]
+        categories = list(categories or config.get("categories", CATEGORIES))
+        unknown = [name for name in categories if name not in CATEGORIES]
+        if unknown:
+            raise ValueError(f"Unknown categories {', '.join(unknown)}, expected some of {', '.join(CATEGORIES)}")
+        self.categories = categories
+
+        if include_recon is None:
+            recon = os.environ.get("APPSEC_GATEWAY_RECON", str(config.get("recon", True)))
+            include_recon = recon.lower() not in ("0", "false", "no")
+        self.include_recon = include_recon
+
+        # Mounted category servers by prefix
+        self.servers: Dict[str, AppSecBaseServer] = {}
+
+    def register_tools(self):
+        """Register the tools of every category under its prefix, then the shared tools."""
+        _add_recon_path()
+        from recon_mcpserver import create_executor
+        from zygote import ZygoteExecutor
+
+        # Created before the categories, which all run their sync tools on it
+        if self.executor is None:
+            self.executor = create_executor(self.executor_type, self.max_workers)
+        if self.admission.max_concurrent is None:
+            self.admission.max_concurrent = getattr(self.executor, "_max_workers", None)
+
+        plugin_modules = []
+        for category in self.categories:
+            category_dir = SERVERS_DIR / f"appsec_{category}"
+            try:
+                server_class = _category_server_class(category_dir)
+            except Exception as e:
+                logger.error(f"[{self.server_name}] Failed to load category {category}: {e}", exc_info=True)
+                continue
+            server = server_class(
+                f"appsec-{category.replace('_', '-')}-mcp", category_dir / "tools", parent=self
+            )
+            server.register_tools()
+            if server.plugin_loader is None:
+                logger.error(f"[{self.server_name}] Category {category} has no tools, not mounted")
+                continue
+
+            self.mcp.mount(server.mcp, prefix=category, as_proxy=False)
+            self.servers[category] = server
+            plugin_modules.extend(server.plugin_loader.plugin_modules())
+            # scan_repository_all looks clone modes up by the mounted tool name
+            self.clone_modes.update({f"{category}_{name}": mode for name, mode in server.clone_modes.items()})
+            logger.info(f"[{self.server_name}] Mounted {server.server_name} as {category}_*")
+
+        if self.include_recon:
+            import recon_mcpserver
+            # Recon calls count against the same caps as the appsec scanners
+            loader = recon_mcpserver.register_plugin_tools(self.executor, self._with_admission)
+            self.mcp.mount(recon_mcpserver.mcp, prefix=RECON_PREFIX, as_proxy=False)
+            plugin_modules.extend(loader.plugin_modules())
+            logger.info(f"[{self.server_name}] Mounted recon tools as {RECON_PREFIX}_*")
+
+        # One zygote pre-imports the plugins of every category
+        if isinstance(self.executor, ZygoteExecutor):
+            self.executor.start(plugin_modules)
+
+        self._refresh_composite_tool()
+        self._register_support_tools()
+        logger.info(f"[{self.server_name}] Mounted {len(self.servers)} categories: {', '.join(self.servers)}")
+
+    def _refresh_composite_tool(self) -> bool:
+        """Register scan_repository_all over the repository scanners of all categories."""
+        # Named as mounted (sast_semgrep_scan_repository), so scanners are e.g. "sast_semgrep"
+        self.repository_tools = {
+            f"{category}_{name}": tools
+            for category, server in self.servers.items()
+            for name, tools in server.repository_tools.items()
+        }
+        return super()._refresh_composite_tool()
+
+
+def main():
+    """Run the AppSec gateway MCP server."""
+    logger.info("Starting AppSec Gateway MCP Server...")
+    server = AppSecGateway()
+    server.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -57,3 +57,21 @@ def checkov_scan_repository(
         logger.error(f"[checkov_scan_repository] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e), "tool": "checkov"}
 
+
+# Checkov only needs IaC files, so fetch a sparse checkout of them
+checkov_scan_repository.__sparse_paths__ = [
+    "*.tf",
+    "*.tf.json",
+    "*.tfvars",
+    "*.hcl",
+    "*.yaml",
+    "*.yml",
+    "*.json",
+    "*.bicep",
+    "*.template",
+    "Dockerfile*",
+    "*.dockerfile",
+]
+
+# Diff scans (base_ref) only need the changed files
+checkov_scan_repository.__diff_scope__ = "files"
@@ -57,3 +57,23 @@ def terrascan_scan_repository(
         logger.error(f"[terrascan_scan_repository] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e), "tool": "terrascan"}
 
+
+# Terrascan only needs IaC files, so fetch a sparse checkout of them
+terrascan_scan_repository.__sparse_paths__ = [
+    "*.tf",
+    "*.tf.json",
+    "*.tfvars",
+    "*.hcl",
+    "*.yaml",
+    "*.yml",
+    "*.json",
+    "*.tpl",
+    "Dockerfile*",
+    "*.dockerfile",
+]
+
+# Diff scans (base_ref) only need the changed files
+terrascan_scan_repository.__diff_scope__ = "files"
+
+# Scanner version for the result cache key
+terrascan_scan_repository.__version_command__ = ["terrascan", "version"]
@@ -57,3 +57,9 @@ def kube_bench_scan_repository(
         logger.error(f"[kube_bench_scan_repository] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e), "tool": "kube_bench"}
 
+
+# Kube-Bench only reads the working tree
+kube_bench_scan_repository.__clone_mode__ = "shallow"
+
+# Scanner version for the result cache key
+kube_bench_scan_repository.__version_command__ = ["kube-bench", "version"]
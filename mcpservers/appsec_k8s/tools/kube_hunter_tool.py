@@ -57,3 +57,12 @@ def kube_hunter_scan_repository(
         logger.error(f"[kube_hunter_scan_repository] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e), "tool": "kube_hunter"}
 
+
+# Kube-Hunter only reads the working tree
+kube_hunter_scan_repository.__clone_mode__ = "shallow"
+
+# Scanner version for the result cache key; kube-hunter has no version flag,
+# so read the version of the installed package
+kube_hunter_scan_repository.__version_command__ = [
+    "python3", "-c", "from importlib.metadata import version; print(version('kube-hunter'))"
+]
@@ -57,3 +57,18 @@ def kubescape_scan_repository(
         logger.error(f"[kubescape_scan_repository] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e), "tool": "kubescape"}
 
+
+# Kubescape only needs manifests and Helm charts, so fetch a sparse checkout of them
+kubescape_scan_repository.__sparse_paths__ = [
+    "*.yaml",
+    "*.yml",
+    "*.json",
+    "*.tpl",
+    "kustomization*",
+]
+
+# Diff scans (base_ref) only need the changed files
+kubescape_scan_repository.__diff_scope__ = "files"
+
+# Scanner version for the result cache key
+kubescape_scan_repository.__version_command__ = ["kubescape", "version"]
@@ -57,3 +57,9 @@ def mobsf_scan_repository(
         logger.error(f"[mobsf_scan_repository] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e), "tool": "mobsf"}
 
+
+# MobSF only reads the working tree
+mobsf_scan_repository.__clone_mode__ = "shallow"
+
+# MobSF runs as a service without a version CLI, so results are cached unversioned
+mobsf_scan_repository.__version_command__ = None
@@ -98,3 +98,12 @@ def bearer_scan_repository(
             "tool": "bearer"
         }
 
+
+# Bearer only reads the working tree
+bearer_scan_repository.__clone_mode__ = "shallow"
+
+# Diff scans (base_ref) only need the changed files
+bearer_scan_repository.__diff_scope__ = "files"
+
+# Scanner version for the result cache key
+bearer_scan_repository.__version_command__ = ["bearer", "version"]
@@ -95,3 +95,12 @@ def horusec_scan_repository(
             "tool": "horusec"
         }
 
+
+# Horusec only reads the working tree
+horusec_scan_repository.__clone_mode__ = "shallow"
+
+# Diff scans (base_ref) only need the changed files
+horusec_scan_repository.__diff_scope__ = "files"
+
+# Scanner version for the result cache key
+horusec_scan_repository.__version_command__ = ["horusec", "version"]
@@ -112,3 +112,9 @@ def semgrep_scan_repository(
             "tool": "semgrep"
         }
 
+
+# Semgrep only reads the working tree
+semgrep_scan_repository.__clone_mode__ = "shallow"
+
+# Diff scans (base_ref) only need the changed files
+semgrep_scan_repository.__diff_scope__ = "files"
@@ -95,3 +95,5 @@ def sonarqube_scan_repository(
             "tool": "sonarqube"
         }
 
+# Scanner version for the result cache key
+sonarqube_scan_repository.__version_command__ = ["sonar-scanner", "--version"]
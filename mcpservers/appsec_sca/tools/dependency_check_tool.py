@@ -57,3 +57,9 @@ def dependency_check_scan_repository(
         logger.error(f"[dependency_check_scan_repository] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e), "tool": "dependency_check"}
 
+
+# Dependency-Check only reads the working tree
+dependency_check_scan_repository.__clone_mode__ = "shallow"
+
+# Scanner version for the result cache key
+dependency_check_scan_repository.__version_command__ = ["dependency-check.sh", "--version"]
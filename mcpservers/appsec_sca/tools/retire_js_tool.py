@@ -57,3 +57,18 @@ def retire_js_scan_repository(
         logger.error(f"[retire_js_scan_repository] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e), "tool": "retire_js"}
 
+
+# Retire.js only needs JavaScript files and manifests, so fetch a sparse checkout of them
+retire_js_scan_repository.__sparse_paths__ = [
+    "*.js",
+    "*.mjs",
+    "*.cjs",
+    "package.json",
+    "package-lock.json",
+    "npm-shrinkwrap.json",
+    "yarn.lock",
+    "bower.json",
+]
+
+# Scanner version for the result cache key
+retire_js_scan_repository.__version_command__ = ["retire", "--version"]
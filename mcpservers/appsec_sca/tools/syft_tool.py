@@ -57,3 +57,9 @@ def syft_scan_repository(
         logger.error(f"[syft_scan_repository] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e), "tool": "syft"}
 
+
+# Syft only reads the working tree
+syft_scan_repository.__clone_mode__ = "shallow"
+
+# Scanner version for the result cache key
+syft_scan_repository.__version_command__ = ["syft", "version"]
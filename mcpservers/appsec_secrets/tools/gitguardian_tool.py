@@ -58,3 +58,12 @@ def gitguardian_scan_repository(
         logger.error(f"[gitguardian_scan_repository] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e), "tool": "gitguardian"}
 
+
+# Path scans only read the working tree, other scan modes walk the history
+gitguardian_scan_repository.__clone_mode__ = lambda kwargs: "shallow" if kwargs.get("scan_mode", "path") == "path" else "full"
+
+# Diff scans (base_ref) only need the changed files
+gitguardian_scan_repository.__diff_scope__ = "files"
+
+# Scanner version for the result cache key
+gitguardian_scan_repository.__version_command__ = ["ggshield", "--version"]
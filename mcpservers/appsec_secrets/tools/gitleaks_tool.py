@@ -59,3 +59,12 @@ def gitleaks_scan_repository(
         logger.error(f"[gitleaks_scan_repository] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e), "tool": "gitleaks"}
 
+
+# Only history scans need the full clone, working-tree scans use a shallow one
+gitleaks_scan_repository.__clone_mode__ = lambda kwargs: "full" if kwargs.get("scan_git_history") else "shallow"
+
+# Diff scans (base_ref) only need the changed files
+gitleaks_scan_repository.__diff_scope__ = "files"
+
+# Scanner version for the result cache key
+gitleaks_scan_repository.__version_command__ = ["gitleaks", "version"]
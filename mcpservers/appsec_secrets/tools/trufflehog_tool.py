@@ -5,7 +5,7 @@ TruffleHog Secret Scanner MCP Tool Wrapper
 import sys
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 def _get_appsec_tools_path():
     env_path = os.environ.get("APPSEC_TOOLS_PATH")
@@ -60,3 +60,23 @@ def trufflehog_scan_repository(
         logger.error(f"[trufflehog_scan_repository] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e), "tool": "trufflehog"}
 
+
+# Diff scans (base_ref) pass the base commit to TruffleHog's own commit range support
+trufflehog_scan_repository.__diff_since_argument__ = "scan_since_commit"
+
+
+def _stream_command(arguments: Dict[str, Any]) -> List[str]:
+    """TruffleHog command printing one JSON finding per line (streaming mode)."""
+    repo_url = arguments["repo_url"]
+    if os.path.isdir(repo_url):
+        repo_url = f"file://{os.path.abspath(repo_url)}"
+    command = ["trufflehog", "git", repo_url, "--json", "--no-update"]
+    if not arguments.get("verify_secrets", True):
+        command.append("--no-verification")
+    if arguments.get("scan_since_commit"):
+        command += ["--since-commit", arguments["scan_since_commit"]]
+    return command
+
+
+# stream=true runs TruffleHog directly and pushes secrets as they are found
+trufflehog_scan_repository.__stream_command__ = _stream_command
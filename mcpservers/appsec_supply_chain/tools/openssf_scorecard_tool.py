@@ -57,3 +57,9 @@ def openssf_scorecard_scan_repository(
         logger.error(f"[openssf_scorecard_scan_repository] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e), "tool": "openssf_scorecard"}
 
+
+# Scorecard queries the GitHub API for the repository, so it needs the original URL
+openssf_scorecard_scan_repository.__clone_cache__ = False
+
+# Scanner version for the result cache key
+openssf_scorecard_scan_repository.__version_command__ = ["scorecard", "version"]
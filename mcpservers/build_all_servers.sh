@@ -27,6 +27,7 @@ SERVERS=(
     "appsec_k8s"
     "appsec_supply_chain"
     "appsec_mobile"
+    "appsec_gateway"
 )
 
 for server in "${SERVERS[@]}"; do
@@ -0,0 +1,117 @@
+"""
+Call Deadlines for MCP Tools
+
+A Deadline is created once at the MCP boundary when a tool call arrives and
+is propagated to everything the call does: time spent waiting for a worker
+slot counts against it, scanner `timeout` arguments are clamped to what is
+left, and the call is cancelled (tearing down its process group when running
+in process mode) once it expires.
+
+The active deadline is stored in a context variable so async helpers such as
+process_runner.run_command pick it up without extra arguments.
+
+Cancelling a call does not stop work already running in a worker thread, and
+a process group takes a moment to die. Executor futures of a call are
+therefore recorded in current_workers, so whoever admitted the call can keep
+its slot until they have actually finished.
+"""
+
+import asyncio
+import contextvars
+import math
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, List, Optional
+
+# Extra seconds a call may run past its deadline so scanners that honor their
+# own (clamped) timeout can return partial results before being cancelled
+DEADLINE_GRACE_SECONDS = 10.0
+
+current_deadline: contextvars.ContextVar[Optional["Deadline"]] = contextvars.ContextVar(
+    "current_deadline", default=None
+)
+
+current_workers: contextvars.ContextVar[Optional[List[Future]]] = contextvars.ContextVar(
+    "current_workers", default=None
+)
+
+
+def track_worker(future: Future) -> Future:
+    """
+    Record executor work of the current call in current_workers, if tracked.
+
+    Args:
+        future: Future returned by Executor.submit
+
+    Returns:
+        The same future
+    """
+    workers = current_workers.get()
+    if workers is not None:
+        workers.append(future)
+    return future
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a call runs past its deadline."""
+
+    def __init__(self, deadline: "Deadline"):
+        super().__init__(f"Deadline of {deadline.seconds:g}s exceeded")
+        self.deadline = deadline
+
+
+class Deadline:
+    """Absolute point in time by which a tool call must finish."""
+
+    def __init__(self, seconds: float):
+        """
+        Initialize deadline.
+
+        Args:
+            seconds: Time budget for the call, starting now
+        """
+        self.seconds = float(seconds)
+        self.expires_at = time.monotonic() + self.seconds
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed."""
+        return self.remaining() <= 0
+
+    def clamp(self, timeout: Optional[float]) -> int:
+        """
+        Limit a scanner timeout to the time left.
+
+        Args:
+            timeout: Timeout requested by the caller (None for no own limit)
+
+        Returns:
+            Whole seconds the scanner may run (at least 1)
+        """
+        remaining = self.remaining()
+        if timeout is not None:
+            remaining = min(float(timeout), remaining)
+        return max(1, int(math.ceil(remaining)))
+
+    async def wait(self, awaitable: Awaitable[Any], grace: float = DEADLINE_GRACE_SECONDS) -> Any:
+        """
+        Await a call, cancelling it if it outlives the deadline.
+
+        Args:
+            awaitable: Call to await
+            grace: Extra seconds allowed past the deadline
+
+        Returns:
+            Result of the awaitable
+
+        Raises:
+            DeadlineExceeded: If the deadline (plus grace) passed first
+        """
+        try:
+            return await asyncio.wait_for(awaitable, timeout=self.remaining() + grace)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(self) from None
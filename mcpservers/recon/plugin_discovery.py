@@ -0,0 +1,245 @@
+"""
+Lazy Plugin Discovery from Source
+
+Importing a tool plugin runs its module body: filesystem probes for the
+scanner packages and imports of the scanner libraries. To register tools
+without paying for that at startup, plugins are described by parsing their
+source with ast: the public top-level functions give the tool names,
+signatures and docstrings, and `tool.__attr__ = value` statements give the
+tool declarations. The module itself is imported on the first invocation of
+one of its tools.
+
+Plugins that cannot be described statically (decorated or reassigned tool
+functions, non-literal defaults, annotations outside typing) raise
+PluginDescriptionError and are imported eagerly instead.
+"""
+
+import ast
+import builtins
+import inspect
+import pathlib
+import typing
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Names annotations may use without importing the plugin
+ANNOTATION_NAMESPACE: Dict[str, Any] = {
+    **vars(builtins),
+    **{name: getattr(typing, name) for name in typing.__all__},
+    "typing": typing,
+    "Path": pathlib.Path,
+}
+
+_KINDS = {
+    "posonlyargs": "POSITIONAL_ONLY",
+    "args": "POSITIONAL_OR_KEYWORD",
+    "vararg": "VAR_POSITIONAL",
+    "kwonlyargs": "KEYWORD_ONLY",
+    "kwarg": "VAR_KEYWORD",
+}
+
+
+class PluginDescriptionError(Exception):
+    """Raised when a plugin cannot be described without importing it."""
+
+
+class ToolSpec:
+    """Registration data of one tool function, read from its plugin's source."""
+
+    def __init__(
+        self,
+        name: str,
+        doc: Optional[str],
+        is_async: bool,
+        parameters: List[Dict[str, Any]],
+        returns: Optional[str] = None,
+        declarations: Optional[Dict[str, str]] = None,
+        lazy_declarations: Optional[List[str]] = None
+    ):
+        """
+        Initialize tool spec.
+
+        Args:
+            name: Function name
+            doc: Docstring as written
+            is_async: Whether the function is a coroutine function
+            parameters: Parameters with name, kind (inspect.Parameter kind name)
+                and the source of their annotation and default (None if absent)
+            returns: Source of the return annotation
+            declarations: Literal tool declarations (`__clone_mode__`, ...) by
+                attribute, as source
+            lazy_declarations: Declarations that are functions of the plugin
+                and are resolved on first use
+        """
+        self.name = name
+        self.doc = doc
+        self.is_async = is_async
+        self.parameters = parameters
+        self.returns = returns
+        self.declarations = declarations or {}
+        self.lazy_declarations = lazy_declarations or []
+
+    def signature(self) -> inspect.Signature:
+        """
+        Signature of the tool function.
+
+        Raises:
+            PluginDescriptionError: If an annotation cannot be evaluated without the plugin
+        """
+        parameters = []
+        for parameter in self.parameters:
+            default = parameter["default"]
+            parameters.append(inspect.Parameter(
+                parameter["name"],
+                getattr(inspect.Parameter, parameter["kind"]),
+                default=ast.literal_eval(default) if default is not None else inspect.Parameter.empty,
+                annotation=_evaluate(parameter["annotation"])
+            ))
+        return inspect.Signature(parameters, return_annotation=_evaluate(self.returns))
+
+    def declaration_values(self) -> Dict[str, Any]:
+        """Values of the literal declarations."""
+        return {name: ast.literal_eval(source) for name, source in self.declarations.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the spec (JSON-compatible)."""
+        return {
+            "name": self.name,
+            "doc": self.doc,
+            "is_async": self.is_async,
+            "parameters": self.parameters,
+            "returns": self.returns,
+            "declarations": self.declarations,
+            "lazy_declarations": self.lazy_declarations,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ToolSpec":
+        """Restore a spec serialized with to_dict."""
+        return cls(**data)
+
+
+def _evaluate(source: Optional[str]) -> Any:
+    """Evaluate annotation source in ANNOTATION_NAMESPACE."""
+    if source is None:
+        return inspect.Parameter.empty
+    try:
+        return eval(source, dict(ANNOTATION_NAMESPACE))
+    except Exception as e:
+        raise PluginDescriptionError(f"Cannot evaluate annotation {source!r}: {e}") from e
+
+
+def _literal_source(node: ast.expr, what: str) -> str:
+    """Source of a literal expression."""
+    try:
+        ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError) as e:
+        raise PluginDescriptionError(f"{what} is not a literal: {ast.unparse(node)}") from e
+    return ast.unparse(node)
+
+
+def _describe_function(node: ast.FunctionDef) -> ToolSpec:
+    """Build the spec of a top-level function definition."""
+    if node.decorator_list:
+        raise PluginDescriptionError(f"{node.name} is decorated")
+    arguments = node.args
+    positional = arguments.posonlyargs + arguments.args
+    # Defaults belong to the last positional parameters
+    defaults = [None] * (len(positional) - len(arguments.defaults)) + list(arguments.defaults)
+    listed = [
+        (argument, "posonlyargs" if index < len(arguments.posonlyargs) else "args", default)
+        for index, (argument, default) in enumerate(zip(positional, defaults))
+    ]
+    if arguments.vararg:
+        listed.append((arguments.vararg, "vararg", None))
+    listed.extend(
+        (argument, "kwonlyargs", default) for argument, default in zip(arguments.kwonlyargs, arguments.kw_defaults)
+    )
+    if arguments.kwarg:
+        listed.append((arguments.kwarg, "kwarg", None))
+
+    parameters = []
+    for argument, field, default in listed:
+        parameters.append({
+            "name": argument.arg,
+            "kind": _KINDS[field],
+            "annotation": ast.unparse(argument.annotation) if argument.annotation else None,
+            "default": _literal_source(default, f"Default of {node.name}({argument.arg})") if default else None,
+        })
+    spec = ToolSpec(
+        name=node.name,
+        doc=ast.get_docstring(node, clean=False),
+        is_async=isinstance(node, ast.AsyncFunctionDef),
+        parameters=parameters,
+        returns=ast.unparse(node.returns) if node.returns else None
+    )
+    # Fail now rather than at registration
+    spec.signature()
+    return spec
+
+
+def describe_source(source: str, filename: str = "<plugin>") -> List[ToolSpec]:
+    """
+    Describe the tools of a plugin without importing it.
+
+    Args:
+        source: Plugin source code
+        filename: File name for syntax errors
+
+    Returns:
+        Specs of the public top-level functions, in definition order
+
+    Raises:
+        PluginDescriptionError: If the plugin must be imported to be described
+        SyntaxError: If the source does not parse
+    """
+    tree = ast.parse(source, filename=filename)
+    functions = {
+        node.name: node for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    }
+    specs = {
+        name: _describe_function(node) for name, node in functions.items() if not name.startswith("_")
+    }
+
+    for node in tree.body:
+        if isinstance(node, (ast.AnnAssign, ast.AugAssign)):
+            targets = [node.target]
+        elif isinstance(node, ast.Assign):
+            targets = node.targets
+        else:
+            continue
+        for target in targets:
+            if isinstance(target, ast.Name) and target.id in functions:
+                raise PluginDescriptionError(f"{target.id} is reassigned")
+            if not (
+                isinstance(target, ast.Attribute)
+                and isinstance(target.value, ast.Name)
+                and target.value.id in specs
+            ):
+                continue
+            spec = specs[target.value.id]
+            value = node.value
+            if isinstance(value, ast.Lambda) or (isinstance(value, ast.Name) and value.id in functions):
+                spec.lazy_declarations.append(target.attr)
+            elif value is not None:
+                spec.declarations[target.attr] = _literal_source(value, f"{target.value.id}.{target.attr}")
+
+    return list(specs.values())
+
+
+def describe_plugin(plugin_path: Path) -> List[ToolSpec]:
+    """
+    Describe the tools of a plugin file without importing it.
+
+    Args:
+        plugin_path: Path to the plugin Python file
+
+    Returns:
+        Specs of the plugin's tool functions
+
+    Raises:
+        PluginDescriptionError: If the plugin must be imported to be described
+        SyntaxError: If the source does not parse
+    """
+    return describe_source(Path(plugin_path).read_text(encoding="utf-8"), str(plugin_path))
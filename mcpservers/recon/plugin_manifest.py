@@ -0,0 +1,228 @@
+"""
+On-Disk Plugin Manifest
+
+A stdio server is spawned per agent session, so startup cost is paid over
+and over for the same unchanged plugins. The manifest caches, per tools
+directory:
+
+- the tool specs of every plugin file (see plugin_discovery), validated by
+  the file's mtime and size and, when those changed, its content hash
+- the MCP schema of every registered tool, keyed by a digest of the tool's
+  name, signature and docstring, so registration skips schema generation
+
+The manifest is one JSON file, rewritten atomically when it changed and
+discarded when the Python, FastMCP or pydantic version differs.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import fastmcp
+import pydantic
+from fastmcp.tools.tool import FunctionTool
+
+from plugin_discovery import PluginDescriptionError, ToolSpec, describe_source
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+logger = setup_logger(__name__, log_file_path="logs/recon_mcpserver.log")
+
+MANIFEST_FORMAT = 1
+
+
+def _environment() -> Dict[str, Any]:
+    """Versions the cached specs and schemas depend on."""
+    return {
+        "format": MANIFEST_FORMAT,
+        "python": list(sys.version_info[:2]),
+        "fastmcp": fastmcp.__version__,
+        "pydantic": pydantic.VERSION,
+    }
+
+
+class PluginManifest:
+    """Cached plugin specs and tool schemas of one tools directory."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize manifest, loading it from disk if present.
+
+        Args:
+            path: Manifest file
+        """
+        self.path = Path(path)
+        self.plugins: Dict[str, Dict[str, Any]] = {}
+        self.schemas: Dict[str, Dict[str, Any]] = {}
+        self._seen_plugins: set = set()
+        self._used_schemas: set = set()
+        self._dirty = False
+        self._load()
+
+    @classmethod
+    def for_tools_dir(cls, tools_dir: Path, cache_dir: Optional[str] = None) -> Optional["PluginManifest"]:
+        """
+        Manifest of a tools directory, from MCP_PLUGIN_MANIFEST* env vars.
+
+        Args:
+            tools_dir: Plugin directory
+            cache_dir: Directory of manifest files (default: MCP_PLUGIN_MANIFEST_DIR
+                or $TMPDIR/mcp_plugin_manifests)
+
+        Returns:
+            PluginManifest, or None if disabled with MCP_PLUGIN_MANIFEST=0
+        """
+        if os.environ.get("MCP_PLUGIN_MANIFEST", "1").lower() in ("0", "false", "no"):
+            return None
+        cache_dir = cache_dir or os.environ.get("MCP_PLUGIN_MANIFEST_DIR") or os.path.join(
+            tempfile.gettempdir(), "mcp_plugin_manifests"
+        )
+        key = hashlib.sha1(str(Path(tools_dir).resolve()).encode()).hexdigest()[:16]
+        return cls(Path(cache_dir) / f"{key}.json")
+
+    def _load(self):
+        """Read the manifest file, ignoring missing, corrupt or outdated ones."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"[PluginManifest] Ignoring unreadable manifest {self.path}: {e}")
+            return
+        if data.get("environment") != _environment():
+            logger.info(f"[PluginManifest] Discarding manifest {self.path} written by other versions")
+            return
+        self.plugins = data.get("plugins", {})
+        self.schemas = data.get("schemas", {})
+
+    def describe(self, plugin_path: Path) -> List[ToolSpec]:
+        """
+        Tool specs of a plugin, from the manifest while the file is unchanged.
+
+        Same contract as plugin_discovery.describe_plugin.
+
+        Args:
+            plugin_path: Path to the plugin Python file
+
+        Returns:
+            Specs of the plugin's tool functions
+
+        Raises:
+            PluginDescriptionError: If the plugin must be imported to be described
+            SyntaxError: If the source does not parse
+        """
+        key = plugin_path.name
+        self._seen_plugins.add(key)
+        stat = plugin_path.stat()
+        entry = self.plugins.get(key)
+        if entry is None or (entry["mtime_ns"], entry["size"]) != (stat.st_mtime_ns, stat.st_size):
+            content = plugin_path.read_bytes()
+            digest = hashlib.sha256(content).hexdigest()
+            if entry is None or entry["sha256"] != digest:
+                entry = {"sha256": digest}
+                try:
+                    entry["specs"] = [spec.to_dict() for spec in describe_source(content.decode("utf-8"), str(plugin_path))]
+                except PluginDescriptionError as e:
+                    entry["error"] = str(e)
+                logger.debug(f"[PluginManifest] Described {key}")
+            # Touched but unchanged files only need their stat refreshed
+            entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            self.plugins[key] = entry
+            self._dirty = True
+        if "error" in entry:
+            raise PluginDescriptionError(entry["error"])
+        return [ToolSpec.from_dict(spec) for spec in entry["specs"]]
+
+    @staticmethod
+    def schema_key(func: Callable) -> str:
+        """Digest of what a tool's MCP schema is generated from."""
+        identity = json.dumps([func.__name__, str(inspect.signature(func)), func.__doc__])
+        return hashlib.sha256(identity.encode()).hexdigest()
+
+    def tool_schema(self, func: Callable) -> Optional[Dict[str, Any]]:
+        """Cached description, parameters and output schema of a tool, if any."""
+        key = self.schema_key(func)
+        self._used_schemas.add(key)
+        return self.schemas.get(key)
+
+    def put_tool_schema(self, func: Callable, tool: FunctionTool):
+        """Cache the schema FastMCP generated for a tool."""
+        key = self.schema_key(func)
+        self._used_schemas.add(key)
+        self.schemas[key] = {
+            "description": tool.description,
+            "parameters": tool.parameters,
+            "output_schema": tool.output_schema,
+        }
+        self._dirty = True
+
+    def save(self):
+        """Write the manifest if it changed, dropping entries of removed plugins and tools."""
+        stale_plugins = set(self.plugins) - self._seen_plugins
+        stale_schemas = set(self.schemas) - self._used_schemas
+        if not (self._dirty or stale_plugins or stale_schemas):
+            return
+        for key in stale_plugins:
+            del self.plugins[key]
+        for key in stale_schemas:
+            del self.schemas[key]
+        data = {"environment": _environment(), "plugins": self.plugins, "schemas": self.schemas}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Servers starting at the same time each write a complete file
+            fd, tmp_path = tempfile.mkstemp(prefix=".manifest_", dir=self.path.parent)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            logger.info(f"[PluginManifest] Saved {len(self.plugins)} plugin(s), {len(self.schemas)} tool schema(s) to {self.path}")
+        except OSError as e:
+            logger.warning(f"[PluginManifest] Could not save manifest {self.path}: {e}")
+
+
+def register_tool(mcp: fastmcp.FastMCP, func: Callable, manifest: Optional[PluginManifest] = None) -> FunctionTool:
+    """
+    Register a function as an MCP tool, reusing its schema from the manifest.
+
+    Args:
+        mcp: Server to register with
+        func: Tool wrapper (its __name__ is the tool name)
+        manifest: Manifest caching tool schemas (None to always generate them)
+
+    Returns:
+        The registered tool
+    """
+    if manifest is None:
+        return mcp.tool()(func)
+    cached = manifest.tool_schema(func)
+    if cached is None:
+        tool = FunctionTool.from_function(func, serializer=getattr(mcp, "_tool_serializer", None))
+        manifest.put_tool_schema(func, tool)
+    else:
+        tool = FunctionTool(
+            fn=func,
+            name=func.__name__,
+            description=cached["description"],
+            parameters=cached["parameters"],
+            output_schema=cached["output_schema"],
+            serializer=getattr(mcp, "_tool_serializer", None),
+        )
+    return mcp.add_tool(tool)
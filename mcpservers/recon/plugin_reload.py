@@ -0,0 +1,127 @@
+"""
+Hot Reload of Tool Plugins
+
+Adding or fixing a plugin used to require restarting the server, which
+killed the scans in flight. PluginReloader polls the tools directory of a
+PluginLoader and hands the tools of added and changed plugins, and the
+names of removed tools, to the server, which re-registers them. Calls that
+are already running keep the function objects (and module) they started
+with, so they finish on the old code while new calls get the new version.
+
+The reloader is installed as FastMCP middleware: the first request starts
+the polling task on the server's event loop and every request records its
+session, so clients are sent notifications/tools/list_changed after a reload.
+
+Hot reload is a development aid. Production servers should run the code they
+were deployed with, so polling is off unless a reload interval is configured.
+"""
+
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+logger = setup_logger(__name__, log_file_path="logs/recon_mcpserver.log")
+
+# Seconds between checks of the tools directory; 0 (the default) disables hot reload
+DEFAULT_RELOAD_INTERVAL = 0.0
+
+# Receives (tools of added and changed plugins by name, names of removed tools)
+ApplyChanges = Callable[[Dict[str, Callable], List[str]], Union[None, Awaitable[None]]]
+
+
+class PluginReloader(Middleware):
+    """Watches a plugin directory and applies plugin changes to the running server."""
+
+    def __init__(self, loader: Any, apply: ApplyChanges, interval: float):
+        """
+        Initialize plugin reloader.
+
+        Args:
+            loader: PluginLoader whose tools directory is watched
+            apply: Function (sync or async) that unregisters the removed tools
+                and registers or replaces the given ones; runs on the event loop
+            interval: Seconds between checks of the tools directory
+        """
+        self.loader = loader
+        self.apply = apply
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._sessions: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+    async def on_message(self, context: MiddlewareContext, call_next):
+        self.start()
+        if context.fastmcp_context is not None:
+            try:
+                self._sessions.add(context.fastmcp_context.session)
+            except (ValueError, TypeError):
+                pass
+        return await call_next(context)
+
+    def start(self):
+        """Start polling on the running event loop, unless already polling."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._watch())
+            logger.info(f"[PluginReloader] Watching {self.loader.tools_dir} every {self.interval}s")
+
+    def stop(self):
+        """Stop polling."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reload()
+            except Exception as e:
+                logger.error(f"[PluginReloader] Reloading plugins failed: {e}", exc_info=True)
+
+    async def reload(self) -> bool:
+        """
+        Apply the plugin changes made since the last check.
+
+        Returns:
+            True if any tool was added, replaced or removed
+        """
+        async with self._lock:
+            # Eagerly loaded plugins run their module body; keep the loop responsive
+            tools, removed = await asyncio.to_thread(self.loader.reload_changed)
+            if not tools and not removed:
+                return False
+            result = self.apply(tools, removed)
+            if asyncio.iscoroutine(result):
+                await result
+            logger.info(
+                f"[PluginReloader] Reloaded {len(tools)} tool(s), removed {len(removed)}: "
+                f"{', '.join(sorted(tools)) or '-'} / {', '.join(sorted(removed)) or '-'}"
+            )
+        await self._notify()
+        return True
+
+    async def _notify(self):
+        """Tell connected clients to list the tools again."""
+        for session in list(self._sessions):
+            try:
+                await session.send_tool_list_changed()
+            except Exception as e:
+                # The session may have ended
+                logger.debug(f"[PluginReloader] Could not notify session: {e}")
+                self._sessions.discard(session)
@@ -0,0 +1,459 @@
+"""
+Async Subprocess Runner for Command-Line Tool Wrappers
+
+Runs command-line tools with asyncio subprocesses instead of blocking
+subprocess.run calls, so many concurrent commands cost almost nothing:
+
+- stdout/stderr are read incrementally while the process runs
+- output beyond a size cap is spilled to a temporary file instead of memory
+- on timeout the whole process group is terminated (SIGTERM, then SIGKILL)
+
+Also provides ProcessGroupExecutor, which runs synchronous tool functions in
+their own process group so abandoned calls can be torn down together with
+every scanner process they spawned.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+logger = setup_logger(__name__, log_file_path="logs/recon_mcpserver.log")
+
+from deadline import current_deadline
+
+# Maximum bytes of each stream kept in memory before spilling to disk
+DEFAULT_MAX_OUTPUT_BYTES = int(os.environ.get("MCP_MAX_OUTPUT_BYTES", 1024 * 1024))
+
+# Seconds between SIGTERM and SIGKILL when tearing down a process group
+DEFAULT_KILL_GRACE_SECONDS = 5.0
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+class OutputBuffer:
+    """Collects a process stream in memory up to a cap, spilling the rest to disk."""
+
+    def __init__(self, name: str, max_bytes: int, spill_dir: Optional[str] = None):
+        """
+        Initialize output buffer.
+
+        Args:
+            name: Stream name (stdout or stderr), used in the spill file name
+            max_bytes: Maximum number of bytes kept in memory
+            spill_dir: Directory for spill files (default: system temp directory)
+        """
+        self.name = name
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.head = bytearray()
+        self.total_bytes = 0
+        self.spill_path: Optional[str] = None
+        self._spill_file = None
+
+    def write(self, data: bytes):
+        """Append a chunk of output."""
+        self.total_bytes += len(data)
+        if self._spill_file is None and len(self.head) + len(data) <= self.max_bytes:
+            self.head.extend(data)
+            return
+
+        if self._spill_file is None:
+            fd, self.spill_path = tempfile.mkstemp(prefix=f"mcp_{self.name}_", suffix=".log", dir=self.spill_dir)
+            self._spill_file = os.fdopen(fd, "wb")
+            self._spill_file.write(self.head)
+            logger.debug(f"[process_runner] Spilling {self.name} to {self.spill_path}")
+
+        self._spill_file.write(data)
+        room = self.max_bytes - len(self.head)
+        if room > 0:
+            self.head.extend(data[:room])
+
+    def close(self):
+        """Flush and close the spill file, if any."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def discard(self):
+        """Close and delete the spill file, if any."""
+        self.close()
+        if self.spill_path is not None:
+            try:
+                os.unlink(self.spill_path)
+            except FileNotFoundError:
+                pass
+            self.spill_path = None
+
+    @property
+    def truncated(self) -> bool:
+        """Whether output exceeded the in-memory cap."""
+        return self.total_bytes > len(self.head)
+
+    def text(self) -> str:
+        """Return the in-memory part of the output as text."""
+        return self.head.decode("utf-8", errors="replace")
+
+
+async def _pump(
+    stream: Optional[asyncio.StreamReader],
+    buffer: OutputBuffer,
+    on_line: Optional[Callable[[bytes], None]] = None
+):
+    """Copy a process stream into a buffer chunk by chunk, passing complete lines to on_line."""
+    if stream is None:
+        return
+    partial = b""
+    while True:
+        chunk = await stream.read(_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer.write(chunk)
+        if on_line is not None:
+            *lines, partial = (partial + chunk).split(b"\n")
+            for line in lines:
+                on_line(line)
+    if on_line is not None and partial:
+        on_line(partial)
+
+
+def _signal_process_group(process: asyncio.subprocess.Process, sig: int):
+    """Send a signal to the process group of a child, or to the child alone on Windows."""
+    if process.returncode is not None:
+        return
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, sig)
+        elif sig == getattr(signal, "SIGKILL", None):
+            process.kill()
+        else:
+            process.terminate()
+    except ProcessLookupError:
+        pass
+
+
+async def terminate_process_group(
+    process: asyncio.subprocess.Process,
+    grace_seconds: float = DEFAULT_KILL_GRACE_SECONDS
+):
+    """
+    Terminate a child and all of its descendants.
+
+    Sends SIGTERM to the process group, waits up to grace_seconds and then
+    sends SIGKILL to anything still alive.
+
+    Args:
+        process: Process started with start_new_session=True
+        grace_seconds: Seconds to wait between SIGTERM and SIGKILL
+    """
+    _signal_process_group(process, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(process.wait(), timeout=grace_seconds)
+    except asyncio.TimeoutError:
+        logger.warning(f"[process_runner] Process group {process.pid} ignored SIGTERM, sending SIGKILL")
+    # Descendants may outlive the group leader, so always finish with SIGKILL
+    if hasattr(signal, "SIGKILL") and hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        _signal_process_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+    await process.wait()
+
+
+async def run_command(
+    cmd: List[str],
+    timeout: Optional[float] = 300,
+    max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+    spill_dir: Optional[str] = None,
+    cwd: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    stdin_data: Optional[bytes] = None,
+    on_stdout_line: Optional[Callable[[bytes], None]] = None,
+    keep_spill_files: bool = False
+) -> Dict[str, Any]:
+    """
+    Run a command asynchronously and collect its output.
+
+    Args:
+        cmd: Command and arguments to execute
+        timeout: Timeout in seconds (None for no timeout); clamped to the
+            current call's deadline when one is active
+        max_output_bytes: Bytes of each stream kept in memory before spilling to disk
+        spill_dir: Directory for spill files (default: system temp directory)
+        cwd: Working directory for the command
+        env: Environment for the command (default: inherit)
+        stdin_data: Optional bytes written to the command's stdin
+        on_stdout_line: Called on the event loop with each stdout line as it
+            is printed (e.g. to parse JSON lines while the command runs)
+        keep_spill_files: Keep the spill files of the full output and return
+            their paths (stdout_path, stderr_path). The caller must delete
+            them. By default they are deleted and only the in-memory part of
+            the output is returned.
+
+    Returns:
+        Dictionary with returncode, stdout, stderr, timing and spill metadata
+
+    Raises:
+        FileNotFoundError: If the executable does not exist
+    """
+    deadline = current_deadline.get()
+    if deadline is not None:
+        timeout = deadline.clamp(timeout)
+
+    stdout_buffer = OutputBuffer("stdout", max_output_bytes, spill_dir)
+    stderr_buffer = OutputBuffer("stderr", max_output_bytes, spill_dir)
+    started = time.monotonic()
+    timed_out = False
+
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE if stdin_data is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+        env=env,
+        start_new_session=hasattr(os, "killpg")
+    )
+
+    async def _communicate():
+        if stdin_data is not None and process.stdin is not None:
+            process.stdin.write(stdin_data)
+            await process.stdin.drain()
+            process.stdin.close()
+        await asyncio.gather(
+            _pump(process.stdout, stdout_buffer, on_stdout_line),
+            _pump(process.stderr, stderr_buffer)
+        )
+        return await process.wait()
+
+    try:
+        await asyncio.wait_for(_communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        timed_out = True
+        logger.warning(f"[process_runner] Command timed out after {timeout}s: {' '.join(cmd)}")
+        await terminate_process_group(process)
+    except asyncio.CancelledError:
+        # No result will hand the spill files to the caller
+        stdout_buffer.discard()
+        stderr_buffer.discard()
+        await terminate_process_group(process)
+        raise
+    finally:
+        stdout_buffer.close()
+        stderr_buffer.close()
+    if not keep_spill_files:
+        stdout_buffer.discard()
+        stderr_buffer.discard()
+
+    return {
+        "returncode": process.returncode,
+        "stdout": stdout_buffer.text(),
+        "stderr": stderr_buffer.text(),
+        "stdout_truncated": stdout_buffer.truncated,
+        "stderr_truncated": stderr_buffer.truncated,
+        "stdout_path": stdout_buffer.spill_path,
+        "stderr_path": stderr_buffer.spill_path,
+        "timed_out": timed_out,
+        "duration_seconds": round(time.monotonic() - started, 3),
+    }
+
+
+def kill_process_group(pgid: int, grace_seconds: float = DEFAULT_KILL_GRACE_SECONDS):
+    """
+    Terminate a process group synchronously: SIGTERM, wait, then SIGKILL.
+
+    Args:
+        pgid: Process group id (the pid of the group leader)
+        grace_seconds: Seconds to wait between SIGTERM and SIGKILL
+    """
+    if not hasattr(os, "killpg"):
+        return
+    try:
+        os.killpg(pgid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+    deadline = time.monotonic() + grace_seconds
+    while time.monotonic() < deadline:
+        try:
+            # Signal 0 only checks whether any member of the group is alive
+            os.killpg(pgid, 0)
+        except ProcessLookupError:
+            return
+        time.sleep(0.1)
+    logger.warning(f"[process_runner] Process group {pgid} ignored SIGTERM, sending SIGKILL")
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _run_in_new_session(conn, fn: Callable, args: tuple, kwargs: dict):
+    """Child process entry point: become a process group leader and run fn."""
+    if hasattr(os, "setsid"):
+        os.setsid()
+    try:
+        outcome = (True, fn(*args, **kwargs))
+    except BaseException as e:
+        outcome = (False, e)
+    try:
+        conn.send(outcome)
+    except Exception as e:
+        # Result or exception could not be pickled
+        conn.send((False, RuntimeError(f"Could not return result from worker process: {e}")))
+    finally:
+        conn.close()
+
+
+class _ProcessGroupFuture(Future):
+    """Future whose cancellation kills the worker's whole process group."""
+
+    def __init__(self, executor: "ProcessGroupExecutor"):
+        super().__init__()
+        self._executor = executor
+        self._process = None
+
+    def cancel(self) -> bool:
+        if super().cancel():
+            return True
+        process = self._process
+        if process is not None and not self.done():
+            # Kill in the background so callers on the event loop never block;
+            # the monitor thread completes the future once the worker is gone.
+            threading.Thread(
+                target=kill_process_group,
+                args=(process.pid, self._executor.kill_grace_seconds),
+                daemon=True
+            ).start()
+        return False
+
+
+class ProcessGroupExecutor(Executor):
+    """
+    Executor running each call in a fresh process that leads its own process group.
+
+    Cancelling a running future (e.g. when an asyncio task awaiting it is
+    cancelled by a deadline or job_cancel) sends SIGTERM and then SIGKILL to
+    the whole group, so scanner subprocesses never outlive an abandoned call.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        mp_context=None,
+        kill_grace_seconds: float = DEFAULT_KILL_GRACE_SECONDS
+    ):
+        """
+        Initialize executor.
+
+        Args:
+            max_workers: Maximum number of concurrent worker processes (default: CPU count)
+            mp_context: multiprocessing context used to start workers (default: fork)
+            kill_grace_seconds: Seconds between SIGTERM and SIGKILL on cancellation
+        """
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._mp_context = mp_context or multiprocessing.get_context("fork")
+        self.kill_grace_seconds = kill_grace_seconds
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._running: Dict[int, _ProcessGroupFuture] = {}
+        self._shutdown = False
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            future = _ProcessGroupFuture(self)
+            self._pending.append((future, fn, args, kwargs))
+            self._start_pending()
+        return future
+
+    def _start_pending(self):
+        """Start queued calls while worker slots are free. Caller holds the lock."""
+        while self._pending and len(self._running) < self._max_workers:
+            future, fn, args, kwargs = self._pending.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                self._launch(future, fn, args, kwargs)
+            except Exception as e:
+                future.set_exception(e)
+
+    def _launch(self, future: _ProcessGroupFuture, fn: Callable, args: tuple, kwargs: dict):
+        parent_conn, child_conn = self._mp_context.Pipe(duplex=False)
+        process = self._mp_context.Process(
+            target=_run_in_new_session,
+            args=(child_conn, fn, args, kwargs)
+        )
+        process.start()
+        child_conn.close()
+        future._process = process
+        self._running[process.pid] = future
+        threading.Thread(
+            target=self._monitor,
+            args=(future, process, parent_conn),
+            name=f"mcp-worker-{process.pid}",
+            daemon=True
+        ).start()
+
+    def _monitor(self, future: _ProcessGroupFuture, process, conn):
+        """Wait for a worker's result, then free its slot."""
+        try:
+            ok, payload = conn.recv()
+        except (EOFError, OSError):
+            ok, payload = False, None
+        finally:
+            conn.close()
+        process.join()
+        if payload is None and not ok:
+            payload = RuntimeError(
+                f"Worker process exited with code {process.exitcode}" if process.exitcode is not None
+                else f"Worker process {process.pid} exited without a result"
+            )
+        if not future.done():
+            if ok:
+                future.set_result(payload)
+            else:
+                future.set_exception(payload)
+        with self._lock:
+            self._running.pop(process.pid, None)
+            self._start_pending()
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while self._pending:
+                    future, _, _, _ = self._pending.popleft()
+                    future.cancel()
+            running = list(self._running.values())
+        if cancel_futures:
+            for future in running:
+                future.cancel()
+        if wait:
+            for future in running:
+                try:
+                    future.exception()
+                except BaseException:
+                    pass
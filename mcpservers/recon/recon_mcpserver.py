@@ -6,23 +6,35 @@ all tools within the recon/tools directory as MCP tools. It supports both pure P
 tools and tools that call command-line applications.
 
 Features:
-- Automatic plugin discovery from recon/tools directory
+- Automatic plugin discovery from recon/tools directory, importing plugins
+  only when one of their tools is first called
+- Hot reload of added, changed and removed plugins while the server runs
+- stdio, streamable HTTP or SSE transport, so one server can serve many agents
 - Support for Python scripts and command-line tool wrappers
 - Standardized logging using hd_logging
 - FastMCP-based implementation following Hackerdogs standards
 """
 
+import os
+import re
 import sys
+import types
+import asyncio
+import contextvars
+import hashlib
 import importlib.util
 import inspect
-import subprocess
+import multiprocessing
 import json
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional, Callable, List
-from functools import wraps
+from typing import Any, Dict, Optional, Callable, List, Tuple
+from functools import partial, wraps
 
 try:
     from fastmcp import FastMCP
+    from fastmcp.exceptions import NotFoundError
 except ImportError:
     raise ImportError(
         "fastmcp is required for recon_mcpserver. "
@@ -45,23 +57,84 @@ except ImportError:
 
 logger = setup_logger(__name__, log_file_path="logs/recon_mcpserver.log")
 
+from deadline import Deadline, DeadlineExceeded, current_deadline, track_worker
+from process_runner import ProcessGroupExecutor, run_command
+from plugin_discovery import PluginDescriptionError, ToolSpec, describe_plugin
+from plugin_manifest import PluginManifest, register_tool
+from plugin_reload import DEFAULT_RELOAD_INTERVAL, PluginReloader
+from single_flight import SingleFlight, coalesce_calls
+from transport import TransportConfig
+from zygote import ZygoteExecutor, zygote_supported
+
 # Initialize FastMCP server
 mcp = FastMCP(name='recon-mcpserver')
 
 
+def plugin_namespace(tools_dir: Path) -> str:
+    """
+    Package that the plugin modules of a tools directory are imported under.
+    
+    Plugins of different servers may share file names (several tools
+    directories have a trivy_tool.py), so each directory gets its own
+    namespace in sys.modules.
+    
+    Args:
+        tools_dir: Plugin directory
+        
+    Returns:
+        Package name, e.g. "mcp_plugins_appsec_dast_3f2a9c1e"
+    """
+    resolved = Path(tools_dir).resolve()
+    digest = hashlib.sha1(str(resolved).encode()).hexdigest()[:8]
+    name = re.sub(r"\W", "_", f"mcp_plugins_{resolved.parent.name}_{digest}")
+    if name not in sys.modules:
+        package = types.ModuleType(name, f"Tool plugins loaded from {resolved}")
+        # Plugins are registered here by the loader; nothing is found by searching
+        package.__path__ = []
+        sys.modules[name] = package
+    return name
+
+
+class _LazyDeclaration:
+    """
+    Tool declaration that is a function of a not yet imported plugin.
+    
+    The first call imports the plugin, so servers call it from a worker
+    thread rather than on the event loop.
+    """
+    
+    def __init__(self, load: Callable[[], Callable], name: str):
+        self.load = load
+        self.name = name
+    
+    def __call__(self, *args, **kwargs):
+        return getattr(self.load(), self.name)(*args, **kwargs)
+
+
 class PluginLoader:
     """Loads and manages plugin tools from the recon/tools directory."""
     
-    def __init__(self, tools_dir: Path):
+    def __init__(self, tools_dir: Path, lazy: bool = True, manifest: Optional[PluginManifest] = None):
         """
         Initialize plugin loader.
         
         Args:
             tools_dir: Path to the directory containing plugin tools
+            lazy: Describe plugins from their source and import them on the
+                first call of one of their tools (see plugin_discovery)
+            manifest: On-disk cache of plugin descriptions, so unchanged
+                plugins are not parsed again (see plugin_manifest)
         """
         self.tools_dir = Path(tools_dir)
         self.tools_dir.mkdir(parents=True, exist_ok=True)
+        self.lazy = lazy
+        self.manifest = manifest
+        self.namespace = plugin_namespace(self.tools_dir)
         self.loaded_plugins: Dict[str, Any] = {}
+        # (mtime_ns, size) of every plugin file when it was last loaded
+        self._stats: Dict[Path, Tuple[int, int]] = {}
+        # Guards loaded_plugins and plugin imports (lazy imports run on worker threads)
+        self._import_lock = threading.RLock()
         logger.info(f"[PluginLoader] Initialized with tools directory: {self.tools_dir}")
     
     def discover_plugins(self) -> List[Path]:
@@ -71,21 +144,60 @@ class PluginLoader:
         Returns:
             List of paths to Python plugin files
         """
-        plugins = []
         if not self.tools_dir.exists():
             logger.warning(f"[PluginLoader] Tools directory does not exist: {self.tools_dir}")
-            return plugins
+            return []
         
-        for file_path in self.tools_dir.glob("*.py"):
-            # Skip __init__.py and files starting with _
-            if file_path.name.startswith("_") or file_path.name == "__init__.py":
-                continue
-            plugins.append(file_path)
+        plugins = self._plugin_files()
+        for file_path in plugins:
             logger.debug(f"[PluginLoader] Discovered plugin: {file_path.name}")
         
         logger.info(f"[PluginLoader] Discovered {len(plugins)} plugin(s)")
         return plugins
     
+    def _plugin_files(self) -> List[Path]:
+        """Plugin files currently in the tools directory."""
+        # Skip __init__.py and files starting with _
+        return sorted(
+            file_path for file_path in self.tools_dir.glob("*.py")
+            if not (file_path.name.startswith("_") or file_path.name == "__init__.py")
+        )
+    
+    def module_name(self, plugin_path: Path) -> str:
+        """Name of a plugin's module in sys.modules."""
+        return f"{self.namespace}.{plugin_path.stem}"
+    
+    def plugin_modules(self) -> List[Tuple[str, Path]]:
+        """(module name, file) of every loaded plugin, e.g. for a zygote to pre-import."""
+        return [(self.module_name(plugin['path']), plugin['path']) for plugin in self.loaded_plugins.values()]
+    
+    def _exec_plugin(self, plugin_path: Path) -> Any:
+        """
+        Import a plugin file as a new module.
+        
+        The module replaces any previous version in sys.modules. Calls already
+        running keep the functions (and module globals) of the version they
+        started with.
+        """
+        module_name = self.module_name(plugin_path)
+        spec = importlib.util.spec_from_file_location(module_name, plugin_path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Failed to create spec for {plugin_path}")
+        
+        module = importlib.util.module_from_spec(spec)
+        previous = sys.modules.get(module_name)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            # A broken edit must not take the loaded version's module away
+            if previous is None:
+                sys.modules.pop(module_name, None)
+            else:
+                sys.modules[module_name] = previous
+            raise
+        return module
+    
     def load_plugin(self, plugin_path: Path) -> Optional[Dict[str, Any]]:
         """
         Load a plugin module and extract tool functions.
@@ -100,14 +212,7 @@ class PluginLoader:
             module_name = plugin_path.stem
             
             # Load the module
-            spec = importlib.util.spec_from_file_location(module_name, plugin_path)
-            if spec is None or spec.loader is None:
-                logger.error(f"[PluginLoader] Failed to create spec for {plugin_path}")
-                return None
-            
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[module_name] = module
-            spec.loader.exec_module(module)
+            module = self._exec_plugin(plugin_path)
             
             # Discover tool functions
             tools = {}
@@ -136,6 +241,86 @@ class PluginLoader:
             logger.error(f"[PluginLoader] Failed to load plugin {plugin_path}: {e}", exc_info=True)
             return None
     
+    def load_plugin_lazily(self, plugin_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Register a plugin's tools from its source, deferring its import.
+        
+        Each tool is a stub with the real signature, docstring and literal
+        declarations that imports the plugin on its first call. Plugins that
+        cannot be described from source are loaded eagerly.
+        
+        Args:
+            plugin_path: Path to the plugin Python file
+            
+        Returns:
+            Dictionary mapping tool names to tool functions, or None if loading failed
+        """
+        try:
+            specs = self.manifest.describe(plugin_path) if self.manifest else describe_plugin(plugin_path)
+        except (PluginDescriptionError, SyntaxError, OSError) as e:
+            logger.info(f"[PluginLoader] Importing {plugin_path.name} eagerly: {e}")
+            return self.load_plugin(plugin_path)
+        
+        module_name = plugin_path.stem
+        plugin = {
+            'module': None,
+            'tools': {},
+            'path': plugin_path
+        }
+        tools = {spec.name: self._lazy_tool(plugin, spec) for spec in specs}
+        if not tools:
+            logger.warning(f"[PluginLoader] No tools found in {plugin_path.name}")
+            return None
+        
+        plugin['tools'] = tools
+        self.loaded_plugins[module_name] = plugin
+        logger.info(f"[PluginLoader] Discovered {len(tools)} tool(s) in {plugin_path.name} (import deferred)")
+        return tools
+    
+    def _import_plugin(self, plugin: Dict[str, Any]) -> Any:
+        """Import a lazily registered plugin once, returning its module."""
+        with self._import_lock:
+            if plugin['module'] is None:
+                logger.info(f"[PluginLoader] Importing {plugin['path'].name} on first use")
+                plugin['module'] = self._exec_plugin(plugin['path'])
+            return plugin['module']
+    
+    def _lazy_tool(self, plugin: Dict[str, Any], spec: ToolSpec) -> Callable:
+        """Build the stub standing in for a tool function until its plugin is imported."""
+        tool_name = spec.name
+        plugin_path = plugin['path']
+        
+        def load() -> Callable:
+            return getattr(self._import_plugin(plugin), tool_name)
+        
+        if spec.is_async:
+            async def tool(*args, **kwargs):
+                return await load()(*args, **kwargs)
+        else:
+            def tool(*args, **kwargs):
+                return load()(*args, **kwargs)
+        
+        signature = spec.signature()
+        tool.__name__ = tool.__qualname__ = tool_name
+        tool.__module__ = self.module_name(plugin_path)
+        tool.__doc__ = spec.doc
+        tool.__signature__ = signature
+        tool.__annotations__ = {
+            name: parameter.annotation for name, parameter in signature.parameters.items()
+            if parameter.annotation is not inspect.Parameter.empty
+        }
+        if signature.return_annotation is not inspect.Signature.empty:
+            tool.__annotations__["return"] = signature.return_annotation
+        # Lets wrappers import the plugin before dispatching to forked workers
+        tool.__plugin_loader__ = load
+        # Lets a zygote import the plugin instead of the server
+        tool.__plugin_path__ = str(plugin_path)
+        for name, value in spec.declaration_values().items():
+            setattr(tool, name, value)
+        for name in spec.lazy_declarations:
+            setattr(tool, name, _LazyDeclaration(load, name))
+        return tool
+    
     def _is_tool_function(self, func: Callable) -> bool:
         """
         Determine if a function should be exposed as an MCP tool.
@@ -170,21 +355,163 @@ class PluginLoader:
         plugins = self.discover_plugins()
         
         for plugin_path in plugins:
-            tools = self.load_plugin(plugin_path)
+            tools = self._load(plugin_path)
             if tools:
                 all_tools.update(tools)
         
         logger.info(f"[PluginLoader] Loaded {len(all_tools)} total tool(s) from {len(plugins)} plugin(s)")
         return all_tools
+    
+    def _load(self, plugin_path: Path) -> Optional[Dict[str, Any]]:
+        """Load a plugin, remembering the file version it was loaded from."""
+        stat = self._stat(plugin_path)
+        if stat is not None:
+            self._stats[plugin_path] = stat
+        return self.load_plugin_lazily(plugin_path) if self.lazy else self.load_plugin(plugin_path)
+    
+    @staticmethod
+    def _stat(plugin_path: Path) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of a plugin file, None if it is gone."""
+        try:
+            stat = plugin_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def unload_plugin(self, plugin_path: Path) -> List[str]:
+        """
+        Forget a plugin whose file was removed.
+        
+        Args:
+            plugin_path: Path to the plugin Python file
+            
+        Returns:
+            Names of the plugin's tools
+        """
+        self._stats.pop(plugin_path, None)
+        plugin = self.loaded_plugins.pop(plugin_path.stem, None)
+        sys.modules.pop(self.module_name(plugin_path), None)
+        if plugin is None:
+            return []
+        logger.info(f"[PluginLoader] Unloaded {plugin_path.name}")
+        return list(plugin['tools'])
+    
+    def reload_changed(self) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Load, replace or remove the plugins that changed on disk since they were loaded.
+        
+        A plugin is changed when its mtime or size differs. If a changed
+        plugin fails to load, its previous version stays loaded until the
+        file is fixed.
+        
+        Runs off the event loop, so it holds the import lock: a lazy plugin
+        imported by a running call never races a reload of the same plugin.
+        
+        Returns:
+            Tuple of (tools of added and changed plugins by name, names of
+            tools that no longer exist)
+        """
+        with self._import_lock:
+            return self._reload_changed()
+    
+    def _reload_changed(self) -> Tuple[Dict[str, Any], List[str]]:
+        """reload_changed with the import lock held."""
+        current = {}
+        if self.tools_dir.exists():
+            for plugin_path in self._plugin_files():
+                stat = self._stat(plugin_path)
+                if stat is not None:
+                    current[plugin_path] = stat
+        changed = [plugin_path for plugin_path, stat in current.items() if self._stats.get(plugin_path) != stat]
+        removed = [plugin_path for plugin_path in self._stats if plugin_path not in current]
+        
+        tools: Dict[str, Any] = {}
+        removed_tools: List[str] = []
+        for plugin_path in removed:
+            removed_tools.extend(self.unload_plugin(plugin_path))
+        for plugin_path in changed:
+            previous = self.loaded_plugins.get(plugin_path.stem)
+            logger.info(f"[PluginLoader] {'Reloading' if plugin_path in self._stats else 'Loading new plugin'} {plugin_path.name}")
+            new_tools = self._load(plugin_path)
+            if new_tools is None and previous is not None:
+                logger.warning(f"[PluginLoader] Keeping the loaded version of {plugin_path.name}")
+                continue
+            tools.update(new_tools or {})
+            if previous is not None:
+                removed_tools.extend(name for name in previous['tools'] if name not in (new_tools or {}))
+        
+        # A tool moved to another plugin is replaced, not removed
+        return tools, [name for name in removed_tools if name not in tools]
+
+
+def create_executor(executor_type: str = "thread", max_workers: Optional[int] = None) -> Executor:
+    """
+    Create the executor used to run synchronous tool functions off the event loop.
+    
+    Args:
+        executor_type: "thread" for a thread pool, "process" to run each call in
+            its own process group, which is killed when the call is cancelled,
+            or "zygote" to fork those processes from a pre-imported zygote
+            (see zygote.py; call start() on the executor once plugins are loaded)
+        max_workers: Maximum number of concurrent workers (None uses the executor default)
+        
+    Returns:
+        Executor instance
+    """
+    executor_type = (executor_type or "thread").lower()
+    
+    if executor_type == "process":
+        # Plugins are loaded from file paths and only registered in sys.modules,
+        # so workers must be forked to be able to resolve the tool functions.
+        if "fork" in multiprocessing.get_all_start_methods():
+            logger.info(f"[executor] Using process-group workers (max_workers={max_workers})")
+            return ProcessGroupExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("fork")
+            )
+        logger.warning("[executor] Process executor requires fork support, falling back to threads")
+    elif executor_type == "zygote":
+        if zygote_supported():
+            logger.info(f"[executor] Using zygote-forked process-group workers (max_workers={max_workers})")
+            return ZygoteExecutor(max_workers=max_workers)
+        logger.warning("[executor] Zygote executor requires fork and fd passing support, falling back to threads")
+    elif executor_type != "thread":
+        logger.warning(f"[executor] Unknown executor type '{executor_type}', falling back to threads")
+    
+    logger.info(f"[executor] Using thread pool (max_workers={max_workers})")
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-tool")
 
 
-def create_mcp_tool_from_function(func: Callable, tool_name: str) -> Callable:
+def create_mcp_tool_from_function(
+    func: Callable,
+    tool_name: str,
+    executor: Optional[Executor] = None,
+    default_timeout: Optional[float] = None,
+    single_flight: bool = True
+) -> Callable:
     """
     Create an MCP tool wrapper from a Python function.
     
+    Synchronous functions are dispatched to an executor so long-running scans
+    never block the event loop serving other MCP requests.
+    
+    Identical concurrent calls (same arguments) are coalesced: the first one
+    executes and the others await its result. Functions with side effects
+    opt out by setting `__single_flight__ = False`.
+    
+    Every call runs under a Deadline: the one already active for the request
+    (set by the server at the MCP boundary) or one created here from the
+    call's `timeout` argument or default_timeout. A `timeout` argument is
+    clamped to the time left before it reaches the tool, and the call is
+    cancelled once the deadline passes.
+    
     Args:
         func: The function to wrap
         tool_name: Name for the tool
+        executor: Executor for synchronous functions (None uses the event loop default)
+        default_timeout: Deadline in seconds for calls without a `timeout` argument
+            (None for no deadline)
+        single_flight: Coalesce identical concurrent calls
         
     Returns:
         Wrapped function ready for MCP tool registration
@@ -193,15 +520,54 @@ def create_mcp_tool_from_function(func: Callable, tool_name: str) -> Callable:
     original_sig = inspect.signature(func)
     original_doc = func.__doc__ or f"Tool: {tool_name}"
     
+    timeout_param = original_sig.parameters.get("timeout")
+    timeout_default = None
+    if timeout_param is not None and timeout_param.default is not inspect.Parameter.empty:
+        timeout_default = timeout_param.default
+    
+    def _prepare_deadline(kwargs: Dict[str, Any]) -> Optional[Deadline]:
+        """Resolve the call's deadline and clamp its timeout argument to it."""
+        deadline = current_deadline.get()
+        if deadline is None:
+            budget = kwargs.get("timeout", timeout_default) if timeout_param is not None else None
+            budget = budget or default_timeout
+            if budget:
+                deadline = Deadline(budget)
+        if deadline is not None and timeout_param is not None:
+            kwargs["timeout"] = deadline.clamp(kwargs.get("timeout", timeout_default))
+        return deadline
+    
+    flights = SingleFlight(tool_name) if single_flight and getattr(func, "__single_flight__", True) else None
+    plugin_loader = getattr(func, "__plugin_loader__", None)
+    
+    def _coalesce(key: str, call: Callable[[], Any]) -> Any:
+        """Run call, joining an identical in-flight call if there is one."""
+        return flights.run(key, call) if flights is not None else call()
+    
+    def _deadline_error(e: DeadlineExceeded) -> Dict[str, Any]:
+        logger.error(f"[{tool_name}] {e}, call cancelled")
+        return {
+            "status": "error",
+            "message": str(e),
+            "timed_out": True,
+            "tool": tool_name
+        }
+    
     # Create wrapper that handles both sync and async functions
     if inspect.iscoroutinefunction(func):
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
+            key = SingleFlight.key(args, kwargs)
+            deadline = _prepare_deadline(kwargs)
+            token = current_deadline.set(deadline)
             try:
                 logger.debug(f"[{tool_name}] Executing with args={args}, kwargs={kwargs}")
-                result = await func(*args, **kwargs)
+                call = _coalesce(key, lambda: func(*args, **kwargs))
+                result = await (deadline.wait(call) if deadline else call)
                 logger.info(f"[{tool_name}] Execution completed successfully")
                 return result
+            except DeadlineExceeded as e:
+                return _deadline_error(e)
             except Exception as e:
                 logger.error(f"[{tool_name}] Execution failed: {e}", exc_info=True)
                 return {
@@ -209,6 +575,8 @@ def create_mcp_tool_from_function(func: Callable, tool_name: str) -> Callable:
                     "message": str(e),
                     "tool": tool_name
                 }
+            finally:
+                current_deadline.reset(token)
         
         # Preserve signature and docstring
         async_wrapper.__signature__ = original_sig
@@ -219,11 +587,41 @@ def create_mcp_tool_from_function(func: Callable, tool_name: str) -> Callable:
     else:
         @wraps(func)
         async def sync_wrapper(*args, **kwargs):
+            key = SingleFlight.key(args, kwargs)
+            deadline = _prepare_deadline(kwargs)
+            token = current_deadline.set(deadline)
             try:
                 logger.debug(f"[{tool_name}] Executing with args={args}, kwargs={kwargs}")
-                result = func(*args, **kwargs)
+                loop = asyncio.get_running_loop()
+                # Cancelling this future (deadline, job_cancel) kills the worker's
+                # process group when running on a ProcessGroupExecutor
+                target_func = func
+                if (
+                    plugin_loader is not None
+                    and isinstance(executor, ProcessGroupExecutor)
+                    and not isinstance(executor, ZygoteExecutor)
+                ):
+                    # Import a lazily loaded plugin here so forked workers inherit it
+                    # (a zygote imports plugins itself)
+                    target_func = await loop.run_in_executor(None, plugin_loader)
+                target = partial(target_func, *args, **kwargs)
+                if not isinstance(executor, ProcessGroupExecutor):
+                    # Worker threads see the caller's context variables (e.g. the
+                    # deadline and progress reporting)
+                    target = partial(contextvars.copy_context().run, target)
+                
+                def submit():
+                    if executor is None:
+                        return loop.run_in_executor(None, target)
+                    # Recorded so a cancelled call's slot is held until the worker is done
+                    return asyncio.wrap_future(track_worker(executor.submit(target)), loop=loop)
+                
+                call = _coalesce(key, submit)
+                result = await (deadline.wait(call) if deadline else call)
                 logger.info(f"[{tool_name}] Execution completed successfully")
                 return result
+            except DeadlineExceeded as e:
+                return _deadline_error(e)
             except Exception as e:
                 logger.error(f"[{tool_name}] Execution failed: {e}", exc_info=True)
                 return {
@@ -231,6 +629,8 @@ def create_mcp_tool_from_function(func: Callable, tool_name: str) -> Callable:
                     "message": str(e),
                     "tool": tool_name
                 }
+            finally:
+                current_deadline.reset(token)
         
         # Preserve signature and docstring
         sync_wrapper.__signature__ = original_sig
@@ -278,29 +678,27 @@ def create_cli_tool_wrapper(tool_name: str, command: List[str], description: str
             
             logger.info(f"[{tool_name}] Executing command: {' '.join(cmd)}")
             
-            # Execute command
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
+            # Execute command without blocking the event loop
+            result = await run_command(cmd, timeout=300)  # 5 minute timeout
+            
+            if result["timed_out"]:
+                logger.error(f"[{tool_name}] Command timed out")
+                return {
+                    "status": "error",
+                    "message": "Command execution timed out",
+                    "tool": tool_name
+                }
             
             return {
-                "status": "success" if result.returncode == 0 else "error",
-                "returncode": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
+                "status": "success" if result["returncode"] == 0 else "error",
+                "returncode": result["returncode"],
+                "stdout": result["stdout"],
+                "stderr": result["stderr"],
+                "stdout_truncated": result["stdout_truncated"],
+                "stderr_truncated": result["stderr_truncated"],
                 "command": " ".join(cmd)
             }
             
-        except subprocess.TimeoutExpired:
-            logger.error(f"[{tool_name}] Command timed out")
-            return {
-                "status": "error",
-                "message": "Command execution timed out",
-                "tool": tool_name
-            }
         except Exception as e:
             logger.error(f"[{tool_name}] Execution failed: {e}", exc_info=True)
             return {
@@ -316,40 +714,135 @@ def create_cli_tool_wrapper(tool_name: str, command: List[str], description: str
     return cli_tool
 
 
-def register_plugin_tools():
-    """Discover and register all plugin tools with the MCP server."""
+def register_plugin_tools(
+    executor: Optional[Executor] = None,
+    wrap_tool: Optional[Callable[[str, Callable], Callable]] = None
+) -> "PluginLoader":
+    """
+    Discover and register all plugin tools with the MCP server.
+    
+    Args:
+        executor: Executor for synchronous tools, owned and started by the
+            caller (default: one created from RECON_EXECUTOR and RECON_MAX_WORKERS)
+        wrap_tool: Applied to every tool wrapper before registration, as
+            wrap_tool(tool_name, wrapper) (e.g. a gateway's admission control)
+    
+    Returns:
+        The plugin loader, e.g. for a gateway's zygote to pre-import its modules
+    """
     # Determine tools directory
     server_dir = Path(__file__).parent
     tools_dir = server_dir / "tools"
     
-    # Load plugins
-    loader = PluginLoader(tools_dir)
+    # Load plugins (RECON_LAZY_PLUGINS=0 imports every plugin at startup)
+    lazy = os.environ.get("RECON_LAZY_PLUGINS", "1").lower() not in ("0", "false", "no")
+    # Cached plugin descriptions and tool schemas (MCP_PLUGIN_MANIFEST=0 disables)
+    manifest = PluginManifest.for_tools_dir(tools_dir)
+    loader = PluginLoader(tools_dir, lazy=lazy, manifest=manifest)
     all_tools = loader.load_all_plugins()
     
+    if executor is None:
+        # Executor for synchronous tools (RECON_EXECUTOR=thread|process|zygote, RECON_MAX_WORKERS=N)
+        max_workers = os.environ.get("RECON_MAX_WORKERS")
+        executor = create_executor(
+            os.environ.get("RECON_EXECUTOR", "thread"),
+            int(max_workers) if max_workers else None
+        )
+        
+        # Fork pre-imported workers before the event loop starts (RECON_EXECUTOR=zygote)
+        if isinstance(executor, ZygoteExecutor):
+            executor.start(loader.plugin_modules())
+    
     # Register each tool with FastMCP
-    registered_count = 0
-    for tool_name, tool_func in all_tools.items():
-        try:
-            # Create wrapper
-            wrapped_func = create_mcp_tool_from_function(tool_func, tool_name)
-            
-            # Update the function name for better identification
-            wrapped_func.__name__ = tool_name
-            
-            # Register with FastMCP using decorator pattern
-            # Apply the @mcp.tool() decorator programmatically
-            decorated_func = mcp.tool()(wrapped_func)
-            
-            # Store reference to prevent garbage collection
-            setattr(mcp, f"_tool_{tool_name}", decorated_func)
-            
-            registered_count += 1
-            logger.info(f"[recon_mcpserver] Registered tool: {tool_name}")
-            
-        except Exception as e:
-            logger.error(f"[recon_mcpserver] Failed to register tool {tool_name}: {e}", exc_info=True)
+    registered_count = sum(
+        register_plugin_tool(tool_name, tool_func, executor, manifest, wrap_tool)
+        for tool_name, tool_func in all_tools.items()
+    )
     
+    if manifest is not None:
+        manifest.save()
     logger.info(f"[recon_mcpserver] Registered {registered_count} tool(s) with MCP server")
+    
+    # Pick up added, changed and removed plugins during development (RECON_PLUGIN_RELOAD_INTERVAL > 0)
+    interval = float(os.environ.get("RECON_PLUGIN_RELOAD_INTERVAL", DEFAULT_RELOAD_INTERVAL))
+    if interval > 0:
+        def apply(tools: Dict[str, Callable], removed: List[str]):
+            for tool_name in list(tools) + removed:
+                unregister_plugin_tool(tool_name)
+            for tool_name, tool_func in tools.items():
+                register_plugin_tool(tool_name, tool_func, executor, manifest, wrap_tool)
+            if manifest is not None:
+                manifest.save()
+        
+        mcp.add_middleware(PluginReloader(loader, apply, interval))
+    
+    return loader
+
+
+def register_plugin_tool(
+    tool_name: str,
+    tool_func: Callable,
+    executor: Optional[Executor] = None,
+    manifest: Optional[PluginManifest] = None,
+    wrap_tool: Optional[Callable[[str, Callable], Callable]] = None
+) -> bool:
+    """
+    Register one plugin tool with the MCP server.
+    
+    Args:
+        tool_name: Name of the tool
+        tool_func: Plugin function (or lazy stub)
+        executor: Executor for synchronous tools
+        manifest: Manifest caching tool schemas
+        wrap_tool: Applied to the wrapper before registration, as wrap_tool(tool_name, wrapper)
+        
+    Returns:
+        True if the tool was registered
+    """
+    try:
+        # Create wrapper; with wrap_tool (which may queue calls) identical calls
+        # are coalesced outside it, so duplicates never wait for a slot
+        wrapped_func = create_mcp_tool_from_function(
+            tool_func, tool_name, executor, single_flight=wrap_tool is None
+        )
+        
+        # Update the function name for better identification
+        wrapped_func.__name__ = tool_name
+        if wrap_tool is not None:
+            wrapped_func = wrap_tool(tool_name, wrapped_func)
+            if getattr(tool_func, "__single_flight__", True):
+                wrapped_func = coalesce_calls(tool_name, wrapped_func)
+        
+        # Register with FastMCP, reusing the cached schema of unchanged tools
+        decorated_func = register_tool(mcp, wrapped_func, manifest)
+        
+        # Store reference to prevent garbage collection
+        setattr(mcp, f"_tool_{tool_name}", decorated_func)
+        
+        logger.info(f"[recon_mcpserver] Registered tool: {tool_name}")
+        return True
+        
+    except Exception as e:
+        logger.error(f"[recon_mcpserver] Failed to register tool {tool_name}: {e}", exc_info=True)
+        return False
+
+
+def unregister_plugin_tool(tool_name: str):
+    """
+    Remove a plugin tool from the MCP server, if registered.
+    
+    Calls already running keep their wrapper and finish normally.
+    
+    Args:
+        tool_name: Name of the tool
+    """
+    try:
+        mcp.remove_tool(tool_name)
+    except NotFoundError:
+        return
+    if hasattr(mcp, f"_tool_{tool_name}"):
+        delattr(mcp, f"_tool_{tool_name}")
+    logger.info(f"[recon_mcpserver] Unregistered tool: {tool_name}")
 
 
 def main() -> None:
@@ -359,8 +852,10 @@ def main() -> None:
     # Register all plugin tools
     register_plugin_tools()
     
-    logger.info("Recon MCP server ready. Starting stdio transport...")
-    mcp.run(transport='stdio')
+    # RECON_TRANSPORT=http|sse serves many clients from one process (see transport.py)
+    transport = TransportConfig.from_env("RECON")
+    logger.info(f"Recon MCP server ready. Starting {transport.describe()} transport...")
+    transport.run(mcp)
 
 
 if __name__ == "__main__":
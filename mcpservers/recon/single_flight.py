@@ -0,0 +1,147 @@
+"""
+Single-Flight Coalescing of Identical Tool Calls
+
+When several agents ask for the same scan at the same time (same tool, same
+arguments), only the first call runs; the others wait for it and receive the
+same result. The shared run keeps going as long as at least one caller still
+waits for it, and is cancelled (killing the scanner's process group in
+process mode) once every caller has given up.
+
+Servers that queue calls (admission control, clone leases) coalesce with
+coalesce_calls() outside those layers, so waiting duplicates neither take a
+slot nor lease a checkout.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+logger = setup_logger(__name__, log_file_path="logs/recon_mcpserver.log")
+
+# Per-call settings that do not change what a call computes. The timeout is
+# not one of them: the shared run is bound by the first caller's deadline, so
+# calls with different budgets must not share it.
+COALESCE_IGNORED_ARGUMENTS = frozenset({"priority"})
+
+
+class _Flight:
+    """A shared in-flight call and the number of callers waiting for it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with identical arguments into one execution."""
+
+    def __init__(self, name: str):
+        """
+        Initialize single-flight group.
+
+        Args:
+            name: Tool name, used for logging
+        """
+        self.name = name
+        self.flights: Dict[str, _Flight] = {}
+
+    @staticmethod
+    def key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+        """
+        Identity of a call's arguments.
+
+        Args:
+            args: Positional arguments
+            kwargs: Keyword arguments
+
+        Returns:
+            Hex digest that is equal for identical arguments
+        """
+        material = json.dumps([list(args), kwargs], sort_keys=True, default=repr)
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run call, or join an identical call that is already in flight.
+
+        Args:
+            key: Call identity from key()
+            call: Zero-argument factory of the awaitable doing the work
+
+        Returns:
+            Result of the (shared) call; dict results are shallow-copied per
+            caller so callers can annotate them independently
+        """
+        flight = self.flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(call()))
+            self.flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._finished(key, flight))
+        else:
+            logger.info(f"[{self.name}] Joining identical in-flight call ({flight.waiters} waiting)")
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                # Last interested caller gave up: stop the shared work
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+        return copy.copy(result) if isinstance(result, dict) else result
+
+    def _finished(self, key: str, flight: _Flight):
+        if self.flights.get(key) is flight:
+            del self.flights[key]
+        if not flight.task.cancelled() and flight.task.exception() is not None and flight.waiters == 0:
+            logger.debug(f"[{self.name}] Shared call failed without waiters: {flight.task.exception()}")
+
+
+def coalesce_calls(
+    tool_name: str,
+    func: Callable[..., Awaitable[Any]],
+    key: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+) -> Callable[..., Awaitable[Any]]:
+    """
+    Wrap an async tool so identical concurrent calls share one execution.
+
+    Args:
+        tool_name: Tool name, used for logging
+        func: Async tool wrapper taking keyword arguments
+        key: Maps a call's keyword arguments to the arguments that identify it
+            (default: all but COALESCE_IGNORED_ARGUMENTS)
+
+    Returns:
+        Async wrapper with func's signature
+    """
+    flights = SingleFlight(tool_name)
+
+    def identity(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        if key is not None:
+            return key(kwargs)
+        return {name: value for name, value in kwargs.items() if name not in COALESCE_IGNORED_ARGUMENTS}
+
+    @wraps(func)
+    async def coalesced(**kwargs):
+        return await flights.run(SingleFlight.key((), identity(kwargs)), lambda: func(**kwargs))
+
+    return coalesced
@@ -2,18 +2,19 @@
 Example Command-Line Tool Plugin
 
 This is an example plugin that demonstrates how to create a tool that wraps
-a command-line application. The tool uses subprocess to execute CLI commands.
+a command-line application. The tool uses the shared async process runner to
+execute CLI commands without blocking the server.
 """
 
-import subprocess
 import json
 from typing import Dict, Any, Optional
 from hd_logging import setup_logger
+from process_runner import run_command
 
 logger = setup_logger(__name__, log_file_path="logs/recon_tools.log")
 
 
-def ping_host(host: str, count: int = 4, timeout: int = 5) -> Dict[str, Any]:
+async def ping_host(host: str, count: int = 4, timeout: int = 5) -> Dict[str, Any]:
     """
     Ping a host using the system ping command.
     
@@ -41,29 +42,28 @@ def ping_host(host: str, count: int = 4, timeout: int = 5) -> Dict[str, Any]:
         
         logger.debug(f"[ping_host] Executing command: {' '.join(cmd)}")
         
-        result = subprocess.run(
+        result = await run_command(
             cmd,
-            capture_output=True,
-            text=True,
             timeout=timeout + 5  # Add buffer to timeout
         )
         
+        if result["timed_out"]:
+            logger.error(f"[ping_host] Ping timed out for {host}")
+            return {
+                "status": "error",
+                "host": host,
+                "message": "Ping command timed out"
+            }
+        
         return {
-            "status": "success" if result.returncode == 0 else "error",
+            "status": "success" if result["returncode"] == 0 else "error",
             "host": host,
-            "returncode": result.returncode,
-            "stdout": result.stdout,
-            "stderr": result.stderr,
+            "returncode": result["returncode"],
+            "stdout": result["stdout"],
+            "stderr": result["stderr"],
             "command": " ".join(cmd)
         }
         
-    except subprocess.TimeoutExpired:
-        logger.error(f"[ping_host] Ping timed out for {host}")
-        return {
-            "status": "error",
-            "host": host,
-            "message": "Ping command timed out"
-        }
     except FileNotFoundError:
         logger.error("[ping_host] ping command not found")
         return {
@@ -80,7 +80,7 @@ def ping_host(host: str, count: int = 4, timeout: int = 5) -> Dict[str, Any]:
         }
 
 
-def nslookup(domain: str, record_type: str = "A") -> Dict[str, Any]:
+async def nslookup(domain: str, record_type: str = "A") -> Dict[str, Any]:
     """
     Perform DNS lookup using nslookup command.
     
@@ -104,20 +104,23 @@ def nslookup(domain: str, record_type: str = "A") -> Dict[str, Any]:
         
         logger.debug(f"[nslookup] Executing command: {' '.join(cmd)}")
         
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        result = await run_command(cmd, timeout=10)
+        
+        if result["timed_out"]:
+            logger.error(f"[nslookup] Lookup timed out for {domain}")
+            return {
+                "status": "error",
+                "domain": domain,
+                "message": "nslookup command timed out"
+            }
         
         return {
-            "status": "success" if result.returncode == 0 else "error",
+            "status": "success" if result["returncode"] == 0 else "error",
             "domain": domain,
             "record_type": record_type,
-            "returncode": result.returncode,
-            "stdout": result.stdout,
-            "stderr": result.stderr,
+            "returncode": result["returncode"],
+            "stdout": result["stdout"],
+            "stderr": result["stderr"],
             "command": " ".join(cmd)
         }
         
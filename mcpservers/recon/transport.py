@@ -0,0 +1,205 @@
+"""
+Server Transports
+
+Servers speak MCP over stdio by default, so every client spawns its own
+server process and nothing warm (result and clone caches, imported scanners,
+the zygote) is shared between agents. The HTTP transports let one long-lived
+server per category serve many agents at once:
+
+- "http": streamable HTTP, one endpoint with responses streamed as SSE
+- "sse": the older HTTP+SSE transport, for clients that do not support
+  streamable HTTP yet
+
+HTTP connections are kept alive between requests (uvicorn closes idle
+connections after 5 seconds by default), and GET /health answers load
+balancer and container health checks.
+
+Anyone who can reach an HTTP server can run its scanners, so with an auth
+token every MCP request must carry `Authorization: Bearer <token>`, and
+binding an address other than loopback without a token is refused.
+"""
+
+import hmac
+import ipaddress
+import os
+from typing import Any, Dict, Optional
+
+from fastmcp import FastMCP
+from fastmcp.server.auth import AccessToken, TokenVerifier
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+logger = setup_logger(__name__, log_file_path="logs/recon_mcpserver.log")
+
+TRANSPORTS = ("stdio", "http", "sse")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+
+# Seconds an idle HTTP connection stays open for the client's next request
+DEFAULT_KEEP_ALIVE = 120
+
+HEALTH_PATH = "/health"
+
+
+def _truthy(value: Any) -> bool:
+    return str(value).lower() not in ("0", "false", "no", "")
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class BearerTokenVerifier(TokenVerifier):
+    """Accepts requests carrying one shared bearer token."""
+
+    def __init__(self, token: str):
+        super().__init__()
+        self._token = token
+
+    async def verify_token(self, token: str) -> Optional[AccessToken]:
+        if not hmac.compare_digest(token.encode(), self._token.encode()):
+            return None
+        return AccessToken(token=token, client_id="mcp-client", scopes=[])
+
+
+class TransportConfig:
+    """How a server is exposed to its clients."""
+
+    def __init__(
+        self,
+        transport: str = "stdio",
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        path: Optional[str] = None,
+        keep_alive: float = DEFAULT_KEEP_ALIVE,
+        stateless: bool = False,
+        auth_token: Optional[str] = None
+    ):
+        """
+        Initialize transport configuration.
+
+        Args:
+            transport: "stdio", "http" (streamable HTTP) or "sse"
+            host: Address to bind in HTTP modes
+            port: Port to bind in HTTP modes
+            path: Endpoint path (default: FastMCP's /mcp/ or /sse/)
+            keep_alive: Seconds idle HTTP connections are kept open
+            stateless: Serve streamable HTTP without sessions, so requests can
+                be spread over several replicas
+            auth_token: Bearer token HTTP clients must send; required to bind
+                an address other than loopback
+
+        Raises:
+            ValueError: For an unknown transport, or a non-loopback HTTP address without auth_token
+        """
+        transport = transport.lower()
+        if transport == "streamable-http":
+            transport = "http"
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Unknown transport {transport!r}, expected one of {', '.join(TRANSPORTS)}")
+        if transport != "stdio" and not auth_token and not _is_loopback(host):
+            raise ValueError(
+                f"Refusing to serve {transport} on {host} without an auth token; "
+                f"set one (e.g. APPSEC_AUTH_TOKEN) or bind {DEFAULT_HOST}"
+            )
+        self.transport = transport
+        self.host = host
+        self.port = port
+        self.path = path
+        self.keep_alive = keep_alive
+        self.stateless = stateless
+        self.auth_token = auth_token or None
+
+    @classmethod
+    def from_env(cls, prefix: str, settings: Optional[Dict[str, Any]] = None) -> "TransportConfig":
+        """
+        Read the configuration from environment variables over settings.
+
+        Reads <prefix>_TRANSPORT, <prefix>_HOST, <prefix>_PORT,
+        <prefix>_HTTP_PATH, <prefix>_KEEP_ALIVE, <prefix>_STATELESS_HTTP and
+        <prefix>_AUTH_TOKEN (environment only, never from settings files).
+
+        Args:
+            prefix: Environment variable prefix, e.g. "APPSEC" or "RECON"
+            settings: Defaults with keys type, host, port, path, keep_alive, stateless
+
+        Returns:
+            TransportConfig
+        """
+        settings = settings or {}
+
+        def env(name: str, key: str, default: Any) -> Any:
+            return os.environ.get(f"{prefix}_{name}", settings.get(key, default))
+
+        return cls(
+            transport=str(env("TRANSPORT", "type", "stdio")),
+            host=str(env("HOST", "host", DEFAULT_HOST)),
+            port=int(env("PORT", "port", DEFAULT_PORT)),
+            path=env("HTTP_PATH", "path", None),
+            keep_alive=float(env("KEEP_ALIVE", "keep_alive", DEFAULT_KEEP_ALIVE)),
+            stateless=_truthy(env("STATELESS_HTTP", "stateless", False)),
+            auth_token=os.environ.get(f"{prefix}_AUTH_TOKEN")
+        )
+
+    def describe(self) -> str:
+        """Human-readable endpoint, for logs."""
+        if self.transport == "stdio":
+            return "stdio"
+        auth = "bearer token" if self.auth_token else "no auth"
+        return f"{self.transport} on {self.host}:{self.port}{self.path or ''} ({auth})"
+
+    def run(self, mcp: FastMCP):
+        """
+        Serve a FastMCP server until it is stopped.
+
+        Args:
+            mcp: Server to run
+        """
+        if self.transport == "stdio":
+            mcp.run(transport="stdio")
+            return
+
+        if self.auth_token:
+            mcp.auth = BearerTokenVerifier(self.auth_token)
+        add_health_route(mcp)
+        kwargs: Dict[str, Any] = {
+            "host": self.host,
+            "port": self.port,
+            "path": self.path,
+            "uvicorn_config": {"timeout_keep_alive": self.keep_alive},
+        }
+        if self.transport == "http":
+            kwargs["stateless_http"] = self.stateless
+        mcp.run(transport=self.transport, **kwargs)
+
+
+def add_health_route(mcp: FastMCP):
+    """Answer GET /health with the server name and tool count (once per server, without auth)."""
+    if getattr(mcp, "_health_route", False):
+        return
+    mcp._health_route = True
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse
+
+    @mcp.custom_route(HEALTH_PATH, methods=["GET"])
+    async def health(request: Request) -> JSONResponse:
+        tools = await mcp.get_tools()
+        return JSONResponse({"status": "ok", "server": mcp.name, "tools": len(tools)})
@@ -0,0 +1,328 @@
+"""
+Preforked Scanner Workers (Zygote Mode)
+
+With ProcessGroupExecutor each call forks the whole server process, which by
+then runs an event loop and several threads, and any plugin that was not
+imported yet is imported again in every worker. ZygoteExecutor instead forks
+one zygote process right after the tools are registered. The zygote imports
+every plugin module (and with it the scanner classes of
+application_security_tools) once, then waits for calls. Each call is handed
+to the zygote, which forks a fresh worker from its warm, single-threaded
+state. The worker leads its own process group, so cancellation tears down
+the worker and every scanner it started, as with ProcessGroupExecutor.
+
+Functions are sent to the zygote by reference (module name, qualified name,
+file), arguments and results are pickled, and each worker writes its result
+to a pipe whose end is passed to the zygote over a Unix socket. Plugins that
+changed on disk since the zygote imported them are re-imported by the zygote
+before it forks, so hot-reloaded plugins run their new code. Functions that
+cannot be referenced (closures) are run by forking the server as before.
+"""
+
+import importlib
+import importlib.util
+import multiprocessing
+import os
+import pickle
+import signal
+import socket
+import struct
+import sys
+import threading
+from functools import partial
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from process_runner import (
+    DEFAULT_KILL_GRACE_SECONDS,
+    ProcessGroupExecutor,
+    _ProcessGroupFuture,
+    _run_in_new_session,
+)
+
+try:
+    from hd_logging import setup_logger
+except ImportError:
+    import logging
+    def setup_logger(name, log_file_path=None):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        return logger
+
+logger = setup_logger(__name__, log_file_path="logs/recon_mcpserver.log")
+
+_HEADER = struct.Struct("!Q")
+_PID = struct.Struct("!q")
+
+# (module name, qualified name, module file)
+FunctionReference = Tuple[str, str, Optional[str]]
+
+
+def zygote_supported() -> bool:
+    """Whether this platform can fork workers from a zygote."""
+    return "fork" in multiprocessing.get_all_start_methods() and hasattr(socket, "send_fds")
+
+
+def function_reference(fn: Callable) -> Optional[FunctionReference]:
+    """
+    Reference under which the zygote can find a function.
+
+    Args:
+        fn: Module-level function or lazy plugin stub
+
+    Returns:
+        Reference, or None if the function is not reachable from its module
+    """
+    module_name = getattr(fn, "__module__", None)
+    qualname = getattr(fn, "__qualname__", "")
+    plugin_path = getattr(fn, "__plugin_path__", None)
+    if plugin_path is not None:
+        # Stub of a lazily loaded plugin: the zygote resolves the real function
+        return module_name, qualname, plugin_path
+    module = sys.modules.get(module_name) if module_name else None
+    if module is None or "<locals>" in qualname:
+        return None
+    target: Any = module
+    for part in qualname.split("."):
+        target = getattr(target, part, None)
+    if target is not fn:
+        return None
+    return module_name, qualname, getattr(module, "__file__", None)
+
+
+def _recv_exactly(sock: socket.socket, size: int, data: bytes = b"") -> bytes:
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError("zygote connection closed")
+        data += chunk
+    return data
+
+
+def _file_version(path: Optional[str]) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path) if path else None
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size) if stat else None
+
+
+class _Zygote:
+    """State of the zygote process: warm modules and the control socket."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        # File version each module was imported from, to notice edited plugins
+        self.versions: Dict[str, Optional[Tuple[int, int]]] = {}
+
+    def preload(self, modules: Iterable[Tuple[str, str]]):
+        """Import plugin modules the server has not imported yet."""
+        for module_name, path in modules:
+            try:
+                self.module(module_name, path)
+            except BaseException as e:
+                logger.warning(f"[Zygote] Could not preload {module_name}: {e}")
+
+    def module(self, module_name: str, path: Optional[str]) -> Any:
+        """A module in its current version, importing it again if its file changed."""
+        module = sys.modules.get(module_name)
+        version = _file_version(path)
+        if module is not None and (path is None or self.versions.setdefault(module_name, version) == version):
+            return module
+        if path is None:
+            return importlib.import_module(module_name)
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Failed to create spec for {path}")
+        previous = sys.modules.get(module_name)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            if previous is None:
+                sys.modules.pop(module_name, None)
+            else:
+                sys.modules[module_name] = previous
+            raise
+        self.versions[module_name] = version
+        return module
+
+    def resolve(self, reference: FunctionReference) -> Callable:
+        module_name, qualname, path = reference
+        target = self.module(module_name, path)
+        for part in qualname.split("."):
+            target = getattr(target, part)
+        return target
+
+    def serve(self):
+        """Fork a worker per request until the server closes the connection."""
+        while True:
+            try:
+                header, fds, _, _ = socket.recv_fds(self.sock, _HEADER.size, 1)
+                if not header:
+                    return
+                header = _recv_exactly(self.sock, _HEADER.size, header)
+                payload = _recv_exactly(self.sock, _HEADER.unpack(header)[0])
+            except (EOFError, OSError):
+                return
+            result_fd = fds[0]
+            try:
+                reference, args, kwargs = pickle.loads(payload)
+                fn = self.resolve(reference)
+            except BaseException as e:
+                fn, args, kwargs = partial(_raise, e), (), {}
+            pid = os.fork()
+            if pid == 0:
+                self.sock.close()
+                # Scanners must be able to wait for their own subprocesses
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.default_int_handler)
+                try:
+                    _run_in_new_session(Connection(result_fd), fn, args, kwargs)
+                finally:
+                    os._exit(0)
+            os.close(result_fd)
+            self.sock.sendall(_PID.pack(pid))
+
+
+def _raise(error: BaseException):
+    raise error
+
+
+def _zygote_main(sock: socket.socket, modules: Tuple[Tuple[str, str], ...]):
+    """Zygote process entry point."""
+    # Workers are reaped automatically; their results travel through the pipes
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    # The zygote exits when the server closes the connection, not on Ctrl-C
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Scanner output must never reach the MCP stdio channel
+    os.dup2(2, 1)
+    zygote = _Zygote(sock)
+    zygote.preload(modules)
+    logger.info(f"[Zygote] Ready with {len(sys.modules)} modules imported (pid {os.getpid()})")
+    zygote.serve()
+
+
+class _ZygoteWorker:
+    """Process handle of a worker forked by the zygote."""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.exitcode = None
+
+    def join(self):
+        # The zygote reaps its workers; the result pipe closes when a worker exits
+        pass
+
+
+class ZygoteExecutor(ProcessGroupExecutor):
+    """
+    Executor running each call in a process forked from a pre-imported zygote.
+
+    Behaves like ProcessGroupExecutor (one process group per call, killed on
+    cancellation, max_workers concurrent calls) but workers start from the
+    zygote's warm state instead of forking the server.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        kill_grace_seconds: float = DEFAULT_KILL_GRACE_SECONDS
+    ):
+        """
+        Initialize executor. Call start() once the plugins are registered.
+
+        Args:
+            max_workers: Maximum number of concurrent worker processes (default: CPU count)
+            kill_grace_seconds: Seconds between SIGTERM and SIGKILL on cancellation
+        """
+        super().__init__(max_workers, multiprocessing.get_context("fork"), kill_grace_seconds)
+        self._modules: Tuple[Tuple[str, str], ...] = ()
+        self._zygote = None
+        self._sock: Optional[socket.socket] = None
+
+    def start(self, modules: Iterable[Tuple[str, str]] = ()):
+        """
+        Fork the zygote.
+
+        Call before the event loop starts, while the server is single-threaded.
+
+        Args:
+            modules: (module name, file) of the plugin modules to pre-import
+        """
+        with self._lock:
+            self._modules = tuple((name, str(path)) for name, path in modules)
+            self._start_zygote()
+
+    def _start_zygote(self):
+        """Fork a new zygote. Caller holds the lock."""
+        self._stop_zygote()
+        parent_sock, child_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        process = self._mp_context.Process(
+            target=_zygote_main,
+            args=(child_sock, self._modules),
+            name="mcp-zygote",
+            daemon=True
+        )
+        process.start()
+        child_sock.close()
+        self._zygote, self._sock = process, parent_sock
+        logger.info(f"[ZygoteExecutor] Started zygote (pid {process.pid}) preloading {len(self._modules)} module(s)")
+
+    def _stop_zygote(self):
+        """Close the zygote's connection, which makes it exit. Caller holds the lock."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self._zygote is not None:
+            self._zygote.join(timeout=1)
+            self._zygote = None
+
+    def _launch(self, future: _ProcessGroupFuture, fn: Callable, args: tuple, kwargs: dict):
+        if isinstance(fn, partial):
+            fn, args, kwargs = fn.func, fn.args + args, {**fn.keywords, **kwargs}
+        reference = function_reference(fn)
+        if reference is None:
+            logger.debug(f"[ZygoteExecutor] {fn!r} cannot be referenced, forking the server")
+            return super()._launch(future, fn, args, kwargs)
+        payload = pickle.dumps((reference, args, kwargs))
+
+        parent_conn, child_conn = self._mp_context.Pipe(duplex=False)
+        try:
+            try:
+                pid = self._request(payload, child_conn.fileno())
+            except (OSError, EOFError) as e:
+                logger.warning(f"[ZygoteExecutor] Zygote is gone ({e}), starting a new one")
+                self._start_zygote()
+                pid = self._request(payload, child_conn.fileno())
+        finally:
+            child_conn.close()
+
+        worker = _ZygoteWorker(pid)
+        future._process = worker
+        self._running[pid] = future
+        threading.Thread(
+            target=self._monitor,
+            args=(future, worker, parent_conn),
+            name=f"mcp-worker-{pid}",
+            daemon=True
+        ).start()
+
+    def _request(self, payload: bytes, result_fd: int) -> int:
+        """Ask the zygote to fork a worker; returns the worker's pid. Caller holds the lock."""
+        if self._sock is None:
+            self._start_zygote()
+        socket.send_fds(self._sock, [_HEADER.pack(len(payload))], [result_fd])
+        self._sock.sendall(payload)
+        return _PID.unpack(_recv_exactly(self._sock, _PID.size))[0]
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        super().shutdown(wait, cancel_futures=cancel_futures)
+        with self._lock:
+            self._stop_zygote()
@@ -0,0 +1,10 @@
+"""Make the base server and recon modules importable, as the servers do at startup."""
+
+import sys
+from pathlib import Path
+
+SERVERS_DIR = Path(__file__).parent.parent
+
+for path in (SERVERS_DIR / "appsec_base", SERVERS_DIR / "recon"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
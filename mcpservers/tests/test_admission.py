@@ -0,0 +1,50 @@
+"""Admission slots of cancelled calls whose workers keep running."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from appsec_admission import AdmissionController
+
+
+def test_cancelled_call_keeps_slot_until_worker_finishes():
+    admission = AdmissionController(max_concurrent=1)
+    finish = threading.Event()
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            async def call():
+                workers = []
+                async with admission.slot("slow_scan", workers=workers):
+                    workers.append(executor.submit(finish.wait))
+                    await asyncio.wrap_future(workers[0], loop=loop)
+
+            task = asyncio.ensure_future(call())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            # The thread cannot be cancelled, so the slot stays taken
+            assert admission.running == 1
+            assert admission.stats()["running_cancelled"] == 1
+
+            finish.set()
+            for _ in range(100):
+                if admission.running == 0:
+                    break
+                await asyncio.sleep(0.01)
+            assert admission.running == 0
+            assert admission.stats()["running_cancelled"] == 0
+
+    asyncio.run(main())
+
+
+def test_finished_call_releases_slot_immediately():
+    admission = AdmissionController(max_concurrent=1)
+
+    async def main():
+        async with admission.slot("quick_scan", workers=[]):
+            assert admission.running == 1
+        assert admission.running == 0
+
+    asyncio.run(main())
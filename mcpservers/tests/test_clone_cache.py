@@ -0,0 +1,95 @@
+"""Clone cache checkouts and scratch copies of cached working trees."""
+
+import asyncio
+import os
+import subprocess
+
+import pytest
+
+from appsec_clone_cache import Checkout, CloneCache, _link_files
+
+
+def _tree(root):
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "app.py").write_text("print('cached')\n")
+    (root / "README.md").write_text("cached\n")
+    return root
+
+
+def _write_through(path):
+    """Try to modify a scratch file in place, as a careless scanner would."""
+    try:
+        with open(path, "w") as f:
+            f.write("modified\n")
+    except PermissionError:
+        pass
+
+
+def test_selected_files_do_not_write_through(tmp_path):
+    source = _tree(tmp_path / "checkout")
+    target = tmp_path / "scratch"
+    target.mkdir()
+
+    _link_files(source, target, ["src/app.py"])
+    _write_through(target / "src" / "app.py")
+
+    assert (source / "src" / "app.py").read_text() == "print('cached')\n"
+    assert not (target / "README.md").exists()
+
+
+def test_scratch_copy_does_not_write_through(tmp_path):
+    source = _tree(tmp_path / "checkout")
+    cache = CloneCache(tmp_path / "cache")
+    checkout = Checkout("https://github.com/example/app", "0" * 40, source, cache_hit=True)
+
+    async def main():
+        async with cache.scratch_copy(checkout, "semgrep") as path:
+            _write_through(path / "README.md")
+            (path / "report.json").write_text("{}")
+            return path
+
+    path = asyncio.run(main())
+
+    assert (source / "README.md").read_text() == "cached\n"
+    assert not (source / "report.json").exists()
+    assert not os.path.exists(path)
+
+
+def _repository(root):
+    _tree(root)
+    for args in (["init", "--quiet"], ["add", "."], ["commit", "--quiet", "-m", "initial"]):
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+            cwd=root, check=True
+        )
+    return root
+
+
+def _lease(cache, repo_url):
+    async def main():
+        async with cache.lease(repo_url) as checkout:
+            return checkout
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("repo_url", ["--upload-pack=touch /tmp/pwned", "file:///etc", "ext::sh -c id"])
+def test_unsafe_urls_are_rejected(tmp_path, repo_url):
+    with pytest.raises(ValueError):
+        _lease(CloneCache(tmp_path / "cache"), repo_url)
+
+
+def test_unrecorded_checkout_is_not_reused(tmp_path):
+    repository = _repository(tmp_path / "repository")
+    cache = CloneCache(tmp_path / "cache")
+    first = _lease(cache, str(repository))
+    assert not first.cache_hit
+    assert _lease(cache, str(repository)).cache_hit
+
+    # A checkout interrupted before it was recorded leaves a partial tree behind
+    cache._index.pop(f"checkouts/{first.path.name}")
+    (first.path / "src" / "app.py").unlink()
+    checkout = _lease(cache, str(repository))
+
+    assert not checkout.cache_hit
+    assert (checkout.path / "src" / "app.py").read_text() == "print('cached')\n"
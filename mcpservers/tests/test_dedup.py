@@ -0,0 +1,92 @@
+"""Cross-tool deduplication of normalized findings."""
+
+from appsec_dedup import DedupIndex
+from appsec_normalize import FindingTable
+
+
+def _semgrep(rule_id, line=10, cwe=None):
+    metadata = {"cwe": [f"{cwe}: description"]} if cwe else {}
+    return {
+        "check_id": rule_id, "path": "app.py", "start": {"line": line},
+        "extra": {"message": rule_id, "severity": "ERROR", "metadata": metadata},
+    }
+
+
+def _bearer(rule_id, line=10, cwe_ids=()):
+    return {"id": rule_id, "filename": "app.py", "line_number": line, "cwe_ids": list(cwe_ids), "title": rule_id}
+
+
+def _index(*reports) -> DedupIndex:
+    table = FindingTable()
+    for tool_name, findings in reports:
+        table.extend_raw(tool_name, findings)
+    return DedupIndex(table)
+
+
+def test_semgrep_rules_on_same_line_stay_apart():
+    index = _index(("semgrep_scan_repository", [_semgrep("python.sqli"), _semgrep("python.hardcoded-password")]))
+
+    assert len(index) == 2
+
+
+def test_semgrep_rules_with_same_cwe_on_same_line_stay_apart():
+    index = _index(("semgrep_scan_repository", [
+        _semgrep("python.sqli.format", cwe="CWE-89"), _semgrep("python.sqli.concat", cwe="CWE-89"),
+    ]))
+
+    assert len(index) == 2
+    assert [len(rows) for rows in index.groups.values()] == [1, 1]
+
+
+def test_same_semgrep_rule_reported_twice_merges():
+    index = _index(("semgrep_scan_repository", [_semgrep("python.sqli"), _semgrep("python.sqli")]))
+
+    assert len(index) == 1
+
+
+def test_bearer_and_semgrep_on_same_line_with_different_cwes_do_not_agree():
+    index = _index(
+        ("semgrep_scan_repository", [_semgrep("python.sqli", cwe="CWE-89")]),
+        ("bearer_scan_repository", [_bearer("python_lang_logger_leak", cwe_ids=["532"])]),
+    )
+
+    assert len(index) == 2
+    assert index.agreement() == {"semgrep": 1, "bearer": 1}
+
+
+def test_bearer_and_semgrep_without_cwes_do_not_agree():
+    index = _index(
+        ("semgrep_scan_repository", [_semgrep("python.sqli")]),
+        ("bearer_scan_repository", [_bearer("python_lang_sql_injection")]),
+    )
+
+    assert len(index) == 2
+
+
+def test_bearer_and_semgrep_with_same_cwe_agree():
+    index = _index(
+        ("semgrep_scan_repository", [_semgrep("python.sqli", cwe="CWE-89")]),
+        ("bearer_scan_repository", [_bearer("python_lang_sql_injection", cwe_ids=["89"])]),
+    )
+
+    assert index.agreement() == {"bearer+semgrep": 1}
+    merged = index.merged_row(index.keys()[0])
+    assert merged["category"] == "CWE-89"
+    assert merged["rule_ids"] == ["python.sqli", "python_lang_sql_injection"]
+
+
+def test_secret_scanners_agree_on_the_same_secret_only():
+    index = _index(
+        ("gitleaks_scan_repository", [
+            {"RuleID": "aws-access-key", "File": "config.py", "StartLine": 3, "Secret": "AKIAEXAMPLE"},
+        ]),
+        ("trufflehog_scan_repository", [
+            {"DetectorName": "AWS", "Raw": "AKIAEXAMPLE",
+             "SourceMetadata": {"Data": {"Filesystem": {"file": "config.py", "line": 3}}}},
+            {"DetectorName": "Generic", "Raw": "other-secret",
+             "SourceMetadata": {"Data": {"Filesystem": {"file": "config.py", "line": 3}}}},
+        ]),
+    )
+
+    assert index.agreement() == {"gitleaks+trufflehog": 1, "trufflehog": 1}
+    assert all("AKIAEXAMPLE" not in str(index.merged_row(key)) for key in index.keys())
@@ -0,0 +1,29 @@
+"""Retention of stored results in ResultStore."""
+
+import pytest
+
+from appsec_findings import ResultExpiredError, ResultStore
+
+
+def _result(count):
+    return {"status": "success", "findings": [{"check_id": f"rule-{i}", "path": "app.py"} for i in range(count)]}
+
+
+def test_pruned_result_reports_expired():
+    store = ResultStore(max_results=1)
+    first = store.put("semgrep_scan_repository", _result(2))
+    store.put("semgrep_scan_repository", _result(1))
+
+    with pytest.raises(ResultExpiredError, match="expired"):
+        store.page(first["result_id"])
+    assert store.page("unknown") is None
+
+
+def test_open_result_is_not_pruned():
+    store = ResultStore(max_results=1, retention_seconds=0)
+    stored = store.open("trufflehog_scan_repository")
+    store.put("semgrep_scan_repository", _result(1))
+
+    page = store.page(stored.result_id)
+    assert page["complete"] is False
+    assert page["next_cursor"] is not None
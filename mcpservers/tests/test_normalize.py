@@ -0,0 +1,54 @@
+"""Columnar storage and filtering of normalized findings."""
+
+import pytest
+
+from appsec_normalize import FilterError, FindingTable
+
+FINDINGS = [
+    {"check_id": "python.sqli", "path": "app.py", "start": {"line": 10}, "extra": {"severity": "ERROR"}},
+    {"check_id": "python.xss", "path": "web.py", "start": {"line": 42}, "extra": {"severity": "WARNING"}},
+]
+
+
+def _table(keep_raw=False):
+    table = FindingTable(keep_raw)
+    table.extend_raw("semgrep_scan_repository", FINDINGS)
+    return table
+
+
+def test_raw_findings_are_not_kept_by_default():
+    table = _table()
+
+    assert len(table) == 2
+    assert table.raw == []
+    assert table.row(0, include_raw=True)["raw"] is None
+
+
+def test_raw_findings_are_kept_on_request():
+    table = _table(keep_raw=True)
+
+    assert table.row(1, include_raw=True)["raw"] == FINDINGS[1]
+    assert table.select({"extra.severity": "warning"}) == [1]
+
+
+def test_raw_field_filter_without_raw_findings_fails_clearly():
+    with pytest.raises(FilterError, match="raw scanner findings are not kept"):
+        _table().select({"extra.severity": "warning"})
+
+
+def test_line_filter():
+    table = _table()
+
+    assert table.select({"line": ["42"]}) == [1]
+    with pytest.raises(FilterError, match="line numbers"):
+        table.select({"line": "forty-two"})
+
+
+def test_merge_keeps_rows_aligned_with_raw_findings():
+    merged = FindingTable(keep_raw=True)
+    merged.merge(_table())
+    merged.merge(_table(keep_raw=True))
+
+    assert len(merged) == len(merged.raw) == 4
+    assert merged.raw[:2] == [None, None]
+    assert merged.row(2, include_raw=True)["raw"] == FINDINGS[0]
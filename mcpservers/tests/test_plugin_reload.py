@@ -0,0 +1,63 @@
+"""Hot reload of tool plugins."""
+
+import threading
+
+from plugin_reload import PluginReloader
+from recon_mcpserver import PluginLoader
+
+from appsec_base_server import AppSecBaseServer
+
+PLUGIN = '''
+def echo_scan(target: str) -> dict:
+    """Echo the target."""
+    return {"target": target}
+'''
+
+
+def _tools_dir(tmp_path):
+    tools_dir = tmp_path / "tools"
+    tools_dir.mkdir()
+    (tools_dir / "echo_tool.py").write_text(PLUGIN)
+    return tools_dir
+
+
+def _reloaders(server):
+    return [middleware for middleware in server.mcp.middleware if isinstance(middleware, PluginReloader)]
+
+
+def test_hot_reload_is_off_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv("APPSEC_PLUGIN_RELOAD_INTERVAL", raising=False)
+    monkeypatch.setenv("MCP_PLUGIN_MANIFEST", "0")
+    server = AppSecBaseServer("test-mcp", _tools_dir(tmp_path))
+    server.register_tools()
+    server.executor.shutdown()
+
+    assert _reloaders(server) == []
+
+
+def test_hot_reload_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setenv("APPSEC_PLUGIN_RELOAD_INTERVAL", "2")
+    monkeypatch.setenv("MCP_PLUGIN_MANIFEST", "0")
+    server = AppSecBaseServer("test-mcp", _tools_dir(tmp_path))
+    server.register_tools()
+    server.executor.shutdown()
+
+    assert [reloader.interval for reloader in _reloaders(server)] == [2.0]
+
+
+def test_reload_waits_for_plugin_imports(tmp_path):
+    tools_dir = _tools_dir(tmp_path)
+    loader = PluginLoader(tools_dir, lazy=False)
+    loader.load_all_plugins()
+    (tools_dir / "other_tool.py").write_text(PLUGIN.replace("echo_scan", "other_scan"))
+    result = {}
+
+    with loader._import_lock:
+        # Stands in for a lazy import running on a worker thread
+        reload = threading.Thread(target=lambda: result.update(tools=loader.reload_changed()[0]))
+        reload.start()
+        reload.join(0.2)
+        assert reload.is_alive()
+    reload.join(5)
+
+    assert list(result["tools"]) == ["other_scan"]
@@ -0,0 +1,37 @@
+"""Spill files of large command output."""
+
+import asyncio
+import os
+
+from process_runner import run_command
+
+LARGE_OUTPUT = ["sh", "-c", "head -c 4096 /dev/zero; head -c 4096 /dev/zero >&2"]
+
+
+def _spill_files(directory):
+    return sorted(os.listdir(directory))
+
+
+def test_spill_files_are_deleted_by_default(tmp_path):
+    result = asyncio.run(run_command(LARGE_OUTPUT, max_output_bytes=1024, spill_dir=str(tmp_path)))
+
+    assert result["stdout_truncated"] and result["stderr_truncated"]
+    assert result["stdout_path"] is None and result["stderr_path"] is None
+    assert _spill_files(tmp_path) == []
+
+
+def test_kept_spill_files_hold_the_full_output(tmp_path):
+    result = asyncio.run(
+        run_command(LARGE_OUTPUT, max_output_bytes=1024, spill_dir=str(tmp_path), keep_spill_files=True)
+    )
+
+    assert os.path.getsize(result["stdout_path"]) == 4096
+    assert os.path.getsize(result["stderr_path"]) == 4096
+
+
+def test_timed_out_command_leaves_no_spill_files(tmp_path):
+    command = ["sh", "-c", "head -c 4096 /dev/zero; sleep 10"]
+    result = asyncio.run(run_command(command, timeout=0.5, max_output_bytes=1024, spill_dir=str(tmp_path)))
+
+    assert result["timed_out"]
+    assert _spill_files(tmp_path) == []
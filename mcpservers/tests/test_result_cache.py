@@ -0,0 +1,36 @@
+"""Scanner version probing for result cache keys."""
+
+import asyncio
+
+import appsec_result_cache
+from appsec_result_cache import UNKNOWN_VERSION, UNVERSIONED, scanner_version
+
+
+def test_failed_probe_is_retried(tmp_path, monkeypatch):
+    installed = tmp_path / "installed"
+    command = ["sh", "-c", f"test -f {installed} && echo scanner 1.2.3"]
+
+    assert asyncio.run(scanner_version(command)) == UNKNOWN_VERSION
+    installed.touch()
+    # Within the retry interval the failed probe is not repeated
+    assert asyncio.run(scanner_version(command)) == UNKNOWN_VERSION
+
+    monkeypatch.setattr(appsec_result_cache, "VERSION_RETRY_SECONDS", 0)
+    assert asyncio.run(scanner_version(command)) == "scanner 1.2.3"
+
+
+def test_known_version_is_probed_again_after_ttl(tmp_path, monkeypatch):
+    version = tmp_path / "version"
+    version.write_text("scanner 1.0\n")
+    command = ["cat", str(version)]
+
+    assert asyncio.run(scanner_version(command)) == "scanner 1.0"
+    version.write_text("scanner 2.0\n")
+    assert asyncio.run(scanner_version(command)) == "scanner 1.0"
+
+    monkeypatch.setattr(appsec_result_cache, "VERSION_TTL_SECONDS", 0)
+    assert asyncio.run(scanner_version(command)) == "scanner 2.0"
+
+
+def test_scanner_without_version_command_is_unversioned():
+    assert asyncio.run(scanner_version(None)) == UNVERSIONED
@@ -0,0 +1,90 @@
+"""Coalescing of identical concurrent tool calls in AppSecBaseServer."""
+
+import asyncio
+import textwrap
+
+from fastmcp import Client
+
+from appsec_base_server import AppSecBaseServer
+
+PLUGIN = '''
+import os
+import time
+
+def slow_scan(target: str, timeout: int = 60) -> dict:
+    """Scan a target slowly, recording each execution."""
+    with open({runs!r}, "a") as f:
+        f.write(f"{{os.getpid()}}\\n")
+    time.sleep(0.5)
+    return {{"status": "success", "target": target, "findings": []}}
+'''
+
+
+def _server(tmp_path, monkeypatch) -> AppSecBaseServer:
+    for name, value in {
+        "APPSEC_MAX_CONCURRENT": "1",
+        "APPSEC_RESULT_CACHE": "0",
+        "APPSEC_CLONE_CACHE": "0",
+        "APPSEC_PLUGIN_RELOAD_INTERVAL": "0",
+        "MCP_PLUGIN_MANIFEST": "0",
+    }.items():
+        monkeypatch.setenv(name, value)
+    tools_dir = tmp_path / "tools"
+    tools_dir.mkdir()
+    (tools_dir / "slow_tool.py").write_text(textwrap.dedent(PLUGIN.format(runs=str(tmp_path / "runs.txt"))))
+    server = AppSecBaseServer("test-mcp", tools_dir)
+    server.register_tools()
+    return server
+
+
+def _call_concurrently(server: AppSecBaseServer, calls):
+    async def main():
+        async with Client(server.mcp) as client:
+            return await asyncio.gather(*(client.call_tool("slow_scan", arguments) for arguments in calls))
+
+    try:
+        return asyncio.run(main())
+    finally:
+        server.executor.shutdown(wait=True)
+
+
+def test_identical_calls_execute_once(tmp_path, monkeypatch):
+    server = _server(tmp_path, monkeypatch)
+
+    # One admission slot: without coalescing above admission these would run one after another
+    results = _call_concurrently(server, [{"target": "example.com"}] * 4)
+
+    assert (tmp_path / "runs.txt").read_text().count("\n") == 1
+    assert len({result.data["result_id"] for result in results}) == 1
+
+
+def test_priority_does_not_split_calls(tmp_path, monkeypatch):
+    server = _server(tmp_path, monkeypatch)
+
+    _call_concurrently(server, [
+        {"target": "example.com"},
+        {"target": "example.com", "timeout": 60},
+        {"target": "example.com", "priority": "batch"},
+    ])
+
+    assert (tmp_path / "runs.txt").read_text().count("\n") == 1
+
+
+def test_different_timeouts_execute_separately(tmp_path, monkeypatch):
+    server = _server(tmp_path, monkeypatch)
+
+    # Joining the 30 second call would cut the longer budget short
+    _call_concurrently(server, [
+        {"target": "example.com", "timeout": 30},
+        {"target": "example.com", "timeout": 3600},
+    ])
+
+    assert (tmp_path / "runs.txt").read_text().count("\n") == 2
+
+
+def test_different_arguments_execute_separately(tmp_path, monkeypatch):
+    server = _server(tmp_path, monkeypatch)
+
+    _call_concurrently(server, [{"target": "a.example.com"}, {"target": "b.example.com"}])
+
+    assert (tmp_path / "runs.txt").read_text().count("\n") == 2